@@ -0,0 +1,104 @@
+import functools  # Кэширование декодированного изображения на время работы процесса
+import os  # Работа с путями и каталогом кэша
+import shutil  # Удаление временного каталога, если пирамиду уже записал другой процесс
+import tempfile  # Временный каталог для записи уровней
+from typing import List, Optional
+
+import numpy as np  # Импортируем библиотеку NumPy для работы с массивами
+
+MAP_IMAGE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Word300dpi.jpg")  # Карта мира для фона
+MAP_EXTENT = [-180, 180, -90, 90]  # Диапазон координат изображения (долгота и широта)
+MIN_LEVEL_WIDTH = 256  # Ширина самого грубого уровня пирамиды (в пикселях)
+
+
+def default_cache_dir() -> str:
+    """Каталог для уровней пирамиды: GROUNDTRACK_CACHE_DIR или ~/.cache/satellite-ground-track."""
+    return os.environ.get("GROUNDTRACK_CACHE_DIR") or os.path.join(
+        os.path.expanduser("~"), ".cache", "satellite-ground-track")
+
+
+@functools.lru_cache(maxsize=None)
+def load_map_image(path: str = MAP_IMAGE) -> np.ndarray:
+    """Декодирует изображение карты один раз за процесс; при ошибке возвращает белый фон."""
+    try:
+        from matplotlib.image import imread  # Декодер нужен только при первом построении пирамиды
+        image = imread(path)
+    except Exception:
+        image = np.ones((600, 1200, 3))  # Если загрузка не удалась, создаем белое изображение
+    image.flags.writeable = False
+    return image
+
+
+def downsample(image: np.ndarray) -> np.ndarray:
+    """Уменьшает изображение вдвое усреднением блоков 2x2."""
+    height, width = (image.shape[0] // 2) * 2, (image.shape[1] // 2) * 2
+    blocks = image[:height, :width].reshape(height // 2, 2, width // 2, 2, -1).astype(np.float32)
+    return blocks.mean(axis=(1, 3)).astype(image.dtype)
+
+
+@functools.lru_cache(maxsize=None)
+def map_pyramid(path: str = MAP_IMAGE, cache_dir: Optional[str] = None) -> List[np.ndarray]:
+    """Возвращает уровни пирамиды от полного разрешения до MIN_LEVEL_WIDTH.
+
+    Уровни сохраняются на диск как .npy и при следующих запусках открываются через
+    memory map без декодирования JPEG. Уровни пишутся во временный каталог, который затем
+    переименовывается в каталог кэша, поэтому прерванная запись не оставляет неполной пирамиды.
+    """
+    cache_dir = cache_dir or default_cache_dir()
+    try:
+        stat = os.stat(path)
+        # Каталог уровней зависит от размера и времени изменения исходного файла
+        level_dir = os.path.join(cache_dir, f"map_v2_{stat.st_size}_{int(stat.st_mtime)}")
+    except OSError:
+        level_dir = None
+
+    if level_dir and os.path.isdir(level_dir):
+        names = sorted(name for name in os.listdir(level_dir) if name.startswith("level_") and name.endswith(".npy"))
+        if names:
+            return [np.load(os.path.join(level_dir, name), mmap_mode="r") for name in names]
+
+    levels = [load_map_image(path)]
+    while levels[-1].shape[1] // 2 >= MIN_LEVEL_WIDTH:
+        levels.append(downsample(levels[-1]))
+    if level_dir:
+        temp_dir = None
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            temp_dir = tempfile.mkdtemp(prefix="tmp_map_", dir=cache_dir)
+            for index, level in enumerate(levels):
+                np.save(os.path.join(temp_dir, f"level_{index:02d}.npy"), level)
+            os.replace(temp_dir, level_dir)  # Каталог появляется сразу со всеми уровнями
+        except OSError:
+            # Нет записи на диск или каталог уже записал другой процесс - пирамида остаётся в памяти процесса
+            if temp_dir is not None:
+                shutil.rmtree(temp_dir, ignore_errors=True)
+    return levels
+
+
+def select_level(levels: List[np.ndarray], width_px: float, lon_span: float = 360.0) -> np.ndarray:
+    """Выбирает самый грубый уровень, у которого на пиксель холста приходится не меньше пикселя изображения."""
+    required = width_px * 360.0 / max(lon_span, 1e-9)  # Нужная ширина изображения для всей карты
+    for level in reversed(levels):
+        if level.shape[1] >= required:
+            return level
+    return levels[0]
+
+
+class MapBackground:
+    """Фон с картой на оси matplotlib, подбирающий уровень пирамиды под размер холста и масштаб."""
+
+    def __init__(self, ax, path: str = MAP_IMAGE):
+        self.ax = ax
+        self.levels = map_pyramid(path)
+        self.level = select_level(self.levels, ax.bbox.width)
+        self.image = ax.imshow(self.level, extent=MAP_EXTENT)  # Отображаем изображение, задавая диапазон координат
+        ax.callbacks.connect("xlim_changed", self.update)  # Масштабирование и панорамирование
+        ax.figure.canvas.mpl_connect("resize_event", self.update)  # Изменение размера окна
+
+    def update(self, *args):
+        """Подменяет данные изображения, если текущему масштабу подходит другой уровень."""
+        x0, x1 = self.ax.get_xlim()
+        level = select_level(self.levels, self.ax.bbox.width, abs(x1 - x0))
+        if level is not self.level:
+            self.level = level
+            self.image.set_data(level)
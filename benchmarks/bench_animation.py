@@ -0,0 +1,103 @@
+"""Время кадра анимации: прежняя полная перерисовка против BlitAnimator (без дисплея, backend Agg).
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_animation
+    python -m benchmarks.bench_animation --planes 12 --slots 10 --frames 400
+"""
+import argparse
+import time
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.cm as cm
+import matplotlib.pyplot as plt
+import numpy as np
+from astropy.time import Time
+
+from constants import R, SatelliteConfig
+from rendering import BlitAnimator
+from utilities import period_time_steps, propagate_constellation
+
+
+def make_figure(n_sats):
+    fig, ax = plt.subplots(figsize=(10, 6))
+    try:
+        img = plt.imread("Word300dpi.jpg")
+    except Exception:
+        img = np.ones((600, 1200, 3))
+    ax.imshow(img, extent=[-180, 180, -90, 90])
+    for value in range(-180, 181, 30):
+        ax.axvline(value, color='gray', linestyle='--', linewidth=0.5)
+    for value in range(-90, 91, 30):
+        ax.axhline(value, color='gray', linestyle='--', linewidth=0.5)
+    colors = cm.plasma(np.linspace(0, 1, n_sats))
+    scatters = []
+    for i in range(n_sats):
+        scatter, = ax.plot([], [], 'o', markersize=4, color=colors[i], label=f"Sat {i + 1}")
+        scatters.append(scatter)
+    text = fig.text(0.2, 0.925, "", ha="left", va="top", fontsize=10, bbox=dict(facecolor='white', alpha=0.7))
+    fig.canvas.draw()
+    return fig, ax, scatters, text
+
+
+def legacy_frame(fig, ax, scatters, text, longitudes, latitudes, frame):
+    """Кадр в прежнем стиле: срезы [:frame], новая легенда и полная перерисовка холста."""
+    for i, sc in enumerate(scatters):
+        sc.set_data(longitudes[i][:frame], latitudes[i][:frame])
+    visible = [sc for sc in scatters if len(sc.get_xdata()) > 0]
+    if visible:
+        ax.legend(handles=visible, loc='center left', bbox_to_anchor=(1, 0.5), fontsize='small')
+    text.set_text(f"Frame {frame}")
+    fig.canvas.draw()
+
+
+def measure(draw, frames):
+    durations = []
+    for frame in frames:
+        start = time.perf_counter()
+        draw(frame)
+        durations.append(time.perf_counter() - start)
+    return np.array(durations) * 1000
+
+
+def report(name, durations):
+    third = max(1, len(durations) // 3)
+    print(f"{name:<8} mean {durations.mean():7.2f} ms  first third {durations[:third].mean():7.2f} ms  "
+          f"last third {durations[-third:].mean():7.2f} ms  p95 {np.percentile(durations, 95):7.2f} ms  "
+          f"-> {1000 / durations.mean():6.1f} FPS")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--planes", type=int, default=12, help="Число плоскостей синтетической системы")
+    parser.add_argument("--slots", type=int, default=10, help="Число спутников в плоскости")
+    parser.add_argument("--frames", type=int, default=300, help="Число измеряемых кадров")
+    parser.add_argument("--dt", type=float, default=0.001, help="Относительный шаг времени")
+    args = parser.parse_args()
+
+    synthetic = SatelliteConfig(
+        name="Synthetic", num_satellite=args.planes * args.slots, inclination=55,
+        longitude_of_ascending_node=list(np.linspace(0, 360, args.planes, endpoint=False)),
+        argument_pericenter=list(np.linspace(0, 360, args.slots, endpoint=False)),
+        semi_major_axis=R + 20200, eccentricity=0
+    )
+    date = Time("2025-02-27 00:00:00", format="iso", scale="utc")
+    longitudes, latitudes = propagate_constellation([synthetic], date, period_time_steps(synthetic.T, args.dt))
+    n_sats, n_frames = longitudes.shape
+    frames = np.linspace(1, n_frames - 1, args.frames).astype(int)
+    print(f"{n_sats} satellites, {n_frames} time steps, {len(frames)} frames measured")
+
+    fig, ax, scatters, text = make_figure(n_sats)
+    report("legacy", measure(lambda f: legacy_frame(fig, ax, scatters, text, longitudes, latitudes, f), frames))
+    plt.close(fig)
+
+    fig, ax, scatters, text = make_figure(n_sats)
+    animator = BlitAnimator(fig, ax, longitudes, latitudes, [sc.get_color() for sc in scatters], scatters,
+                            text, lambda f: f"Frame {f}", n_frames)
+    animator.update_legend()
+    report("blit", measure(animator.draw_frame, frames))
+    plt.close(fig)
+
+
+if __name__ == "__main__":
+    main()
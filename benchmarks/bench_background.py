@@ -0,0 +1,82 @@
+"""Открытие окна карты и перерисовка: прежний plt.imread + imshow против пирамиды MapBackground (Agg).
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_background
+"""
+import argparse
+import tempfile
+import time
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+
+import background
+from background import MAP_EXTENT, MAP_IMAGE, MapBackground, map_pyramid
+
+
+def open_legacy():
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.imshow(plt.imread(MAP_IMAGE), extent=MAP_EXTENT)
+    fig.canvas.draw()
+    return fig
+
+
+def open_pyramid():
+    fig, ax = plt.subplots(figsize=(10, 6))
+    fig.map_background = MapBackground(ax)
+    fig.canvas.draw()
+    return fig
+
+
+def timed(function, repeat):
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        durations.append(time.perf_counter() - start)
+        if isinstance(result, plt.Figure):
+            plt.close(result)
+    return 1000 * np.median(durations)
+
+
+def redraw_cost(fig, repeat):
+    return timed(fig.canvas.draw, repeat)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        background.default_cache_dir = lambda: cache_dir  # Пустой кэш на время измерений
+
+        start = time.perf_counter()
+        levels = map_pyramid()
+        build_time = 1000 * (time.perf_counter() - start)
+        print("levels:", ", ".join(f"{level.shape[1]}x{level.shape[0]}" for level in levels))
+        print(f"first build (decode + downsample + save): {build_time:8.1f} ms")
+
+        map_pyramid.cache_clear()
+        background.load_map_image.cache_clear()
+        start = time.perf_counter()
+        map_pyramid()
+        print(f"reopen from disk (new session):           {1000 * (time.perf_counter() - start):8.1f} ms")
+
+        print(f"window open, legacy imread:               {timed(open_legacy, args.repeat):8.1f} ms")
+        print(f"window open, pyramid:                     {timed(open_pyramid, args.repeat):8.1f} ms")
+
+        legacy = open_legacy()
+        pyramid = open_pyramid()
+        print(f"redraw, legacy full resolution:           {redraw_cost(legacy, args.repeat):8.1f} ms")
+        print(f"redraw, pyramid level "
+              f"{pyramid.map_background.level.shape[1]:>5} px:         {redraw_cost(pyramid, args.repeat):8.1f} ms")
+        pyramid.axes[0].set_xlim(-30, 30)  # Увеличение: выбирается более детальный уровень
+        print(f"redraw zoomed x6, level "
+              f"{pyramid.map_background.level.shape[1]:>5} px:       {redraw_cost(pyramid, args.repeat):8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
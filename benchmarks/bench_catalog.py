@@ -0,0 +1,88 @@
+"""Каталог TLE: разбор синтетического каталога и расчёт всех объектов за один проход против цикла по объектам.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_catalog
+    python -m benchmarks.bench_catalog --objects 20000 --steps 60
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from catalog import load_catalog
+from utilities import calculate_coordinate, calculate_siderial_time, epoch_offsets, generate_transition_matrix
+
+
+def checksum(line: str) -> int:
+    return sum(int(c) if c.isdigit() else c == "-" for c in line[:68]) % 10
+
+
+def synthetic_tle(count: int, seed: int = 0) -> str:
+    """Трёхстрочные TLE со случайными элементами от НОО до ГСО и эпохами в пределах недели."""
+    rng = np.random.default_rng(seed)
+    mean_motion = np.exp(rng.uniform(np.log(1.0027), np.log(15.5), count))
+    records = []
+    for k in range(count):
+        day = 56.0 + rng.uniform(0, 7)
+        line1 = f"1 {k + 1:05d}U 25001A   25{day:012.8f}  .00000000  00000-0  00000-0 0  999"
+        line2 = (f"2 {k + 1:05d} {rng.uniform(0, 110):8.4f} {rng.uniform(0, 360):8.4f} "
+                 f"{int(rng.uniform(0, 0.05) * 1e7):07d} {rng.uniform(0, 360):8.4f} {rng.uniform(0, 360):8.4f} "
+                 f"{mean_motion[k]:11.8f}{1:5d}")
+        records.append(f"OBJECT {k + 1}\n{line1}{checksum(line1)}\n{line2}{checksum(line2)}")
+    return "\n".join(records) + "\n"
+
+
+def per_object_loop(table, jd, time_steps):
+    """Прежняя схема: calculate_coordinate и матрица поворота для каждого объекта и каждого шага."""
+    offsets = epoch_offsets(table.epoch, jd)
+    lon = np.empty((len(table), len(time_steps)))
+    lat = np.empty_like(lon)
+    for k, row in enumerate(table.data):
+        for j, t in enumerate(time_steps):
+            position = calculate_coordinate(row["semi_major_axis"], row["eccentricity"],
+                                            row["longitude_of_ascending_node"], row["argument_pericenter"],
+                                            row["inclination"], row["mean_anomaly"], t + offsets[k])
+            coordinate = generate_transition_matrix(calculate_siderial_time(jd, t)) @ position
+            lon[k, j] = np.degrees(np.arctan2(coordinate[1], coordinate[0]))
+            lat[k, j] = np.degrees(np.arcsin(coordinate[2] / np.linalg.norm(coordinate)))
+    return lon, lat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--objects", type=int, default=20000)
+    parser.add_argument("--steps", type=int, default=60, help="Временных шагов (шаг 60 с)")
+    parser.add_argument("--loop-objects", type=int, default=200, help="Объектов для цикла (результат экстраполируется)")
+    args = parser.parse_args()
+
+    text = synthetic_tle(args.objects)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "catalog.tle")
+        with open(path, "w") as file:
+            file.write(text)
+        start = time.perf_counter()
+        table = load_catalog(path)
+        parse_time = time.perf_counter() - start
+    print(f"{len(table)} objects, {args.steps} steps")
+    print(f"parse TLE file ({len(text) / 2**20:.1f} MiB):          {1000 * parse_time:10.1f} ms")
+
+    jd = 2460733.5  # 2025-02-27, после эпох каталога
+    t = 60.0 * np.arange(args.steps)
+    start = time.perf_counter()
+    lon, lat = table.propagate(jd, t)
+    batch = time.perf_counter() - start
+    print(f"propagate catalog in one pass:         {1000 * batch:10.1f} ms")
+
+    n = min(args.loop_objects, len(table))
+    start = time.perf_counter()
+    ref_lon, ref_lat = per_object_loop(table[:n], jd, t)
+    loop = (time.perf_counter() - start) * len(table) / n
+    error = max(np.abs((lon[:n] - ref_lon + 180) % 360 - 180).max(), np.abs(lat[:n] - ref_lat).max())
+    print(f"per-object calculate_coordinate loop:  {1000 * loop:10.1f} ms (extrapolated from {n} objects)")
+    print(f"speedup {loop / batch:.0f}x, max |Δ| {error:.1e} deg")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Переключение видимости спутников: общая коллекция трасс с маской против отдельного Line2D на спутник.
+
+Без дисплея (Agg). Для каждого размера группировки Walker измеряются:
+изменение маски (TrackCollection.set_visible), перерисовка трасс поверх кэшированного фона
+(TrackCollection.redraw) и прежний способ - set_data у Line2D скрытой плоскости и полная
+перерисовка холста.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_collection
+    python -m benchmarks.bench_collection --sizes 500 1000 2000 5000 --steps 200
+
+Завершается с кодом 1, если кадр после redraw отличается от полной перерисовки холста.
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from constellation import ConstellationTable
+from export import track_figure
+from polylines import split_antimeridian
+from rendering import TrackCollection
+from utilities import propagate_elements
+
+PLANES = 50  # Число плоскостей Walker; переключается одна плоскость
+
+
+def median_ms(durations) -> float:
+    return 1000 * float(np.median(durations))
+
+
+def line2d_toggle(lon, lat, planes, repeat, lines):
+    """Прежний способ: по Line2D на спутник, скрытие плоскости - set_data и полная перерисовка."""
+    fig, ax, handles, _ = track_figure("", [""] * len(lon))
+    if lines:
+        lon, lat = split_antimeridian(lon, lat)
+    for handle, x, y in zip(handles, lon, lat):
+        if lines:
+            handle.set_linestyle('-')
+            handle.set_marker('None')
+        handle.set_data(x, y)
+    fig.canvas.draw()
+    durations = []
+    for k in range(repeat):
+        plane = planes == k % PLANES
+        start = time.perf_counter()
+        for i in np.flatnonzero(plane):
+            handles[i].set_data([], [])
+        fig.canvas.draw()
+        durations.append(time.perf_counter() - start)
+        for i in np.flatnonzero(plane):
+            handles[i].set_data(lon[i], lat[i])
+    return median_ms(durations)
+
+
+def collection_toggle(lon, lat, planes, repeat, lines):
+    """Общая коллекция: скрытие плоскости - новая маска и перерисовка трасс поверх фона."""
+    fig, ax, handles, _ = track_figure("", [""] * len(lon))
+    tracks = TrackCollection(ax, lon, lat, [h.get_color() for h in handles])
+    tracks.set_lines(lines)
+    fig.canvas.draw()
+    mask_durations, redraw_durations = [], []
+    for k in range(repeat):
+        visible = planes != k % PLANES
+        start = time.perf_counter()
+        tracks.set_visible(visible)
+        middle = time.perf_counter()
+        tracks.redraw()
+        mask_durations.append(middle - start)
+        redraw_durations.append(time.perf_counter() - middle)
+
+    # Кадр после redraw должен совпадать с полной перерисовкой того же состояния
+    blitted = np.array(fig.canvas.buffer_rgba())
+    fig.canvas.draw()
+    same = np.array_equal(blitted, np.asarray(fig.canvas.buffer_rgba()))
+    return 1000 * median_ms(mask_durations), median_ms(redraw_durations), same
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000], help="Числа спутников")
+    parser.add_argument("--steps", type=int, default=1000, help="Отсчётов на трассу (один виток)")
+    parser.add_argument("--repeat", type=int, default=3, help="Переключений на измерение")
+    args = parser.parse_args()
+
+    print(f"{'satellites':>10} {'points':>9} {'mode':<8} {'mask, us':>9} {'redraw, ms':>11} {'Line2D, ms':>11} {'speedup':>8}")
+    failed = False
+    for size in args.sizes:
+        table = ConstellationTable.walker("LEO", size, PLANES, 1, 53.0, 6928.0)
+        t = np.linspace(0.0, table.periods[0], args.steps)
+        lon, lat = propagate_elements(table.elements(), 2460733.5, t)
+        planes = np.arange(size) * PLANES // size  # Плоскость каждого спутника (слоты идут по плоскостям)
+        for lines in (False, True):
+            baseline = line2d_toggle(lon, lat, planes, args.repeat, lines)
+            mask, redraw, same = collection_toggle(lon, lat, planes, args.repeat, lines)
+            failed |= not same
+            print(f"{size:>10} {lon.size:>9} {'lines' if lines else 'markers':<8} {mask:>9.0f} {redraw:>11.1f} "
+                  f"{baseline:>11.1f} {baseline / (mask / 1000 + redraw):>7.1f}x  {'OK' if same else 'FAIL'}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
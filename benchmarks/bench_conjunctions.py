@@ -0,0 +1,115 @@
+"""Поиск сближений: хеш-сетка против перебора всех пар и сверка с плотной сеткой.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_conjunctions
+    python -m benchmarks.bench_conjunctions --sizes 1000 10000 --hours 24 --threshold 5
+
+Перебор всех пар измеряется на первых --brute-windows окнах и пересчитывается на весь
+интервал; для групп больше MAX_BRUTE_PAIRS пар - ещё и по N² от наибольшей измеренной.
+Завершается с кодом 1, если хеш-сетка и перебор дают разные сближения или если сближение,
+видимое на сетке с шагом 1 с, не найдено.
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from conjunctions import SCREEN_STEPS_PER_PERIOD, eci_positions, screen_conjunctions
+from constants import GM, R
+
+JD = 2460733.5
+DENSE_STEP = 1.0  # Шаг проверочной сетки (в секундах)
+MAX_BRUTE_PAIRS = 5_000_000  # Больше пар перебор не измеряется, а оценивается по N²
+
+
+def random_catalog(count: int, seed: int = 0) -> dict:
+    """Случайные орбиты в слое LEO 400-1200 км, как у каталога низкоорбитальных объектов."""
+    rng = np.random.default_rng(seed)
+    return dict(
+        semi_major_axis=R + rng.uniform(400, 1200, count),
+        eccentricity=rng.uniform(0, 0.02, count),
+        inclination=np.degrees(np.arccos(rng.uniform(-1, 1, count))),
+        longitude_of_ascending_node=rng.uniform(0, 360, count),
+        argument_pericenter=rng.uniform(0, 360, count),
+        mean_anomaly=rng.uniform(0, 360, count),
+    )
+
+
+def screening_step(elements) -> float:
+    return 2 * np.pi * np.sqrt(np.min(elements["semi_major_axis"])**3 / GM) / SCREEN_STEPS_PER_PERIOD
+
+
+def dense_minima(elements, span, threshold):
+    """Локальные минимумы расстояния ближе threshold на сетке DENSE_STEP: (первые, вторые, моменты)."""
+    t = np.arange(0.0, span + DENSE_STEP / 2, DENSE_STEP)
+    rows = {key: value[:, np.newaxis] for key, value in elements.items()}
+    i, j = np.triu_indices(len(elements["semi_major_axis"]), 1)
+    closest = np.full(i.size, np.inf)
+    for first in range(0, t.size, 100):  # Сначала - пары, подходящие ближе threshold хотя бы раз
+        r = eci_positions(rows, JD, t[first:first + 100])
+        closest = np.minimum(closest, np.sqrt(((r[:, i] - r[:, j])**2).sum(axis=0)).min(axis=1))
+    near = np.flatnonzero(closest <= threshold)
+    i, j = i[near], j[near]
+    column = lambda index: {key: value[index, np.newaxis] for key, value in elements.items()}
+    d = np.sqrt(((eci_positions(column(i), JD, t) - eci_positions(column(j), JD, t))**2).sum(axis=0))
+    minimum = np.zeros(d.shape, dtype=bool)
+    minimum[:, 1:-1] = (d[:, 1:-1] <= d[:, :-2]) & (d[:, 1:-1] < d[:, 2:])
+    minimum[:, 0], minimum[:, -1] = d[:, 0] < d[:, 1], d[:, -1] <= d[:, -2]
+    pair, step = np.nonzero(minimum & (d <= threshold))
+    return i[pair], j[pair], t[step]
+
+
+def validate(count, hours, threshold):
+    elements = random_catalog(count, seed=1)
+    span = hours * 3600.0
+    found = screen_conjunctions(elements, JD, span, threshold)
+    brute = screen_conjunctions(elements, JD, span, threshold, brute_force=True)
+    same = np.array_equal(found, brute)
+    first, second, moments = dense_minima(elements, span, threshold)
+    missed = 0
+    for i, j, moment in zip(first, second, moments):
+        match = (found["first"] == i) & (found["second"] == j) & (np.abs(found["tca"] - moment) <= DENSE_STEP)
+        missed += not match.any()
+    return len(found), len(brute), same, first.size, missed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 3000, 10000], help="Числа объектов")
+    parser.add_argument("--hours", type=float, default=24.0, help="Длительность интервала (в часах)")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Порог сближения (в км)")
+    parser.add_argument("--brute-windows", type=int, default=20, help="Окон грубой сетки для замера перебора")
+    args = parser.parse_args()
+
+    print(f"{'objects':>8} {'hours':>6} {'windows':>8} {'conjunctions':>13} {'hash, s':>8} {'all pairs, s':>13} {'speedup':>8}")
+    measured = None  # (число объектов, время перебора на окно) для оценки по N²
+    for size in args.sizes:
+        elements = random_catalog(size)
+        step = screening_step(elements)
+        windows = int(np.ceil(args.hours * 3600.0 / step))
+        start = time.perf_counter()
+        conjunctions = screen_conjunctions(elements, JD, args.hours * 3600.0, args.threshold, step=step)
+        elapsed = time.perf_counter() - start
+        if size * (size - 1) // 2 <= MAX_BRUTE_PAIRS:
+            start = time.perf_counter()
+            screen_conjunctions(elements, JD, args.brute_windows * step, args.threshold, step=step, brute_force=True)
+            measured = (size, (time.perf_counter() - start) / args.brute_windows)
+            brute, mark = measured[1] * windows, " "
+        elif measured is not None:
+            brute, mark = measured[1] * (size / measured[0])**2 * windows, "~"
+        else:
+            brute, mark = np.nan, " "
+        print(f"{size:>8} {args.hours:>6g} {windows:>8} {len(conjunctions):>13} {elapsed:>8.2f} "
+              f"{mark}{brute:>12.1f} {brute / elapsed:>7.0f}x")
+
+    print(f"\nvalidation: 300 objects, 2 h, threshold 100 km, against all pairs and a {DENSE_STEP:g} s grid:")
+    count, brute_count, same, dense, missed = validate(300, 2.0, 100.0)
+    ok = same and missed == 0
+    print(f"found {count}, all pairs {brute_count} ({'identical' if same else 'DIFFERENT'}), "
+          f"grid minima {dense}, missed {missed}  {'OK' if ok else 'FAIL'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
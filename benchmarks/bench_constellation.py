@@ -0,0 +1,83 @@
+"""Большие группировки: SatelliteConfig + satellite_slots против ConstellationTable (время построения, память, расчёт).
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_constellation
+    python -m benchmarks.bench_constellation --total 50000 --planes 100
+"""
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from constants import R, SatelliteConfig
+from constellation import ConstellationTable
+from utilities import propagate_elements, satellite_slots
+
+
+def configs_walker(total, planes, phasing, inclination, semi_major_axis):
+    """Та же группировка Уокера в прежнем представлении: по конфигурации на плоскость, фазы через ω."""
+    per_plane = total // planes
+    return [SatelliteConfig(
+        name=f"Plane {p + 1}",
+        num_satellite=per_plane,
+        inclination=inclination,
+        longitude_of_ascending_node=[p * 360.0 / planes],
+        argument_pericenter=[(j * 360.0 / per_plane + p * phasing * 360.0 / total) % 360.0 for j in range(per_plane)],
+        semi_major_axis=semi_major_axis,
+        eccentricity=0.0
+    ) for p in range(planes)]
+
+
+def measured(function, *args, **kwargs):
+    """Возвращает результат, время (в секундах) и пик памяти (в МиБ)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--total", type=int, default=40000)
+    parser.add_argument("--planes", type=int, default=80)
+    parser.add_argument("--phasing", type=int, default=1)
+    parser.add_argument("--steps", type=int, default=20, help="Временных шагов при расчёте")
+    args = parser.parse_args()
+    a = R + 550
+
+    def legacy():
+        configs = configs_walker(args.total, args.planes, args.phasing, 53.0, a)
+        return configs, satellite_slots(configs)
+
+    (configs, elements), legacy_time, legacy_peak = measured(legacy)
+    table, table_time, table_peak = measured(ConstellationTable.walker, "Walker", args.total, args.planes,
+                                             args.phasing, 53.0, a)
+    print(f"{args.total} satellites in {args.planes} planes")
+    print(f"build, SatelliteConfig + satellite_slots: {1000 * legacy_time:8.1f} ms, peak {legacy_peak:7.2f} MiB")
+    print(f"build, ConstellationTable.walker:         {1000 * table_time:8.1f} ms, peak {table_peak:7.2f} MiB"
+          f"  (table {table.data.nbytes / 2**20:.2f} MiB)")
+
+    config_table, config_table_time, _ = measured(ConstellationTable.from_configs, configs)
+    print(f"ConstellationTable.from_configs:          {1000 * config_table_time:8.1f} ms")
+
+    start = time.perf_counter()
+    subset = table[(table.plane % 4 == 0) & (table.longitude_of_ascending_node < 180)]
+    print(f"select every 4th plane with Ω < 180°:    {1000 * (time.perf_counter() - start):8.1f} ms"
+          f"  ({len(subset)} satellites)")
+
+    t = np.linspace(0, 5400, args.steps)
+    jd = 2460733.5
+    (lon, _), legacy_prop, _ = measured(propagate_elements, elements, jd, t)
+    # Та же группировка из конфигураций (M0 = 360/T, как в SatelliteConfig), чтобы сравнить результаты
+    (lon_t, _), table_prop, _ = measured(config_table.propagate, jd, t)
+    print(f"propagate all, satellite_slots dict:      {1000 * legacy_prop:8.1f} ms")
+    print(f"propagate all, ConstellationTable:        {1000 * table_prop:8.1f} ms"
+          f"  max |Δ| {np.abs((lon_t - lon + 180) % 360 - 180).max():.1e} deg")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Покрытие на сетке: скорость проверок видимости, пиковая память и сверка с прямым расчётом угла места.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_coverage
+    python -m benchmarks.bench_coverage --resolution 1 --hours 24 --step 300
+
+Завершается с кодом 1, если число видимых спутников расходится с прямым расчётом
+угла места (arcsin) по каждой точке и моменту.
+"""
+import argparse
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from constants import SATELLITES
+from constellation import ConstellationTable
+from coverage import coverage_grid, grid_axes
+from transforms import geodetic_to_ecef
+from utilities import ecef_positions
+
+
+def direct_counts(elements, jd, t, resolution, elevation_mask):
+    """Число видимых спутников (n_lat, n_lon, n_epochs) через угол места каждой пары, по одной широте за раз."""
+    longitudes, latitudes = grid_axes(resolution)
+    rows = {key: np.asarray(value, dtype=float)[:, np.newaxis] for key, value in elements.items()}
+    r = np.stack(ecef_positions(rows, jd, t), axis=-1)  # (n_sats, n_epochs, 3)
+    counts = np.zeros((latitudes.size, longitudes.size, t.size), dtype=int)
+    for k, lat in enumerate(latitudes):
+        p = np.stack(geodetic_to_ecef(longitudes, np.full(longitudes.shape, lat)), axis=-1)
+        lat_r, lon_r = np.radians(lat), np.radians(longitudes)
+        u = np.stack([np.cos(lat_r) * np.cos(lon_r), np.cos(lat_r) * np.sin(lon_r), np.full(lon_r.shape, np.sin(lat_r))], axis=-1)
+        d = r[np.newaxis] - p[:, np.newaxis, np.newaxis]
+        elevation = np.degrees(np.arcsin(np.einsum("psek,pk->pse", d, u) / np.linalg.norm(d, axis=-1)))
+        counts[k] = (elevation >= elevation_mask).sum(axis=1)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--resolution", type=float, default=1.0, help="Шаг сетки (в градусах)")
+    parser.add_argument("--hours", type=float, default=24.0, help="Длительность интервала (в часах)")
+    parser.add_argument("--step", type=float, default=300.0, help="Шаг по времени (в секундах)")
+    parser.add_argument("--mask", type=float, default=10.0, help="Маска угла места (в градусах)")
+    args = parser.parse_args()
+
+    jd = 2460733.5
+    t = np.arange(0.0, args.hours * 3600.0, args.step)
+    systems = {name: ConstellationTable.from_configs(SATELLITES[name]) for name in ("GPS", "Glonass")}
+    systems["GPS+Glonass"] = ConstellationTable.concatenate(list(systems.values()))
+    n_points = np.prod([axis.size for axis in grid_axes(args.resolution)])
+
+    print(f"{'constellation':<13} {'dtype':<8} {'tests':>11} {'time, s':>8} {'Mtests/s':>9} "
+          f"{'peak MB':>8} {'unchunked MB':>13} {'mean':>6} {'cov>=4, %':>10}")
+    for name, table in systems.items():
+        elements = table.elements()
+        tests = n_points * len(table) * t.size
+        for dtype in (np.float64, np.float32):
+            tracemalloc.start()
+            start = time.perf_counter()
+            coverage = coverage_grid(elements, jd, t, args.resolution, args.mask, min_satellites=4, dtype=dtype)
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            unchunked = tests * (2 * np.dtype(dtype).itemsize + 1)  # Высота, порог и маска видимости для всех проверок сразу
+            print(f"{name:<13} {np.dtype(dtype).name:<8} {tests:>11} {elapsed:>8.2f} {tests / elapsed / 1e6:>9.1f} "
+                  f"{peak / 2**20:>8.1f} {unchunked / 2**20:>13.0f} {coverage.global_mean('mean'):>6.2f} "
+                  f"{coverage.global_mean('coverage'):>10.2f}")
+
+    # Сверка с прямым расчётом угла места на грубой сетке
+    resolution, t_check = 5.0, t[::6]
+    elements = systems["GPS+Glonass"].elements()
+    reference = direct_counts(elements, jd, t_check, resolution, args.mask)
+    failed = False
+    print(f"\nvalidation on a {resolution:g}° grid, {t_check.size} epochs:")
+    for dtype in (np.float64, np.float32):
+        coverage = coverage_grid(elements, jd, t_check, resolution, args.mask, dtype=dtype)
+        ok = (np.array_equal(coverage.minimum, reference.min(axis=2)) and np.array_equal(coverage.maximum, reference.max(axis=2))
+              and np.allclose(coverage.mean, reference.mean(axis=2)))
+        failed |= not ok
+        print(f"{np.dtype(dtype).name:<8} max |mean - direct| = {np.abs(coverage.mean - reference.mean(axis=2)).max():.3g}"
+              f"  {'OK' if ok else 'FAIL'}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
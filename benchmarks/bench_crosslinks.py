@@ -0,0 +1,81 @@
+"""Граф прямой видимости: пакетная проверка через матрицы скалярных произведений против цикла по парам.
+
+Для группировок Walker измеряется построение графа (line_of_sight_graph) и прежний способ -
+проверка отрезка каждой пары в каждый момент циклом по парам. Проверяется совпадение рёбер
+с прямым расчётом ближайшей к центру Земли точки отрезка.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_crosslinks
+    python -m benchmarks.bench_crosslinks --sizes 66 300 1200 --steps 100
+
+Завершается с кодом 1, если рёбра графа отличаются от прямого расчёта.
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from constants import R
+from constellation import ConstellationTable
+from crosslinks import GRAZING_ALTITUDE, line_of_sight_graph
+from utilities import ecef_positions
+
+JD = 2460733.5
+
+
+def pairwise_visible(positions, radius):
+    """Прежний способ: цикл по парам, расстояние от центра Земли до отрезка каждой пары."""
+    n_epochs, n_sats, _ = positions.shape
+    visible = np.zeros((n_epochs, n_sats, n_sats), dtype=bool)
+    for i in range(n_sats):
+        for j in range(i + 1, n_sats):
+            a, b = positions[:, i], positions[:, j]
+            d = b - a
+            s = np.clip(-(a * d).sum(axis=1) / (d * d).sum(axis=1), 0.0, 1.0)
+            closest = a + s[:, np.newaxis] * d
+            visible[:, i, j] = (closest * closest).sum(axis=1) > radius**2
+    return visible
+
+
+def direct_edges(elements, t):
+    """Рёбра прямого расчёта в порядке LinkGraph: (моменты, первые, вторые)."""
+    rows = {key: np.asarray(value)[:, np.newaxis] for key, value in elements.items()}
+    x, y, z = ecef_positions(rows, JD, t, False)
+    positions = np.stack([x.T, y.T, z.T], axis=-1)
+    return np.nonzero(pairwise_visible(positions, R + GRAZING_ALTITUDE))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[66, 300, 1200], help="Числа спутников")
+    parser.add_argument("--steps", type=int, default=100, help="Моментов времени (один виток)")
+    parser.add_argument("--max-pairs", type=int, default=50_000, help="Больше пар цикл не измеряется")
+    args = parser.parse_args()
+
+    print(f"{'satellites':>10} {'epochs':>7} {'links/epoch':>12} {'graph, s':>9} {'pairs, s':>9} {'speedup':>8}")
+    failed = False
+    for size in args.sizes:
+        table = ConstellationTable.walker("LEO", size, 6, 1, 86.4, 7158.0)
+        elements = table.elements()
+        t = np.linspace(0.0, table.periods[0], args.steps)
+        start = time.perf_counter()
+        graph = line_of_sight_graph(elements, JD, t)
+        elapsed = time.perf_counter() - start
+        links = np.diff(graph.offsets).mean()
+        if size * (size - 1) // 2 > args.max_pairs:
+            print(f"{size:>10} {t.size:>7} {links:>12.1f} {elapsed:>9.3f} {'-':>9} {'-':>8}")
+            continue
+        start = time.perf_counter()
+        epoch, first, second = direct_edges(elements, t)
+        baseline = time.perf_counter() - start
+        same = (np.array_equal(graph.first, first) and np.array_equal(graph.second, second)
+                and np.array_equal(graph.offsets[1:], np.cumsum(np.bincount(epoch, minlength=t.size))))
+        failed |= not same
+        print(f"{size:>10} {t.size:>7} {links:>12.1f} {elapsed:>9.3f} {baseline:>9.2f} "
+              f"{baseline / elapsed:>7.0f}x  {'OK' if same else 'FAIL'}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
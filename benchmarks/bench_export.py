@@ -0,0 +1,91 @@
+"""Запись анимации: отрисовка кадров в пуле процессов против одного процесса (без дисплея, backend Agg).
+
+Для каждого числа процессов измеряется отрисовка кадров (без кодирования) и полная запись
+файла через save_video (ffmpeg, если есть, иначе GIF через Pillow); скорость - кадров в секунду.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_export
+    python -m benchmarks.bench_export --satellites 120 --frames 2000 --workers 1 2 4 8
+
+Процесс пула рисует свои участки кадров поверх кэшированного фона, а точки кадров других
+процессов только впечатывает в фон, поэтому на одном процессоре пул медленнее, а выигрыш
+растёт с числом ядер. Завершается с кодом 1, если кадры пула отличаются от последовательной
+отрисовки хотя бы одним пикселем или если записано не столько кадров, сколько запрошено.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from constellation import ConstellationTable
+from export import DPI, FIGSIZE, _parallel_frames, _video_animator, has_ffmpeg, save_video
+from utilities import propagate_elements
+
+JD = 2460733.5
+
+
+def sequential_frames(longitudes, latitudes, labels, time_labels, frames):
+    fig, animator = _video_animator("Export", longitudes, latitudes, labels, time_labels.__getitem__)
+    for frame in frames:
+        animator.draw_frame(frame)
+        yield bytes(fig.canvas.buffer_rgba())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--satellites", type=int, default=120, help="Число спутников Walker (кратно 6)")
+    parser.add_argument("--steps", type=int, default=4000, help="Отсчётов на трассу (три витка)")
+    parser.add_argument("--frames", type=int, default=1000, help="Число кадров")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="Числа процессов")
+    args = parser.parse_args()
+
+    table = ConstellationTable.walker("LEO", args.satellites, 6, 1, 53.0, 6928.0)
+    t = np.linspace(0.0, 3 * table.periods[0], args.steps)
+    longitudes, latitudes = propagate_elements(table.elements(), JD, t)
+    labels = [f"Sat {i + 1}" for i in range(args.satellites)]
+    frames = np.unique(np.linspace(0, args.steps - 1, args.frames).astype(int)).tolist()
+    time_labels = {frame: f"Time: {t[frame]:.0f} s" for frame in frames}
+    extension = ".mp4" if has_ffmpeg() else ".gif"
+    print(f"{args.satellites} satellites, {args.steps} steps, {len(frames)} frames, {os.cpu_count()} CPUs, "
+          f"encoder: {'ffmpeg' if has_ffmpeg() else 'Pillow'} ({extension})")
+
+    print(f"{'workers':>7} {'render, s':>10} {'render fps':>11} {'file, s':>8} {'file fps':>9}")
+    failed = False
+    with tempfile.TemporaryDirectory() as directory:
+        for workers in args.workers:
+            start = time.perf_counter()
+            if workers > 1:
+                for _ in _parallel_frames(longitudes, latitudes, "Export", labels, time_labels, frames, workers):
+                    pass
+            else:
+                for _ in sequential_frames(longitudes, latitudes, labels, time_labels, frames):
+                    pass
+            render = time.perf_counter() - start
+            start = time.perf_counter()
+            count = save_video(os.path.join(directory, f"export{extension}"), "Export", longitudes, latitudes,
+                               labels, time_labels.__getitem__, frames, workers=workers)
+            write = time.perf_counter() - start
+            failed |= count != len(frames)
+            print(f"{workers:>7} {render:>10.2f} {len(frames) / render:>11.1f} {write:>8.2f} {count / write:>9.1f}"
+                  f"{'' if count == len(frames) else f'  FAIL: {count} frames written'}")
+
+    # Кадры пула сравниваются с последовательными по мере готовности, без хранения всех кадров
+    workers = max(2, max(args.workers))
+    reference = sequential_frames(longitudes, latitudes, labels, time_labels, frames)
+    differs, count = 0, 0
+    for data in _parallel_frames(longitudes, latitudes, "Export", labels, time_labels, frames, workers):
+        for frame in np.frombuffer(data, dtype=np.uint8).reshape(-1, FIGSIZE[0] * FIGSIZE[1] * DPI**2, 4):
+            expected = np.frombuffer(next(reference), dtype=np.uint8).reshape(-1, 4)
+            differs += bool(np.any(frame != expected))
+            count += 1
+    ok = differs == 0 and count == len(frames)
+    print(f"\nvalidation: {workers} workers against one process, {count} frames, "
+          f"{differs} differ  {'OK' if ok else 'FAIL'}")
+    return 0 if ok and not failed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
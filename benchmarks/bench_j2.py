@@ -0,0 +1,89 @@
+"""Режим J2: скорость расчёта против задачи двух тел и проверка скорости прецессии узла для GPS и ГЛОНАСС.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_j2
+    python -m benchmarks.bench_j2 --days 30 --step 60
+
+Прецессия узла измеряется для номинальных орбит GPS и ГЛОНАСС. Завершается с кодом 1,
+если скорость, измеренная по рассчитанным положениям, расходится с опорными значениями
+больше допуска; та же проверка выполняется в tests/test_j2.py.
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from constants import SATELLITES, SatelliteConfig
+from utilities import calculate_coordinates, j2_secular_rates, propagate_constellation
+
+# Опорные скорости прецессии узла (градусов в сутки) для номинальных круговых орбит:
+#   GPS - OMEGADOT из альманаха GPS, около -7.74e-9 рад/с (-0.0383°/сут), a = 26 560 км, i = 55°;
+#   ГЛОНАСС - около -0.593e-3 рад/сут (-0.0340°/сут), a = 25 510 км, i = 64.8°
+REFERENCE_NODE_RATES = {"GPS": -0.0383, "Glonass": -0.0340}
+NOMINAL_ORBITS = {"GPS": (26560.0, 55.0), "Glonass": (25510.0, 64.8)}  # Большая полуось (в км) и наклонение
+REFERENCE_TOLERANCE = 0.05  # Допуск относительно опорных значений (номинальные орбиты отличаются от реальных)
+FORMULA_TOLERANCE = 1e-3  # Допуск относительно аналитической формулы
+
+
+def measured_node_rate(satellite, days: float, j2: bool) -> float:
+    """Скорость прецессии узла (градусов в сутки), измеренная по положениям из calculate_coordinates.
+
+    Узел находится по вектору момента импульса h = r x v, скорость - численной производной положения.
+    """
+    t = np.linspace(0, days * 86400.0, 200)
+    position = lambda dt: np.stack(calculate_coordinates(
+        satellite.semi_major_axis, satellite.eccentricity, satellite.longitude_of_ascending_node[0],
+        satellite.argument_pericenter[0], satellite.inclination, satellite.mean_anomaly, t + dt, j2=j2))
+    r = position(0.0)
+    v = (position(0.5) - position(-0.5)) / 1.0
+    h = np.cross(r, v, axis=0)
+    node = np.unwrap(np.arctan2(h[0], -h[1]))
+    return np.degrees(np.polyfit(t / 86400.0, node, 1)[0])
+
+
+def timed(function, *args, repeat=3, **kwargs):
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args, **kwargs)
+        durations.append(time.perf_counter() - start)
+    return min(durations)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=float, default=7.0, help="Интервал для замера скорости расчёта (в сутках)")
+    parser.add_argument("--step", type=float, default=60.0, help="Шаг по времени (в секундах)")
+    parser.add_argument("--validation-days", type=float, default=30.0, help="Интервал для оценки прецессии узла")
+    args = parser.parse_args()
+
+    jd = 2460733.5
+    t = np.arange(0.0, args.days * 86400.0, args.step)
+    print(f"{'system':<10} {'points':>9} {'two-body, ms':>13} {'J2, ms':>8} {'overhead':>9}")
+    for name, satellites in SATELLITES.items():
+        n_sats = sum(len(s.longitude_of_ascending_node) * len(s.argument_pericenter) for s in satellites)
+        two_body = timed(propagate_constellation, satellites, jd, t)
+        j2 = timed(propagate_constellation, satellites, jd, t, j2=True)
+        print(f"{name:<10} {n_sats * t.size:>9} {1000 * two_body:>13.1f} {1000 * j2:>8.1f} "
+              f"{100 * (j2 / two_body - 1):>8.0f}%")
+
+    print(f"\nnode regression over {args.validation_days:g} days, deg/day:")
+    print(f"{'system':<10} {'two-body':>9} {'J2':>9} {'formula':>9} {'reference':>10}")
+    failed = False
+    for name, reference in REFERENCE_NODE_RATES.items():
+        a, inclination = NOMINAL_ORBITS[name]
+        satellite = SatelliteConfig(name, 1, inclination, [0.0], [0.0], a, 0.0)
+        two_body = measured_node_rate(satellite, args.validation_days, j2=False)
+        with_j2 = measured_node_rate(satellite, args.validation_days, j2=True)
+        formula = np.degrees(j2_secular_rates(satellite.semi_major_axis, satellite.eccentricity,
+                                              satellite.inclination)[0]) * 86400.0
+        ok = (abs(with_j2 / formula - 1) < FORMULA_TOLERANCE and abs(with_j2 / reference - 1) < REFERENCE_TOLERANCE
+              and abs(two_body) < 1e-6)
+        failed |= not ok
+        print(f"{name:<10} {two_body:>9.5f} {with_j2:>9.5f} {formula:>9.5f} {reference:>10.4f}  {'OK' if ok else 'FAIL'}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,46 @@
+"""Сравнение векторизованного решателя уравнения Кеплера со скалярным методом Ньютона.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_kepler
+    python -m benchmarks.bench_kepler --size 5000000 --eccentricities 0.63323
+"""
+import argparse
+import time
+
+import numpy as np
+
+from constants import IRNSS_GEOSYNC
+from utilities import solve_kepler, solve_kepler_newton
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=2_000_000, help="Число средних аномалий")
+    parser.add_argument("--scalar-sample", type=int, default=20_000,
+                        help="Сколько аномалий решать скалярно (время экстраполируется на --size)")
+    parser.add_argument("--eccentricities", type=float, nargs="+",
+                        default=[0.0, 0.01, IRNSS_GEOSYNC.eccentricity, 0.9])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    M = rng.uniform(-4 * np.pi, 4 * np.pi, args.size)
+    sample = M[:args.scalar_sample]
+
+    print(f"{'e':>8} {'newton, s':>10} {'vector, s':>10} {'speedup':>8} {'iter':>5} {'max residual':>13}")
+    for e in args.eccentricities:
+        start = time.perf_counter()
+        for m in sample:
+            solve_kepler_newton(m, e)
+        newton_time = (time.perf_counter() - start) * args.size / sample.size
+
+        start = time.perf_counter()
+        E, iterations, max_residual = solve_kepler(M, e, return_info=True)
+        vector_time = time.perf_counter() - start
+
+        print(f"{e:>8} {newton_time:>10.2f} {vector_time:>10.3f} "
+              f"{newton_time / vector_time:>7.0f}x {iterations:>5} {max_residual:>13.2e}")
+    print(f"Скалярный решатель измерен на {sample.size} аномалиях и экстраполирован на {args.size}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Масштабирование параллельного расчёта трасс по числу процессов на большой синтетической системе.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_parallel
+    python -m benchmarks.bench_parallel --planes 40 --slots 50 --workers 1 2 4 8
+
+Процессы получают части групп симметрии и считают их по своим опорным орбитам, поэтому трассы
+совпадают с последовательным расчётом с точностью TOLERANCE, а не побитово.
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+from astropy.time import Time
+
+from constants import R, SatelliteConfig
+from parallel import propagate_parallel, shutdown_executors
+from utilities import propagate_constellation
+
+TOLERANCE = 1e-9  # Допустимое расхождение долготы (в градусах), как в bench_symmetry
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--planes", type=int, default=40, help="Число плоскостей (значений Ω)")
+    parser.add_argument("--slots", type=int, default=25, help="Число спутников в плоскости (значений ω)")
+    parser.add_argument("--steps", type=int, default=5000, help="Число временных шагов")
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    args = parser.parse_args()
+
+    synthetic = SatelliteConfig(
+        name="Synthetic",
+        num_satellite=args.planes * args.slots,
+        inclination=53,
+        longitude_of_ascending_node=list(np.linspace(0, 360, args.planes, endpoint=False)),
+        argument_pericenter=list(np.linspace(0, 360, args.slots, endpoint=False)),
+        semi_major_axis=R + 550,
+        eccentricity=0.001
+    )
+    date = Time("2025-02-27 00:00:00", format="iso", scale="utc")
+    time_steps = np.linspace(0, synthetic.T, args.steps)
+
+    start = time.perf_counter()
+    reference, _ = propagate_constellation([synthetic], date, time_steps)
+    serial_time = time.perf_counter() - start
+    print(f"{synthetic.num_satellite} satellites x {args.steps} steps, {os.cpu_count()} CPU")
+    print(f"{'workers':>8} {'time, s':>9} {'speedup':>8} {'efficiency':>11}")
+    print(f"{'serial':>8} {serial_time:>9.3f} {1:>7.2f}x {1:>10.0%}")
+    for workers in args.workers:
+        propagate_parallel([synthetic], date, time_steps, workers=workers)  # Прогрев: запуск пула процессов не измеряем
+        start = time.perf_counter()
+        longitudes, _ = propagate_parallel([synthetic], date, time_steps, workers=workers)
+        elapsed = time.perf_counter() - start
+        assert np.abs((longitudes - reference + 180) % 360 - 180).max() <= TOLERANCE
+        speedup = serial_time / elapsed
+        print(f"{workers:>8} {elapsed:>9.3f} {speedup:>7.2f}x {speedup / workers:>10.0%}")
+    shutdown_executors()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Прогноз пролётов над станциями: время расчёта для тысяч пар станция-спутник и сверка с плотной сеткой.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_passes
+    python -m benchmarks.bench_passes --stations 100 --days 7
+
+Завершается с кодом 1, если на проверочном интервале найдены не все пролёты, видимые на
+сетке с шагом 1 с, или моменты восхода/захода расходятся с ней больше чем на шаг сетки.
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from constants import SATELLITES
+from constellation import ConstellationTable
+from passes import GroundStation, _Geometry, predict_passes
+
+DENSE_STEP = 1.0  # Шаг проверочной сетки (в секундах)
+EVENT_TOLERANCE = 0.01  # Точность моментов событий в predict_passes (в секундах)
+
+
+def random_stations(count: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    latitudes = np.degrees(np.arcsin(rng.uniform(-1, 1, count)))  # Равномерно по поверхности
+    return [GroundStation(f"S{k}", lat, lon, 0.0, mask)
+            for k, (lat, lon, mask) in enumerate(zip(latitudes, rng.uniform(-180, 180, count), rng.uniform(0, 20, count)))]
+
+
+def dense_passes(elements, stations, jd, span):
+    """Участки видимости на сетке с шагом DENSE_STEP: (строка пары, первый и последний видимый момент)."""
+    geometry = _Geometry(elements, stations, jd, False)
+    t = np.arange(0.0, span + DENSE_STEP / 2, DENSE_STEP)
+    n_sats = len(elements["semi_major_axis"])
+    rows, first, last = [], [], []
+    for k in range(n_sats):  # По одному спутнику, чтобы не держать всю плотную сетку в памяти
+        f = geometry.grid(slice(k, k + 1), t).reshape(-1, t.size)
+        padded = np.zeros((f.shape[0], t.size + 2), dtype=np.int8)
+        padded[:, 1:-1] = f > 0
+        edges = np.diff(padded, axis=1)
+        r, starts = np.nonzero(edges == 1)
+        _, ends = np.nonzero(edges == -1)
+        rows.append(r * n_sats + k)
+        first.append(starts)
+        last.append(ends - 1)
+    return (np.concatenate(rows), t[np.concatenate(first)], t[np.concatenate(last)],
+            np.concatenate(first) == 0, np.concatenate(last) == t.size - 1)
+
+
+def validate(elements, stations, jd, span):
+    passes = predict_passes(elements, stations, jd, span, tolerance=EVENT_TOLERANCE)
+    rows, first, last, open_start, open_end = dense_passes(elements, stations, jd, span)
+    n_sats = len(elements["semi_major_axis"])
+    pair = passes["station"].astype(np.int64) * n_sats + passes["satellite"]
+    missing, worst = 0, 0.0
+    for row, aos, los, open_aos, open_los in zip(rows, first, last, open_start, open_end):
+        match = (pair == row) & (passes["culmination"] >= aos - DENSE_STEP) & (passes["culmination"] <= los + DENSE_STEP)
+        if match.sum() != 1:
+            missing += 1
+            continue
+        found = passes[match][0]
+        if not open_aos:
+            worst = max(worst, abs(found["aos"] - aos))
+        if not open_los:
+            worst = max(worst, abs(found["los"] - los))
+    return len(passes), rows.size, missing, worst
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--stations", type=int, default=30, help="Число станций")
+    parser.add_argument("--days", type=float, default=7.0, help="Длительность интервала (в сутках)")
+    parser.add_argument("--validation-hours", type=float, default=24.0, help="Проверочный интервал (в часах)")
+    args = parser.parse_args()
+
+    jd = 2460733.5
+    stations = random_stations(args.stations)
+    gnss = ConstellationTable.concatenate([ConstellationTable.from_configs(s) for s in SATELLITES.values()])
+    leo = ConstellationTable.walker("LEO", 300, 15, 1, 53.0, 6928.0)
+    cases = [("SATELLITES", gnss), ("Walker LEO 300", leo)]
+
+    print(f"{'constellation':<16} {'pairs':>7} {'days':>5} {'passes':>8} {'time, s':>8}")
+    for name, table in cases:
+        elements = table.elements()
+        start = time.perf_counter()
+        passes = predict_passes(elements, stations, jd, args.days * 86400.0)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<16} {len(stations) * len(table):>7} {args.days:>5g} {len(passes):>8} {elapsed:>8.2f}")
+
+    print(f"\nvalidation against a {DENSE_STEP:g} s grid over {args.validation_hours:g} h:")
+    print(f"{'constellation':<16} {'passes':>8} {'grid':>6} {'missed':>7} {'max AOS/LOS err, s':>19}")
+    failed = False
+    for name, table in cases:
+        count, reference, missing, worst = validate(table.elements(), stations, jd, args.validation_hours * 3600.0)
+        ok = missing == 0 and count == reference and worst <= DENSE_STEP + EVENT_TOLERANCE
+        failed |= not ok
+        print(f"{name:<16} {count:>8} {reference:>6} {missing:>7} {worst:>19.3f}  {'OK' if ok else 'FAIL'}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""Трассы линиями против точек: сколько отсчётов нужно, чтобы трасса выглядела непрерывной, и время отрисовки Agg.
+
+Точкам нужен шаг, при котором соседние маркеры перекрываются (расстояние не больше диаметра
+маркера); линиям - шаг, при котором ломаная отклоняется от истинной трассы не больше чем на 1 пиксель.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_polylines
+    python -m benchmarks.bench_polylines --days 2
+"""
+import argparse
+import time
+
+import numpy as np
+
+from constants import SATELLITES
+from export import DPI, track_figure
+from polylines import split_antimeridian
+from utilities import propagate_elements, satellite_slots
+
+MARKER_SIZE = 4  # Размер маркера (в пунктах), как в окне приложения и export.track_figure
+MAX_DOUBLINGS = 20  # Наибольшее число удвоений числа отсчётов при подборе шага
+
+
+def marker_gap(lon, lat):
+    """Наибольшее расстояние (в градусах карты) между соседними точками трассы."""
+    d_lon = (np.diff(lon, axis=-1) + 180.0) % 360.0 - 180.0
+    return np.hypot(d_lon, np.diff(lat, axis=-1)).max()
+
+
+def line_deviation(t, lon, lat, t_dense, lon_dense, lat_dense):
+    """Наибольшее отклонение (в градусах карты) ломаной через отсчёты от плотной эталонной трассы."""
+    worst = 0.0
+    for k in range(lon.shape[0]):
+        lon_line = np.interp(t_dense, t, np.unwrap(lon[k], period=360.0))
+        d_lon = (lon_line - lon_dense[k] + 180.0) % 360.0 - 180.0
+        worst = max(worst, np.hypot(d_lon, np.interp(t_dense, t, lat[k]) - lat_dense[k]).max())
+    return worst
+
+
+def required_samples(elements, jd, span, criterion):
+    """Наименьшее число отсчётов (удвоениями от 64), при котором criterion(t, lon, lat) выполняется."""
+    n = 64
+    for _ in range(MAX_DOUBLINGS):
+        t = np.linspace(0.0, span, n + 1)
+        lon, lat = propagate_elements(elements, jd, t)
+        if criterion(t, lon, lat):
+            return t, lon, lat
+        n *= 2
+    return t, lon, lat
+
+
+def draw_time(labels, longitudes, latitudes, lines: bool, repeat: int = 3) -> float:
+    fig, ax, handles, _ = track_figure("", labels)
+    for handle, lon, lat in zip(handles, longitudes, latitudes):
+        if lines:
+            handle.set_linestyle('-')
+            handle.set_marker('None')
+        handle.set_data(lon, lat)
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fig.canvas.draw()
+        durations.append(time.perf_counter() - start)
+    return min(durations)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=float, default=1.0, help="Длительность интервала (в сутках)")
+    parser.add_argument("--dense", type=int, default=400000, help="Отсчётов эталонной трассы на интервал")
+    args = parser.parse_args()
+
+    fig, ax, _, _ = track_figure("", [])
+    fig.canvas.draw()
+    degrees_per_pixel = 360.0 / ax.get_window_extent().width  # Ширина пикселя карты (в градусах)
+    marker_diameter = MARKER_SIZE * DPI / 72 * degrees_per_pixel
+
+    jd = 2460733.5
+    span = args.days * 86400.0
+    t_dense = np.linspace(0.0, span, args.dense)
+    print(f"pixel = {degrees_per_pixel:.3f} deg, marker = {marker_diameter:.3f} deg")
+    print(f"{'system':<10} {'marker pts':>11} {'line pts':>9} {'reduction':>10} "
+          f"{'markers, ms':>12} {'lines, ms':>10} {'split, ms':>10}")
+    for name, satellites in SATELLITES.items():
+        elements = satellite_slots(satellites)
+        lon_dense, lat_dense = propagate_elements(elements, jd, t_dense)
+        labels = [str(k) for k in range(lon_dense.shape[0])]
+
+        _, lon_m, lat_m = required_samples(elements, jd, span, lambda t, lon, lat: marker_gap(lon, lat) <= marker_diameter)
+        t_l, lon_l, lat_l = required_samples(
+            elements, jd, span,
+            lambda t, lon, lat: line_deviation(t, lon, lat, t_dense, lon_dense, lat_dense) <= degrees_per_pixel)
+        start = time.perf_counter()
+        lon_s, lat_s = split_antimeridian(lon_l, lat_l)
+        split = time.perf_counter() - start
+
+        markers = draw_time(labels, lon_m, lat_m, lines=False)
+        lines = draw_time(labels, lon_s, lat_s, lines=True)
+        print(f"{name:<10} {lon_m.size:>11} {lon_l.size:>9} {lon_m.size / lon_l.size:>9.1f}x "
+              f"{1000 * markers:>12.1f} {1000 * lines:>10.1f} {1000 * split:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Сравнение скорости векторизованного расчёта трасс с прежним поэлементным циклом.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_propagation
+    python -m benchmarks.bench_propagation --steps 0.01 0.001
+"""
+import argparse
+import time
+
+import numpy as np
+from astropy.time import Time
+
+from constants import TIME_STEPS, SATELLITES
+from utilities import (
+    calculate_coordinate,
+    calculate_siderial_time,
+    generate_transition_matrix,
+    calculate_longitudes_latitudes,
+)
+
+
+def reference_longitudes_latitudes(satellite, date, dt):
+    """Прежняя реализация calculate_longitudes_latitudes: цикл по каждому слоту и каждому шагу."""
+    T = satellite.T
+    time_steps = np.linspace(0, T, int(T / (dt * T)) + 1)
+    all_longitudes, all_latitudes = [], []
+    for Omega in satellite.longitude_of_ascending_node:
+        for omega in satellite.argument_pericenter:
+            longitudes_n, latitudes_n = [], []
+            for time_step in time_steps:
+                H = calculate_siderial_time(initial_date=date.jd, t=time_step)
+                initial_coordinate = calculate_coordinate(
+                    semi_major_axis=satellite.semi_major_axis,
+                    eccentricity=satellite.eccentricity,
+                    longitude_of_ascending_node=Omega,
+                    argument_pericenter=omega,
+                    inclination=satellite.inclination,
+                    mean_anomaly=satellite.mean_anomaly,
+                    delta_t=time_step
+                )
+                coordinate = generate_transition_matrix(H=H) @ initial_coordinate
+                r = np.linalg.norm(coordinate)
+                longitudes_n.append(np.degrees(np.arctan2(coordinate[1], coordinate[0])))
+                latitudes_n.append(np.degrees(np.arcsin(coordinate[2] / r)))
+            all_longitudes.append(longitudes_n)
+            all_latitudes.append(latitudes_n)
+    return all_longitudes, all_latitudes
+
+
+def timed(function, *args):
+    """Возвращает результат функции и время её выполнения в секундах."""
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--steps", type=float, nargs="+", default=TIME_STEPS, help="Относительные шаги времени")
+    parser.add_argument("--systems", nargs="+", default=list(SATELLITES), help="Системы из SATELLITES")
+    args = parser.parse_args()
+
+    date = Time("2025-02-27 00:00:00", format="iso", scale="utc")
+    print(f"{'system':<12} {'dt':>8} {'points':>9} {'loop, s':>9} {'batch, s':>9} {'speedup':>8} {'max |Δ|, deg':>13}")
+    for name in args.systems:
+        for dt in args.steps:
+            points = 0
+            loop_time = batch_time = 0.0
+            max_error = 0.0
+            for satellite in SATELLITES[name]:
+                (ref_lons, ref_lats), elapsed = timed(reference_longitudes_latitudes, satellite, date, dt)
+                loop_time += elapsed
+                (lons, lats), elapsed = timed(calculate_longitudes_latitudes, satellite, date, dt)
+                batch_time += elapsed
+                points += np.size(lons)
+                # Разница долгот с учётом перехода через ±180°
+                d_lon = (np.asarray(lons) - np.asarray(ref_lons) + 180) % 360 - 180
+                d_lat = np.asarray(lats) - np.asarray(ref_lats)
+                max_error = max(max_error, np.abs(d_lon).max(), np.abs(d_lat).max())
+            print(f"{name:<12} {dt:>8} {points:>9} {loop_time:>9.3f} {batch_time:>9.4f} "
+                  f"{loop_time / batch_time:>7.0f}x {max_error:>13.2e}")
+
+
+if __name__ == "__main__":
+    main()
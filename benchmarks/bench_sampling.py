@@ -0,0 +1,62 @@
+"""Адаптивная временная сетка против равномерных TIME_STEPS: число точек и фактическая погрешность трассы (в км).
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_sampling
+    python -m benchmarks.bench_sampling --tolerance 0.5 --revolutions 3
+"""
+import argparse
+import time
+
+import numpy as np
+
+from constants import SATELLITES, TIME_STEPS
+from sampling import adaptive_time_steps
+from transforms import ground_distance
+from utilities import propagate_elements, satellite_slots
+
+
+def track_error(t, lon, lat, t_dense, lon_dense, lat_dense):
+    """Наибольшее отклонение (в км) трассы, соединённой отрезками между отсчётами, от плотной эталонной трассы."""
+    worst = 0.0
+    for k in range(lon.shape[0]):
+        lon_line = np.interp(t_dense, t, np.unwrap(lon[k], period=360.0))
+        lat_line = np.interp(t_dense, t, lat[k])
+        worst = max(worst, ground_distance(lon_line, lat_line, lon_dense[k], lat_dense[k]).max())
+    return worst
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tolerance", type=float, default=1.0, help="Допуск адаптивной сетки (в км)")
+    parser.add_argument("--revolutions", type=float, default=1.0, help="Длительность интервала в витках")
+    parser.add_argument("--dense", type=int, default=200000, help="Отсчётов эталонной трассы на интервал")
+    args = parser.parse_args()
+
+    jd = 2460733.5
+    print(f"{'configuration':<24}" + "".join(f"{f'dt={dt:g}':>22}" for dt in TIME_STEPS)
+          + f"{f'adaptive {args.tolerance:g} km':>26}")
+    print(f"{'':<24}" + f"{'points  err, km':>22}" * len(TIME_STEPS) + f"{'points  err, km    ms':>26}")
+    totals = np.zeros(len(TIME_STEPS) + 1)
+    for satellites in SATELLITES.values():
+        for satellite in satellites:
+            elements = satellite_slots([satellite])
+            span = args.revolutions * satellite.T
+            t_dense = np.linspace(0, span, args.dense)
+            lon_dense, lat_dense = propagate_elements(elements, jd, t_dense)
+            row = f"{satellite.satellite_name:<24}"
+            for k, dt in enumerate(TIME_STEPS):
+                t = np.linspace(0, span, int(args.revolutions / dt) + 1)
+                lon, lat = propagate_elements(elements, jd, t)
+                row += f"{t.size:>9} {track_error(t, lon, lat, t_dense, lon_dense, lat_dense):>12.3f}"
+                totals[k] += t.size
+            start = time.perf_counter()
+            t, lon, lat = adaptive_time_steps(elements, jd, span, args.tolerance)
+            elapsed = 1000 * (time.perf_counter() - start)
+            row += f"{t.size:>9} {track_error(t, lon, lat, t_dense, lon_dense, lat_dense):>12.3f} {elapsed:>6.1f}"
+            totals[-1] += t.size
+            print(row)
+    print(f"{'total points':<24}" + "".join(f"{int(n):>9}{'':>13}" for n in totals[:-1]) + f"{int(totals[-1]):>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Звездное время: прежний расчёт по отсчётам против векторизованного sidereal_angles и таблицы вращения Земли.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_sidereal
+    python -m benchmarks.bench_sidereal --days 365 --step 10
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+from astropy.time import Time
+
+from constants import W
+from sidereal import EarthRotationTable, gmst, set_rotation_table, sidereal_angles
+
+
+def legacy_sidereal(date, time_steps):
+    """Прежняя схема: атрибут date.jd и полином H0 на каждом отсчёте."""
+    result = np.empty(len(time_steps))
+    for k, t in enumerate(time_steps):
+        tu = (date.jd - 2451545.0) / 36525.0
+        H0 = 24110.54841 + 8640184.812866 * tu + 0.093104 * tu**2 - 6.21e-6 * tu**3
+        result[k] = H0 + W * t
+    return result
+
+
+def timed(function, *args, repeat=3):
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        durations.append(time.perf_counter() - start)
+    return result, min(durations)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--epoch", default="2025-02-27 00:00:00")
+    parser.add_argument("--days", type=float, default=365.0, help="Длительность интервала (в сутках)")
+    parser.add_argument("--step", type=float, default=10.0, help="Шаг по времени (в секундах)")
+    parser.add_argument("--legacy-samples", type=int, default=20000, help="Отсчётов для прежней схемы")
+    args = parser.parse_args()
+
+    date = Time(args.epoch, scale="utc")
+    jd = date.jd
+    t = np.arange(0.0, args.days * 86400.0, args.step)
+    print(f"interval: {args.days:g} d, step {args.step:g} s, {len(t)} samples")
+
+    _, legacy = timed(legacy_sidereal, date, t[:args.legacy_samples], repeat=1)
+    legacy *= len(t) / min(len(t), args.legacy_samples)
+    print(f"legacy per-sample loop (extrapolated): {legacy:10.3f} s")
+
+    _, vectorized = timed(sidereal_angles, jd, t)
+    print(f"sidereal_angles, cached epoch H0:      {vectorized:10.3f} s  ({legacy / vectorized:.0f}x)")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "rotation.npy")
+        start = time.perf_counter()
+        EarthRotationTable.build(jd - 1, 20 * 365.25, path=path)
+        print(f"table build, 20 years daily nodes:     {time.perf_counter() - start:10.3f} s  "
+              f"({os.path.getsize(path) / 1024:.0f} KiB)")
+        table = EarthRotationTable.open(path)
+        set_rotation_table(table)
+        _, lookup = timed(sidereal_angles, jd, t)
+        set_rotation_table(None)
+        print(f"sidereal_angles, memory-mapped table:  {lookup:10.3f} s  ({legacy / lookup:.0f}x)")
+
+        # Точность: формула по отсчётам, эпоха + W*t и таблица против ERFA (astropy)
+        check = t[::max(1, len(t) // 2000)]
+        reference = Time(jd + check / 86400.0, format="jd", scale="utc").sidereal_time("mean", "greenwich").rad
+        error = lambda values: np.degrees(np.abs(np.angle(np.exp(1j * (values - reference))))).max() * 3600
+        print(f"\nmax error vs astropy GMST over the interval (arcsec):")
+        print(f"  gmst() per sample:      {error(gmst(jd + check / 86400.0)):10.3f}")
+        print(f"  epoch H0 + W*t:         {error(sidereal_angles(jd, check)):10.3f}")
+        print(f"  rotation table:         {error(table.angles(jd, check)):10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Пространственный индекс трасс: запросы по прямоугольнику и радиусу против просмотра списков all_longitudes/all_latitudes.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_spatial
+    python -m benchmarks.bench_spatial --dt 0.001 --queries 500
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from constants import SATELLITES
+from spatial import TrackIndex
+from transforms import ground_distance
+from utilities import period_time_steps, propagate_constellation
+
+
+def scan_bbox(longitudes, latitudes, lon_min, lon_max, lat_min, lat_max):
+    """Просмотр всех отсчётов по спутникам, как по спискам в окне приложения."""
+    hits = []
+    for i, (lon, lat) in enumerate(zip(longitudes, latitudes)):
+        inside = (lat >= lat_min) & (lat <= lat_max)
+        inside &= ((lon >= lon_min) & (lon <= lon_max)) if lon_min <= lon_max else ((lon >= lon_min) | (lon <= lon_max))
+        steps = np.flatnonzero(inside)
+        hits.append((np.full(steps.size, i), steps))
+    return tuple(np.concatenate(column) for column in zip(*hits))
+
+
+def scan_radius(longitudes, latitudes, lon0, lat0, radius):
+    hits = []
+    for i, (lon, lat) in enumerate(zip(longitudes, latitudes)):
+        steps = np.flatnonzero(ground_distance(lon0, lat0, lon, lat) <= radius)
+        hits.append((np.full(steps.size, i), steps))
+    return tuple(np.concatenate(column) for column in zip(*hits))
+
+
+def same_hits(a, b) -> bool:
+    key = lambda hits: np.sort(hits[0].astype(np.int64) * 2**32 + hits[1])
+    return np.array_equal(key(a), key(b))
+
+
+def timed(function, queries):
+    durations, results = [], []
+    for query in queries:
+        start = time.perf_counter()
+        results.append(function(*query))
+        durations.append(time.perf_counter() - start)
+    return 1000 * np.median(durations), 1000 * np.max(durations), results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dt", type=float, default=0.0001, help="Шаг по времени (в долях витка), как в приложении")
+    parser.add_argument("--queries", type=int, default=200, help="Число случайных запросов каждого вида")
+    parser.add_argument("--box", type=float, default=5.0, help="Размер прямоугольника (в градусах)")
+    parser.add_argument("--radius", type=float, default=300.0, help="Радиус запроса (в км)")
+    args = parser.parse_args()
+
+    longitudes, latitudes = [], []
+    for satellites in SATELLITES.values():
+        t = period_time_steps(satellites[0].T, args.dt)
+        lon, lat = propagate_constellation(satellites, 2460733.5, t)
+        longitudes.extend(lon)
+        latitudes.extend(lat)
+    samples = sum(track.size for track in longitudes)
+
+    start = time.perf_counter()
+    index = TrackIndex(longitudes, latitudes)
+    build = time.perf_counter() - start
+    print(f"{len(longitudes)} tracks, {samples} samples, index built in {1000 * build:.1f} ms\n")
+
+    rng = np.random.default_rng(0)
+    lon0 = rng.uniform(-180, 180, args.queries)
+    lat0 = np.degrees(np.arcsin(rng.uniform(-1, 1, args.queries)))
+    boxes = [((x - args.box / 2 + 180) % 360 - 180, (x + args.box / 2 + 180) % 360 - 180,
+              max(y - args.box / 2, -90), min(y + args.box / 2, 90)) for x, y in zip(lon0, lat0)]
+    circles = [(x, y, args.radius) for x, y in zip(lon0, lat0)]
+
+    print(f"{'query':<18} {'index, ms':>10} {'max, ms':>8} {'scan, ms':>9} {'speedup':>8} {'hits':>7}")
+    failed = False
+    for name, indexed, scan, queries in (
+            (f"bbox {args.box:g}°", index.query_bbox, lambda *q: scan_bbox(longitudes, latitudes, *q), boxes),
+            (f"radius {args.radius:g} km", lambda *q: index.query_radius(*q)[:2],
+             lambda *q: scan_radius(longitudes, latitudes, *q), circles)):
+        fast, worst, results = timed(indexed, queries)
+        slow, _, expected = timed(scan, queries)
+        ok = all(same_hits(a, b) for a, b in zip(results, expected))
+        failed |= not ok
+        hits = np.mean([r[0].size for r in results])
+        print(f"{name:<18} {fast:>10.3f} {worst:>8.3f} {slow:>9.2f} {slow / fast:>7.0f}x {hits:>7.0f}  {'OK' if ok else 'FAIL'}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+"""Время запуска окна выбора системы: отчёт python -X importtime для main и проверка бюджета.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --budget 0.3 --top 15
+
+Завершается с кодом 1, если импорт main дольше бюджета или при запуске
+загружаются тяжёлые модули (NumPy, matplotlib, astropy), - это регрессия.
+"""
+import argparse
+import subprocess
+import sys
+
+HEAVY = ("numpy", "matplotlib", "astropy")  # Модули, которые не должны загружаться до нажатия "Go"
+
+
+def import_times(module: str):
+    """Запускает отдельный интерпретатор и возвращает [(модуль, собственное время, накопленное время)] в секундах."""
+    code = f"import sys, {module}; print(','.join(sorted(sys.modules)))"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            capture_output=True, text=True, check=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        rows.append((name, int(own) / 1e6, int(cumulative) / 1e6))
+    loaded = set(result.stdout.strip().split(","))
+    return rows, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget", type=float, default=0.5, help="Допустимое время импорта main (в секундах)")
+    parser.add_argument("--top", type=int, default=10, help="Сколько самых долгих импортов показать")
+    parser.add_argument("--repeat", type=int, default=5, help="Число запусков (берётся лучший)")
+    args = parser.parse_args()
+
+    runs = [import_times("main") for _ in range(args.repeat)]
+    rows, loaded = min(runs, key=lambda run: next(c for n, _, c in run[0] if n == "main"))
+    total = next(cumulative for name, _, cumulative in rows if name == "main")
+
+    print(f"{'cumulative, ms':>15} {'self, ms':>9}  module")
+    for name, own, cumulative in sorted(rows, key=lambda row: -row[2])[:args.top]:
+        print(f"{1000 * cumulative:>15.1f} {1000 * own:>9.1f}  {name}")
+
+    heavy = sorted(module for module in loaded if module.split(".")[0] in HEAVY)
+    print(f"\nimport main: {1000 * total:.1f} ms (budget {1000 * args.budget:.0f} ms)")
+    failed = False
+    if total > args.budget:
+        print("FAIL: startup import time over budget")
+        failed = True
+    if heavy:
+        print(f"FAIL: heavy modules loaded at startup: {', '.join(heavy[:10])}")
+        failed = True
+    if not failed:
+        print("OK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""Повторное использование симметрий группировок: доля рассчитанных отсчётов, время и сверка с полным расчётом.
+
+Для каждой системы приложения и группировки Уокера трассы считаются propagate_elements
+(все слоты) и propagate_symmetric (по опорной орбите на группу симметрии) на трёх сетках:
+один виток с шагом приложения, несколько суток с шагом T/1000 (опорная орбита повторяется каждый
+виток) и те же сутки с шагом 60 с (сдвиги по времени не кратны шагу, остаются только сдвиги узла).
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_symmetry
+    python -m benchmarks.bench_symmetry --days 7 --j2
+
+Завершается с кодом 1, если трассы расходятся с полным расчётом больше чем на TOLERANCE.
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from constants import SATELLITES
+from constellation import ConstellationTable
+from symmetry import propagate_symmetric
+from utilities import period_time_steps, propagate_elements
+
+TOLERANCE = 1e-9  # Допустимое расхождение долготы и широты (в градусах)
+
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dt", type=float, default=0.0001, help="Шаг по времени для одного витка (в долях витка), как в приложении")
+    parser.add_argument("--days", type=float, default=2.0, help="Длительность длинного интервала (в сутках)")
+    parser.add_argument("--j2", action="store_true", help="С вековыми возмущениями J2")
+    args = parser.parse_args()
+
+    jd = 2460733.5
+    tables = {name: ConstellationTable.from_configs(configs) for name, configs in SATELLITES.items()}
+    tables["Walker 24/3/1"] = ConstellationTable.walker("Walker", 24, 3, 1, 56.0, 29600.0)
+    tables["Walker 300/15/1"] = ConstellationTable.walker("Walker", 300, 15, 1, 53.0, 6928.0)
+
+    print(f"{'constellation':<17} {'grid':<13} {'slots':>5} {'steps':>6} {'computed, %':>12} "
+          f"{'full, ms':>9} {'symmetric, ms':>14} {'speedup':>8} {'max err, deg':>13}")
+    failed = False
+    total_full = total_symmetric = 0.0
+    for name, table in tables.items():
+        elements = table.elements()
+        period = table.periods[0]
+        grids = {
+            "one period": period_time_steps(period, args.dt),
+            f"{args.days:g} d, T/1000": period / 1000 * np.arange(int(args.days * 86400 / (period / 1000)) + 1),
+            f"{args.days:g} d, 60 s": np.arange(0.0, args.days * 86400 + 1, 60.0),
+        }
+        for grid, t in grids.items():
+            (lon, lat), full = timed(propagate_elements, elements, jd, t, j2=args.j2)
+            (lon_s, lat_s, computed), symmetric = timed(propagate_symmetric, elements, jd, t, j2=args.j2, return_info=True)
+            error = max(np.abs((lon_s - lon + 180.0) % 360.0 - 180.0).max(), np.abs(lat_s - lat).max())
+            ok = error <= TOLERANCE
+            failed |= not ok
+            total_full += full
+            total_symmetric += symmetric
+            print(f"{name:<17} {grid:<13} {len(table):>5} {t.size:>6} {100 * computed / lon.size:>12.2f} "
+                  f"{1000 * full:>9.1f} {1000 * symmetric:>14.1f} {full / symmetric:>7.1f}x {error:>13.1e}  {'OK' if ok else 'FAIL'}")
+    print(f"\ntotal: full {total_full:.2f} s, symmetric {total_symmetric:.2f} s ({total_full / total_symmetric:.1f}x)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""ECI → ECEF → долгота/широта: прежний расчёт по отсчётам (матрица 3x3, @, norm) против пакетного transforms.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_transforms
+    python -m benchmarks.bench_transforms --points 2000000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from transforms import eci_to_ecef, eci_to_geographic
+from utilities import generate_transition_matrix
+
+
+def legacy(positions, angles):
+    """Прежняя схема: матрица поворота, произведение и нормировка для каждого отсчёта."""
+    lon, lat = np.empty(len(positions)), np.empty(len(positions))
+    for k, (position, H) in enumerate(zip(positions, angles)):
+        coordinate = generate_transition_matrix(H=H) @ position
+        r = np.linalg.norm(coordinate)
+        lon[k] = np.degrees(np.arctan2(coordinate[1], coordinate[0]))
+        lat[k] = np.degrees(np.arcsin(coordinate[2] / r))
+    return lon, lat
+
+
+def timed(function, *args, repeat=5, **kwargs):
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args, **kwargs)
+        durations.append(time.perf_counter() - start)
+    return result, min(durations)
+
+
+def angle_error(a, b):
+    return np.abs((np.asarray(a, dtype=float) - b + 180) % 360 - 180).max()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--points", type=int, default=1_000_000)
+    parser.add_argument("--legacy-points", type=int, default=20000, help="Отсчётов для прежней схемы")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    positions = rng.normal(size=(args.points, 3))
+    positions *= (rng.uniform(6600, 42500, args.points) / np.linalg.norm(positions, axis=1))[:, np.newaxis]
+    angles = np.linspace(0, 2 * np.pi * 30, args.points)
+
+    n = min(args.points, args.legacy_points)
+    (ref_lon, ref_lat), loop = timed(legacy, positions[:n], angles[:n], repeat=1)
+    loop *= args.points / n
+    print(f"{args.points} points")
+    print(f"legacy per-sample loop (extrapolated):  {1000 * loop:10.1f} ms")
+
+    (lon, lat), fused = timed(eci_to_geographic, positions, angles)
+    print(f"fused float64:                          {1000 * fused:10.1f} ms  ({loop / fused:.0f}x)"
+          f"  max |Δ| {max(angle_error(lon[:n], ref_lon), angle_error(lat[:n], ref_lat)):.1e} deg")
+
+    out = (np.empty(args.points), np.empty(args.points))
+    _, buffered = timed(eci_to_geographic, positions, angles, out=out)
+    print(f"fused float64, preallocated out=:       {1000 * buffered:10.1f} ms  ({loop / buffered:.0f}x)")
+
+    positions32 = positions.astype(np.float32)
+    out32 = (np.empty(args.points, np.float32), np.empty(args.points, np.float32))
+    (lon32, lat32), single = timed(eci_to_geographic, positions32, angles, out=out32, dtype=np.float32)
+    print(f"fused float32, preallocated out=:       {1000 * single:10.1f} ms  ({loop / single:.0f}x)"
+          f"  max |Δ| {max(angle_error(lon32, lon), angle_error(lat32, lat)):.1e} deg")
+
+    _, geodetic = timed(eci_to_geographic, positions, angles, geodetic=True)
+    print(f"fused geodetic WGS-84 (lat + alt):      {1000 * geodetic:10.1f} ms  ({loop / geodetic:.0f}x)")
+
+    _, rotation = timed(eci_to_ecef, positions, angles, out=np.empty_like(positions))
+    print(f"eci_to_ecef only, preallocated out=:    {1000 * rotation:10.1f} ms")
+
+    try:
+        import astropy.units as u
+        from astropy.coordinates import EarthLocation
+    except ImportError:
+        return
+    ecef = eci_to_ecef(positions[:n], angles[:n])
+    location = EarthLocation.from_geocentric(*(ecef.T * u.km)).to_geodetic("WGS84")
+    lon_g, lat_g, alt_g = eci_to_geographic(positions[:n], angles[:n], geodetic=True)
+    print(f"\ngeodetic vs astropy: lon {angle_error(lon_g, location.lon.deg):.1e} deg, "
+          f"lat {angle_error(lat_g, location.lat.deg):.1e} deg, "
+          f"alt {np.abs(alt_g - location.height.to(u.km).value).max() * 1e6:.2f} mm")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+import hashlib  # Хеширование параметров для ключа кэша
+import os  # Работа с путями и файлами дискового кэша
+import threading  # Блокировка для доступа из фонового потока расчёта
+from collections import OrderedDict  # Упорядоченный словарь для LRU-вытеснения
+from typing import Callable, List, Optional
+
+import numpy as np  # Импортируем библиотеку NumPy для работы с массивами
+
+from constants import SatelliteConfig
+from sidereal import julian_date
+from utilities import propagate_constellation
+
+
+CACHE_VERSION = 3  # Увеличивается при изменении модели расчёта, чтобы не читать устаревшие трассы с диска
+
+
+def track_key(satellites: List[SatelliteConfig], jd: float, time_steps, j2: bool = False) -> str:
+    """Строит ключ кэша по орбитальным элементам системы, эпохе, временной сетке и модели движения (J2)."""
+    digest = hashlib.sha1()
+    digest.update(f"v{CACHE_VERSION}".encode())
+    digest.update(b"j2" if j2 else b"two-body")  # Трассы с J2 и без него при тех же элементах различаются
+    for s in satellites:
+        # Имя системы на результат не влияет, поэтому в ключ входят только элементы орбиты
+        elements = (s.semi_major_axis, s.eccentricity, s.inclination, s.mean_anomaly,
+                    tuple(s.longitude_of_ascending_node), tuple(s.argument_pericenter))
+        digest.update(repr(elements).encode())
+    digest.update(repr(float(jd)).encode())
+    digest.update(np.ascontiguousarray(time_steps, dtype=float).tobytes())
+    return digest.hexdigest()
+
+
+class TrackCache:
+    """Кэш рассчитанных трасс: LRU в памяти с ограничением по байтам и необязательный дисковый уровень (.npz)."""
+
+    def __init__(self, max_bytes: int = 256 * 2**20, directory: Optional[str] = None,
+                 compute: Callable = propagate_constellation):
+        self.compute = compute  # Функция расчёта трасс при промахе: compute(satellites, date, time_steps, j2=j2)
+        self.max_bytes = max_bytes  # Максимальный объём массивов в памяти (в байтах)
+        self.directory = directory  # Каталог дискового кэша (None - только память)
+        self.current_bytes = 0  # Текущий объём массивов в памяти
+        self.hits = 0  # Попадания в память
+        self.disk_hits = 0  # Попадания на диске
+        self.misses = 0  # Промахи (трассы пришлось вычислять)
+        self.evictions = 0  # Вытеснения из памяти
+        self._entries = OrderedDict()  # key -> (longitudes, latitudes)
+        self._lock = threading.RLock()  # Кэш используется и главным потоком, и фоновыми расчётами
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.npz")
+
+    def get(self, key: str):
+        """Возвращает (longitudes, latitudes) из памяти или с диска, либо None при промахе."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)  # Отмечаем запись как недавно использованную
+                self.hits += 1
+                return self._entries[key]
+            if self.directory and os.path.exists(self._path(key)):
+                with np.load(self._path(key)) as data:
+                    longitudes, latitudes = data["longitudes"], data["latitudes"]
+                self.disk_hits += 1
+                self._remember(key, longitudes, latitudes)
+                return self._entries.get(key, (longitudes, latitudes))
+            self.misses += 1
+            return None
+
+    def put(self, key: str, longitudes: np.ndarray, latitudes: np.ndarray):
+        """Сохраняет трассы в памяти и, если задан каталог, на диске."""
+        with self._lock:
+            if self.directory and not os.path.exists(self._path(key)):
+                temp_path = self._path(key) + ".tmp.npz"
+                np.savez_compressed(temp_path, longitudes=longitudes, latitudes=latitudes)
+                os.replace(temp_path, self._path(key))  # Атомарная замена, чтобы не оставить битый файл
+            self._remember(key, longitudes, latitudes)
+
+    def _remember(self, key, longitudes, latitudes):
+        longitudes, latitudes = np.array(longitudes), np.array(latitudes)
+        # Кэшированные массивы только для чтения, чтобы случайно не испортить общие данные
+        longitudes.flags.writeable = False
+        latitudes.flags.writeable = False
+        size = longitudes.nbytes + latitudes.nbytes
+        if key in self._entries:
+            old_lons, old_lats = self._entries.pop(key)
+            self.current_bytes -= old_lons.nbytes + old_lats.nbytes
+        if size > self.max_bytes:
+            return  # Запись больше всего кэша в память не помещаем (диск всё равно её хранит)
+        self._entries[key] = (longitudes, latitudes)
+        self.current_bytes += size
+        while self.current_bytes > self.max_bytes:
+            _, (old_lons, old_lats) = self._entries.popitem(last=False)  # Вытесняем самую старую запись
+            self.current_bytes -= old_lons.nbytes + old_lats.nbytes
+            self.evictions += 1
+
+    def get_or_compute(self, satellites: List[SatelliteConfig], date, time_steps, j2: bool = False):
+        """Возвращает трассы системы из кэша или вычисляет их функцией self.compute."""
+        key = track_key(satellites, julian_date(date), time_steps, j2)
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        longitudes, latitudes = self.compute(satellites, date, time_steps, j2=j2)
+        with self._lock:
+            self.put(key, longitudes, latitudes)
+            return self._entries.get(key, (longitudes, latitudes))
+
+    def clear(self):
+        """Очищает кэш в памяти (файлы на диске остаются)."""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self) -> dict:
+        """Счётчики кэша для просмотра и отладки."""
+        return {
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,225 @@
+"""Загрузка каталогов орбитальных элементов (TLE и CCSDS OMM) в ConstellationTable.
+
+Поддерживаются локальные файлы: TLE (двух- и трёхстрочный), OMM в формате XML, KVN и JSON
+(как в выгрузках CelesTrak и Space-Track). Элементы интерпретируются как кеплеровы средние
+элементы на эпоху каждого объекта; модель SGP4 (сопротивление атмосферы, долгопериодические
+возмущения) не используется.
+"""
+import json  # Разбор OMM в формате JSON
+import os  # Определение формата по расширению файла
+import xml.etree.ElementTree as ElementTree  # Разбор OMM в формате XML
+from typing import List, Optional, Sequence
+
+import numpy as np  # Импортируем библиотеку NumPy для работы с массивами
+
+from constants import GM
+from constellation import ConstellationTable
+
+TLE_LINE_LENGTH = 69  # Длина строки TLE вместе с контрольной цифрой
+OMM_FIELDS = ("NORAD_CAT_ID", "EPOCH", "MEAN_MOTION", "ECCENTRICITY", "INCLINATION",
+              "RA_OF_ASC_NODE", "ARG_OF_PERICENTER", "MEAN_ANOMALY")  # Обязательные поля OMM
+
+
+class CatalogError(ValueError):
+    """Файл каталога не удалось разобрать."""
+
+
+def semi_major_axis_from_mean_motion(mean_motion):
+    """Большая полуось (в км) по среднему движению (в оборотах за сутки)."""
+    n = np.asarray(mean_motion, dtype=float) * 2 * np.pi / 86400.0  # Радиан в секунду
+    return np.cbrt(GM / n**2)
+
+
+def julian_date_from_iso(epochs: Sequence[str]) -> np.ndarray:
+    """Юлианские даты (UTC) для массива строк ISO 8601 за один вызов."""
+    moments = np.array([epoch.strip().rstrip("Zz") for epoch in epochs], dtype="datetime64[us]")
+    return (moments - np.datetime64("2000-01-01T12:00:00")) / np.timedelta64(86400, "s") + 2451545.0
+
+
+def julian_date_from_tle_epoch(year, day) -> np.ndarray:
+    """Юлианские даты по двузначному году и дню года с долями (поля эпохи TLE)."""
+    year = np.where(year < 57, 2000 + year, 1900 + year).astype(np.int64)  # Соглашение TLE: 57-99 - XX век
+    previous = year - 1
+    jan_0 = 1721424.5 + 365 * previous + previous // 4 - previous // 100 + previous // 400  # 0 января, 0h
+    return jan_0 + day
+
+
+def catalog_table(names, numbers, epoch, inclination, raan, eccentricity, argument_pericenter,
+                  mean_anomaly, mean_motion) -> ConstellationTable:
+    """Собирает таблицу из столбцов каталога; каждый объект - отдельная «система» со своим именем."""
+    table = ConstellationTable.empty(len(names), names)
+    data = table.data
+    data["semi_major_axis"] = semi_major_axis_from_mean_motion(mean_motion)
+    data["eccentricity"] = eccentricity
+    data["inclination"] = inclination
+    data["longitude_of_ascending_node"] = raan
+    data["argument_pericenter"] = argument_pericenter
+    data["mean_anomaly"] = mean_anomaly
+    data["epoch"] = epoch
+    data["system"] = np.arange(len(names))
+    data["slot"] = -1  # Метка объекта - его имя без номера
+    data["number"] = numbers
+    return table
+
+
+# ------------------ TLE ------------------ #
+def _columns(lines: np.ndarray, start: int, stop: int) -> np.ndarray:
+    # Колонки [start, stop) всех строк как массив байтовых строк фиксированной длины
+    return np.ascontiguousarray(lines[:, start:stop]).view(f"S{stop - start}").ravel()
+
+
+def _as_numbers(column: np.ndarray, dtype, names: Sequence[str], field: str) -> np.ndarray:
+    # Колонка как числа; при ошибке - CatalogError с именем первого объекта с неверным полем
+    try:
+        return column.astype(dtype)
+    except ValueError:
+        for name, value in zip(names, column):
+            try:
+                np.array([value]).astype(dtype)
+            except ValueError:
+                raise CatalogError(f"invalid TLE {field} {value.decode('ascii', 'replace')!r} "
+                                   f"for object {name!r}") from None
+        raise
+
+
+def _catalog_numbers(column: np.ndarray, names: Sequence[str]) -> np.ndarray:
+    """Номера объектов, в том числе в формате Alpha-5 (A0001 = 100001; буквы I и O не используются)."""
+    chars = column.view(np.uint8).reshape(len(column), -1).copy()
+    head = chars[:, 0].astype(np.int64)
+    letter = (head >= ord("A")) & (head <= ord("Z")) & (head != ord("I")) & (head != ord("O"))
+    value = head - ord("A") + 10 - (head > ord("I")) - (head > ord("O"))  # A-H -> 10-17, J-N -> 18-22, P-Z -> 23-33
+    chars[letter, 0] = ord("0")
+    digits = _as_numbers(chars.view(f"S{chars.shape[1]}").ravel(), np.int64, names, "catalog number")
+    return np.where(letter, value * 10000, 0) + digits
+
+
+def _checksums_valid(lines: np.ndarray) -> np.ndarray:
+    digits = (lines[:, :68] >= ord("0")) & (lines[:, :68] <= ord("9"))
+    total = np.where(digits, lines[:, :68] - ord("0"), 0).sum(axis=1) + (lines[:, :68] == ord("-")).sum(axis=1)
+    return total % 10 == lines[:, 68] - ord("0")
+
+
+def _as_bytes(lines: List[str]) -> np.ndarray:
+    # Строки одинаковой длины как матрица байтов (n_lines, TLE_LINE_LENGTH)
+    text = "".join(line[:TLE_LINE_LENGTH].ljust(TLE_LINE_LENGTH) for line in lines)
+    return np.frombuffer(text.encode("ascii", "replace"), dtype=np.uint8).reshape(len(lines), TLE_LINE_LENGTH)
+
+
+def parse_tle(text: str, verify_checksum: bool = True) -> ConstellationTable:
+    """Разбирает двух- и трёхстрочные TLE; поля всех объектов извлекаются срезами по колонкам."""
+    names, first, second = [], [], []
+    pending_name = None
+    lines = [line.rstrip() for line in text.splitlines() if line.strip()]
+    k = 0
+    while k < len(lines):
+        line = lines[k]
+        if line.startswith("1 ") and k + 1 < len(lines) and lines[k + 1].startswith("2 "):
+            first.append(line)
+            second.append(lines[k + 1])
+            names.append(pending_name or line[2:7].strip())
+            pending_name = None
+            k += 2
+            continue
+        if line.startswith(("1 ", "2 ")):
+            raise CatalogError(f"unpaired TLE line {k + 1}: {line!r}")
+        pending_name = line[2:].strip() if line.startswith("0 ") else line.strip()  # Строка имени (3LE)
+        k += 1
+    if not first:
+        return ConstellationTable.empty()
+
+    line1, line2 = _as_bytes(first), _as_bytes(second)
+    if verify_checksum:
+        valid = _checksums_valid(line1) & _checksums_valid(line2)
+        if not valid.all():
+            bad = np.flatnonzero(~valid)
+            raise CatalogError(f"TLE checksum mismatch for {len(bad)} objects, first: {names[bad[0]]!r}")
+
+    number = lambda lines_, a, b, field, dtype=float: _as_numbers(_columns(lines_, a, b), dtype, names, field)
+    epoch = julian_date_from_tle_epoch(number(line1, 18, 20, "epoch year", int), number(line1, 20, 32, "epoch day"))
+    eccentricity = _as_numbers(np.char.add(b"0.", _columns(line2, 26, 33)), float, names,
+                               "eccentricity")  # Десятичная точка подразумевается
+    return catalog_table(
+        names, _catalog_numbers(_columns(line1, 2, 7), names), epoch,
+        inclination=number(line2, 8, 16, "inclination"), raan=number(line2, 17, 25, "RAAN"),
+        eccentricity=eccentricity, argument_pericenter=number(line2, 34, 42, "argument of perigee"),
+        mean_anomaly=number(line2, 43, 51, "mean anomaly"), mean_motion=number(line2, 52, 63, "mean motion")
+    )
+
+
+# ------------------ OMM ------------------ #
+def _omm_table(records: List[dict]) -> ConstellationTable:
+    missing = [field for field in OMM_FIELDS if records and field not in records[0]]
+    if missing:
+        raise CatalogError(f"OMM records lack required fields: {', '.join(missing)}")
+    column = lambda field: np.array([record[field] for record in records], dtype=float)
+    try:
+        return catalog_table(
+            [str(record.get("OBJECT_NAME") or record["NORAD_CAT_ID"]).strip() for record in records],
+            column("NORAD_CAT_ID").astype(np.int32),
+            julian_date_from_iso([record["EPOCH"] for record in records]),
+            inclination=column("INCLINATION"), raan=column("RA_OF_ASC_NODE"), eccentricity=column("ECCENTRICITY"),
+            argument_pericenter=column("ARG_OF_PERICENTER"), mean_anomaly=column("MEAN_ANOMALY"),
+            mean_motion=column("MEAN_MOTION")
+        )
+    except (KeyError, ValueError) as error:
+        raise CatalogError(f"invalid OMM record: {error}") from error
+
+
+def parse_omm_json(text: str) -> ConstellationTable:
+    data = json.loads(text)
+    return _omm_table(data if isinstance(data, list) else [data])
+
+
+def parse_omm_xml(text: str) -> ConstellationTable:
+    """OMM XML (один <omm> или <ndm> со многими); пространства имён игнорируются."""
+    root = ElementTree.fromstring(text)
+    records = []
+    for element in root.iter():
+        if element.tag.rsplit("}", 1)[-1] == "omm":
+            records.append({child.tag.rsplit("}", 1)[-1]: (child.text or "").strip()
+                            for child in element.iter() if len(child) == 0})
+    return _omm_table(records)
+
+
+def parse_omm_kvn(text: str) -> ConstellationTable:
+    """OMM KVN: строки "KEY = value", новое сообщение начинается с CCSDS_OMM_VERS."""
+    records, record = [], {}
+    for line in text.splitlines():
+        key, separator, value = line.partition("=")
+        if not separator:
+            continue
+        key = key.strip()
+        if key == "CCSDS_OMM_VERS" and record:
+            records.append(record)
+            record = {}
+        record[key] = value.split("[")[0].strip()  # Единицы измерения в квадратных скобках отбрасываются
+    if record:
+        records.append(record)
+    return _omm_table(records)
+
+
+PARSERS = {"tle": parse_tle, "omm-json": parse_omm_json, "omm-xml": parse_omm_xml, "omm-kvn": parse_omm_kvn}
+EXTENSIONS = {".tle": "tle", ".3le": "tle", ".txt": "tle", ".json": "omm-json", ".xml": "omm-xml",
+              ".kvn": "omm-kvn", ".omm": "omm-kvn"}
+
+
+def detect_format(path: str, text: str) -> str:
+    extension = os.path.splitext(path)[1].lower()
+    if extension in EXTENSIONS and extension not in (".txt", ".omm"):
+        return EXTENSIONS[extension]
+    head = text.lstrip()[:1]
+    if head == "<":
+        return "omm-xml"
+    if head in ("[", "{"):
+        return "omm-json"
+    return "omm-kvn" if "CCSDS_OMM_VERS" in text[:4096] else "tle"
+
+
+def load_catalog(path: str, format: Optional[str] = None) -> ConstellationTable:
+    """Читает локальный файл каталога (формат по расширению или содержимому) в ConstellationTable."""
+    with open(path, encoding="utf-8", errors="replace") as file:
+        text = file.read()
+    format = format or detect_format(path, text)
+    if format not in PARSERS:
+        raise CatalogError(f"unknown catalog format {format!r}; available: {', '.join(PARSERS)}")
+    return PARSERS[format](text)
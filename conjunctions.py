@@ -0,0 +1,212 @@
+from typing import List, Optional, Sequence
+
+import numpy as np  # Импортируем библиотеку NumPy для работы с массивами
+
+from constants import GM
+from passes import _golden_max
+from utilities import calculate_coordinates, epoch_offsets
+
+SCREEN_STEPS_PER_PERIOD = 180  # Окон грубой сетки на виток самого быстрого спутника
+CHUNK_ELEMENTS = 1_000_000  # Наибольшее число отсчётов (спутник x момент) в одном блоке грубой сетки
+MAX_CELLS = 2**16  # Наибольшее число ячеек хеш-сетки по одной оси (ключ ячейки и окна умещается в int64)
+CURVATURE_SAFETY = 1.05  # Запас к оценке ускорения (вековые возмущения J2 немного меняют движение)
+RELATIVE_SPEED_DT = 0.5  # Полушаг центральной разности для относительной скорости (в секундах)
+
+# Одна строка на сближение; время - секунды от начала интервала
+CONJUNCTION_DTYPE = np.dtype([
+    ("first", np.int32),  # Номер первого спутника (строка элементов, first < second)
+    ("second", np.int32),  # Номер второго спутника
+    ("tca", np.float64),  # Момент наибольшего сближения
+    ("distance", np.float64),  # Расстояние в момент наибольшего сближения (в км)
+    ("relative_speed", np.float64),  # Относительная скорость в момент наибольшего сближения (км/с)
+])
+
+# Соседние столбцы ячеек "вперёд" (dx, dy): ячейки столбца с z - 1, z, z + 1 идут в ключе подряд,
+# поэтому каждый столбец - один участок отсортированных ключей; столбец (0, 0) просматривается отдельно
+NEIGHBOURS = [(0, 1), (1, -1), (1, 0), (1, 1)]
+
+
+def eci_positions(elements: dict, jd: float, time_steps, j2: bool = False) -> np.ndarray:
+    """Координаты ECI (в км) в виде массива (3, ...); элементы и time_steps совместимы по форме, как в ecef_positions.
+
+    Расстояние между спутниками не зависит от системы координат, поэтому поворот Земли не нужен.
+    """
+    t = np.asarray(time_steps, dtype=float)
+    column = lambda key: np.asarray(elements[key], dtype=float)
+    delta_t = t if "epoch" not in elements else t + epoch_offsets(elements["epoch"], jd)
+    x, y, z = calculate_coordinates(
+        column("semi_major_axis"), column("eccentricity"), column("longitude_of_ascending_node"),
+        column("argument_pericenter"), column("inclination"), column("mean_anomaly"), delta_t, j2)
+    return np.stack(np.broadcast_arrays(x, y, z))
+
+
+def _curvature_margins(elements: dict, step: float) -> np.ndarray:
+    # Наибольшее отклонение спутника от хорды окна за шаг step: a·h²/8, a - ускорение в перицентре
+    a = np.asarray(elements["semi_major_axis"], dtype=float)
+    perigee = a * (1 - np.asarray(elements["eccentricity"], dtype=float))
+    return CURVATURE_SAFETY * GM / perigee**2 * step**2 / 8
+
+
+def _segment_distance(start: np.ndarray, end: np.ndarray) -> np.ndarray:
+    # Наименьшая длина вектора start + s·(end - start), s в [0, 1] (по первой оси - координаты)
+    delta = end - start
+    length2 = np.einsum("ij,ij->j", delta, delta)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        s = np.clip(np.where(length2 > 0, -np.einsum("ij,ij->j", start, delta) / length2, 0.0), 0.0, 1.0)
+    closest = start + s * delta
+    return np.sqrt(np.einsum("ij,ij->j", closest, closest))
+
+
+def _ranges(starts: np.ndarray, stops: np.ndarray):
+    # Для каждого i - все позиции из [starts[i], stops[i]): (номера i, позиции) без цикла
+    lengths = np.maximum(stops - starts, 0)
+    total = int(lengths.sum())
+    owner = np.repeat(np.arange(starts.size), lengths)
+    return owner, np.repeat(starts - (np.cumsum(lengths) - lengths), lengths) + np.arange(total)
+
+
+def _hash_candidates(middle: np.ndarray, radius: np.ndarray, n_windows: int, threshold: float):
+    """Пары точек (окно, спутник), шары которых (середина хорды, radius) подходят ближе threshold.
+
+    middle - середины хорд, массив (3, n_windows * n_sats). Размер ячейки не меньше наибольшего
+    расстояния между серединами пары-кандидата, поэтому достаточно просмотреть соседние ячейки.
+    Ключ ячейки включает номер окна: одна сортировка обслуживает все окна блока, точки одной
+    ячейки идут подряд, а соседний столбец ячеек находится двоичным поиском сдвинутого ключа.
+    Возвращает пары номеров точек (первые, вторые) в том же порядке, что и middle.
+    """
+    n_points = middle.shape[1]
+    extent = float(np.abs(middle).max(initial=0.0))
+    cell = max(threshold + 2 * float(radius.max(initial=0.0)), 2 * extent / (MAX_CELLS - 3))
+    n = int(2 * extent / cell) + 3  # Ячеек по оси, с запасом в одну ячейку с каждой стороны
+    index = ((middle + extent) // cell).astype(np.int64) + 1
+    window = np.repeat(np.arange(n_windows, dtype=np.int64), n_points // max(n_windows, 1))
+    key = ((window * n + index[0]) * n + index[1]) * n + index[2]
+    order = np.argsort(key, kind="stable")
+    key, middle, radius = key[order], middle[:, order], radius[order]
+
+    # Та же ячейка (точки после себя) и ячейка z + 1 того же столбца, затем соседние столбцы целиком
+    found = [_ranges(np.arange(key.size) + 1, np.searchsorted(key, key + 1, side="right"))]
+    for dx, dy in NEIGHBOURS:
+        target = key + (dx * n + dy) * n
+        found.append(_ranges(np.searchsorted(key, target - 1, side="left"),
+                             np.searchsorted(key, target + 1, side="right")))
+    first, second = (np.concatenate(column) for column in zip(*found))
+
+    # Ячейки - кубы, а нужны шары: пары, середины которых дальше суммы радиусов и threshold, отбрасываются
+    gap = np.sqrt(sum((middle[k, first] - middle[k, second])**2 for k in range(3)))
+    keep = gap <= threshold + radius[first] + radius[second]
+    return order[first[keep]], order[second[keep]]
+
+
+def _filter(start, end, first, second, limit):
+    # Оставляет пары, у которых отрезки относительного движения за окно подходят ближе limit
+    relative_start = np.stack([start[k, first] - start[k, second] for k in range(3)])
+    relative_end = np.stack([end[k, first] - end[k, second] for k in range(3)])
+    keep = _segment_distance(relative_start, relative_end) <= limit
+    return first[keep], second[keep]
+
+
+def _candidate_windows(elements, jd, t, threshold, j2, brute_force=False):
+    # Окна грубой сетки, в которых пара может сблизиться меньше чем на threshold: (окна, спутники, спутники)
+    n_sats = len(elements["semi_major_axis"])
+    margins = _curvature_margins(elements, t[1] - t[0])
+    rows = {key: np.asarray(value)[:, np.newaxis] for key, value in elements.items()}
+    chunk = min(max(2, CHUNK_ELEMENTS // max(n_sats, 1)), 2**14)
+    if brute_force:
+        chunk = max(2, min(chunk, CHUNK_ELEMENTS // max(n_sats * (n_sats - 1) // 2, 1)))  # Пары x окна в блоке
+    found = []
+    for first_step in range(0, t.size - 1, chunk - 1):
+        block = t[first_step:first_step + chunk]
+        positions = eci_positions(rows, jd, block, j2).transpose(0, 2, 1)  # (3, n_steps, n_sats)
+        n_windows = block.size - 1
+        start = np.ascontiguousarray(positions[:, :-1]).reshape(3, -1)  # Точки (окно, спутник) подряд
+        end = np.ascontiguousarray(positions[:, 1:]).reshape(3, -1)
+        satellite_margins = np.tile(margins, n_windows)
+        if brute_force:
+            # Все пары во всех окнах - для сравнения в benchmarks.bench_conjunctions
+            i, j = np.triu_indices(n_sats, 1)
+            offset = np.repeat(np.arange(n_windows) * n_sats, i.size)
+            first, second = offset + np.tile(i, n_windows), offset + np.tile(j, n_windows)
+        else:
+            # Точка отрезка удалена от середины хорды не больше чем на полхорды и запас на кривизну
+            radius = np.sqrt(((end - start)**2).sum(axis=0)) / 2 + satellite_margins
+            first, second = _hash_candidates((start + end) / 2, radius, n_windows, threshold)
+        first, second = _filter(start, end, first, second,
+                                threshold + satellite_margins[first] + satellite_margins[second])
+        i, j = first % n_sats, second % n_sats
+        found.append((first // n_sats + first_step, np.minimum(i, j), np.maximum(i, j)))
+    return (np.concatenate(column) for column in zip(*found))
+
+
+def _refine(elements, jd, t, window, first, second, tolerance, j2):
+    # Момент наибольшего сближения в каждом окне-кандидате золотым сечением, все пары сразу
+    rows = lambda index: {key: np.asarray(value)[index] for key, value in elements.items()}
+    a, b = rows(first), rows(second)
+    separation = lambda time: eci_positions(a, jd, time, j2) - eci_positions(b, jd, time, j2)
+
+    def closeness(time):
+        d = separation(time)
+        return -np.einsum("ij,ij->j", d, d)
+
+    tca, value = _golden_max(closeness, t[window], t[window + 1], tolerance)
+    velocity = (separation(tca + RELATIVE_SPEED_DT) - separation(tca - RELATIVE_SPEED_DT)) / (2 * RELATIVE_SPEED_DT)
+    return tca, np.sqrt(np.maximum(-value, 0.0)), np.sqrt(np.einsum("ij,ij->j", velocity, velocity))
+
+
+def screen_conjunctions(
+    elements: dict,  # Орбитальные элементы по слотам (как возвращает satellite_slots или ConstellationTable.elements)
+    jd: float,  # Начальная дата (юлианская дата)
+    span: float,  # Длительность интервала (в секундах)
+    threshold: float = 10.0,  # Расстояние, ближе которого сближение попадает в результат (в км)
+    step: Optional[float] = None,  # Длительность окна грубой сетки (по умолчанию 1/180 витка самого быстрого спутника)
+    tolerance: float = 0.01,  # Точность момента наибольшего сближения (в секундах)
+    j2: bool = False,  # True - вековые возмущения J2
+    brute_force: bool = False  # True - проверять все пары без хеш-сетки (для сравнения)
+) -> np.ndarray:
+    """Сближения спутников ближе threshold за интервал.
+
+    Интервал делится на окна грубой сетки. За окно спутник отходит от хорды между положениями
+    в начале и конце окна не дальше a·h²/8, поэтому пара, отрезки относительного движения
+    которой расходятся дальше threshold с этим запасом, сблизиться в окне не может. Пары-кандидаты
+    ищутся по хеш-сетке середин хорд (см. _hash_candidates), а не перебором всех O(N²) пар;
+    момент наибольшего сближения уточняется золотым сечением внутри окна. Возвращает
+    структурированный массив CONJUNCTION_DTYPE, упорядоченный по моменту сближения.
+    """
+    elements = {key: np.asarray(value, dtype=float) for key, value in elements.items()}
+    n_sats = len(elements["semi_major_axis"])
+    if step is None:
+        shortest_period = 2 * np.pi * np.sqrt(np.min(elements["semi_major_axis"], initial=np.inf)**3 / GM)
+        step = shortest_period / SCREEN_STEPS_PER_PERIOD
+    t = np.linspace(0.0, span, int(np.ceil(span / step)) + 1)
+    if n_sats < 2 or t.size < 2:
+        return np.zeros(0, dtype=CONJUNCTION_DTYPE)
+
+    window, first, second = _candidate_windows(elements, jd, t, threshold, j2, brute_force)
+    order = np.lexsort((window, second, first))
+    window, first, second = window[order], first[order], second[order]
+    tca, distance, speed = _refine(elements, jd, t, window, first, second, tolerance, j2)
+
+    # Минимум на границе двух окон-кандидатов одной пары находят оба окна: оставляем одно. Минимум
+    # на краю окна, если соседнее окно тоже кандидат, - не минимум (расстояние убывает дальше)
+    same_pair = (first[1:] == first[:-1]) & (second[1:] == second[:-1]) & (window[1:] == window[:-1] + 1)
+    has_previous = np.concatenate([[False], same_pair])
+    has_next = np.concatenate([same_pair, [False]])
+    at_start = tca - t[window] <= 2 * tolerance
+    at_end = t[window + 1] - tca <= 2 * tolerance
+    next_at_start = np.concatenate([at_start[1:], [False]])
+    keep = ~(at_start & has_previous) & ~(at_end & has_next & ~next_at_start) & (distance <= threshold)
+
+    conjunctions = np.zeros(int(keep.sum()), dtype=CONJUNCTION_DTYPE)
+    conjunctions["first"], conjunctions["second"] = first[keep], second[keep]
+    conjunctions["tca"], conjunctions["distance"], conjunctions["relative_speed"] = tca[keep], distance[keep], speed[keep]
+    return conjunctions[np.argsort(conjunctions["tca"], kind="stable")]
+
+
+def conjunction_rows(conjunctions: np.ndarray, satellite_labels: Sequence[str], epoch) -> List[tuple]:
+    """Строки таблицы сближений: (спутник, спутник, момент, расстояние, относительная скорость).
+
+    Момент - объект datetime (epoch - datetime начала интервала).
+    """
+    from datetime import timedelta
+    return [(satellite_labels[c["first"]], satellite_labels[c["second"]], epoch + timedelta(seconds=float(c["tca"])),
+             float(c["distance"]), float(c["relative_speed"])) for c in conjunctions]
@@ -1,9 +1,12 @@
-import numpy as np
+import math
 from typing import List
 
 GM = 398600.4418  # Earth's gravitational parameter [km^3/s^2]
 W = 7.292115e-5 # Earth's rotation rate [rad/s]
 R = 6378 # Earth's radius [km]
+WGS84_A = 6378.137 # WGS-84 equatorial radius [km]
+WGS84_F = 1 / 298.257223563 # WGS-84 flattening
+J2 = 1.08262668e-3 # Earth's second zonal harmonic (EGM-96), referred to WGS84_A
 TIME_STEPS = [0.01, 0.001, 0.0001]
 
 class SatelliteConfig:
@@ -25,7 +28,7 @@ class SatelliteConfig:
         self.semi_major_axis = semi_major_axis
         self.eccentricity = eccentricity
         # Вычисляем период орбиты спутника и среднюю аномалию
-        self.T = 2 * np.pi * np.sqrt(semi_major_axis**3/GM)
+        self.T = 2 * math.pi * math.sqrt(semi_major_axis**3/GM)
         self.mean_anomaly = 360 / self.T
         
     # Для представления в виде строки (в UI)
@@ -0,0 +1,167 @@
+from typing import List, Optional, Sequence
+
+import numpy as np  # Импортируем библиотеку NumPy для работы с массивами
+
+from constants import GM, SatelliteConfig
+from parallel import propagate_elements_parallel
+from sidereal import julian_date
+
+# Одна строка на спутник; поля элементов названы так же, как ключи satellite_slots
+SLOT_DTYPE = np.dtype([
+    ("semi_major_axis", np.float64),  # Большая полуось (в км)
+    ("eccentricity", np.float64),  # Эксцентриситет
+    ("inclination", np.float64),  # Наклонение (в градусах)
+    ("longitude_of_ascending_node", np.float64),  # Долгота восходящего узла (в градусах)
+    ("argument_pericenter", np.float64),  # Аргумент перицентра (в градусах)
+    ("mean_anomaly", np.float64),  # Средняя аномалия в эпоху элементов (в градусах)
+    ("epoch", np.float64),  # Эпоха элементов (юлианская дата); NaN - совпадает с началом расчёта
+    ("system", np.int32),  # Номер системы (индекс в names)
+    ("plane", np.int32),  # Номер плоскости внутри системы
+    ("slot", np.int32),  # Номер спутника внутри системы (для метки); -1 - метка без номера
+    ("number", np.int32),  # Номер в каталоге (NORAD), 0 - нет
+])
+
+ELEMENT_FIELDS = SLOT_DTYPE.names[:7]  # Поля, необходимые для расчёта трасс
+
+
+def _rows(size: int) -> np.ndarray:
+    data = np.zeros(size, dtype=SLOT_DTYPE)
+    data["epoch"] = np.nan  # Элементы заданы на момент начала расчёта
+    return data
+
+
+class ConstellationTable:
+    """Спутниковая группировка как структурированный массив: одна строка на спутник, без объектов Python на спутник.
+
+    Поля доступны как атрибуты (table.inclination, table.plane), срезы и маски возвращают новую таблицу.
+    Порядок строк для систем из SatelliteConfig совпадает с satellite_slots: Ω внешний, ω внутренний.
+    """
+
+    __slots__ = ("data", "names")
+
+    def __init__(self, data: np.ndarray, names: Sequence[str]):
+        self.data = data  # Структурированный массив с dtype SLOT_DTYPE
+        self.names = list(names)  # Имена систем (метки спутников: "<имя> <slot + 1>")
+
+    @classmethod
+    def empty(cls, size: int = 0, names: Sequence[str] = ()):
+        return cls(_rows(size), names)
+
+    @classmethod
+    def from_configs(cls, satellites: List[SatelliteConfig]):
+        """Разворачивает конфигурации в отдельные спутники без вложенных циклов по слотам."""
+        parts = []
+        for index, s in enumerate(satellites):
+            Omega = np.asarray(s.longitude_of_ascending_node, dtype=float)
+            omega = np.asarray(s.argument_pericenter, dtype=float)
+            part = _rows(Omega.size * omega.size)
+            part["semi_major_axis"] = s.semi_major_axis
+            part["eccentricity"] = s.eccentricity
+            part["inclination"] = s.inclination
+            part["longitude_of_ascending_node"] = np.repeat(Omega, omega.size)
+            part["argument_pericenter"] = np.tile(omega, Omega.size)
+            part["mean_anomaly"] = s.mean_anomaly
+            part["system"] = index
+            part["plane"] = np.repeat(np.arange(Omega.size), omega.size)
+            part["slot"] = np.arange(part.size)
+            parts.append(part)
+        data = np.concatenate(parts) if parts else _rows(0)
+        return cls(data, [s.satellite_name for s in satellites])
+
+    @classmethod
+    def walker(
+        cls,
+        name: str,  # Имя системы
+        total: int,  # Общее число спутников t
+        planes: int,  # Число плоскостей p (t должно делиться на p)
+        phasing: int,  # Фазовый параметр f (0 <= f < p)
+        inclination: float,  # Наклонение (в градусах)
+        semi_major_axis: float,  # Большая полуось (в км)
+        eccentricity: float = 0.0,  # Эксцентриситет
+        pattern: str = "delta",  # "delta" - узлы на 360°, "star" - узлы на 180°
+        raan_offset: float = 0.0  # Долгота восходящего узла первой плоскости (в градусах)
+    ):
+        """Группировка Уокера i: t/p/f; сдвиг фаз между соседними плоскостями равен f*360/t."""
+        if total % planes:
+            raise ValueError(f"total ({total}) must be a multiple of planes ({planes})")
+        if pattern not in ("delta", "star"):
+            raise ValueError(f"unknown Walker pattern {pattern!r}")
+        if isinstance(phasing, bool) or not isinstance(phasing, (int, np.integer)) or not 0 <= phasing < planes:
+            raise ValueError(f"phasing ({phasing!r}) must be an integer in 0 <= f < planes ({planes})")
+        per_plane = total // planes
+        plane = np.repeat(np.arange(planes), per_plane)
+        position = np.tile(np.arange(per_plane), planes)
+        spread = 360.0 if pattern == "delta" else 180.0
+
+        data = _rows(total)
+        data["semi_major_axis"] = semi_major_axis
+        data["eccentricity"] = eccentricity
+        data["inclination"] = inclination
+        data["longitude_of_ascending_node"] = np.mod(raan_offset + plane * spread / planes, 360.0)
+        data["mean_anomaly"] = np.mod(position * 360.0 / per_plane + plane * phasing * 360.0 / total, 360.0)
+        data["plane"] = plane
+        data["slot"] = np.arange(total)
+        return cls(data, [name])
+
+    @classmethod
+    def concatenate(cls, tables: Sequence["ConstellationTable"]):
+        """Объединяет таблицы; номера систем сдвигаются, чтобы имена не смешивались."""
+        names, parts = [], []
+        for table in tables:
+            part = table.data.copy()
+            part["system"] += len(names)
+            names.extend(table.names)
+            parts.append(part)
+        data = np.concatenate(parts) if parts else _rows(0)
+        return cls(data, names)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, key):
+        # Целый индекс тоже даёт таблицу (из одной строки), чтобы результат всегда можно было рассчитать
+        data = self.data[key]
+        return ConstellationTable(np.atleast_1d(data), self.names)
+
+    def __getattr__(self, name):
+        if name in SLOT_DTYPE.names:
+            return self.data[name]
+        raise AttributeError(name)
+
+    def __repr__(self) -> str:
+        return f"ConstellationTable({len(self)} satellites, systems={self.names})"
+
+    @property
+    def labels(self) -> List[str]:
+        """Метки спутников в формате окна приложения: "<имя системы> <номер>" (для объектов каталога - имя)."""
+        return [self.names[system] if slot < 0 else f"{self.names[system]} {slot + 1}"
+                for system, slot in zip(self.data["system"].tolist(), self.data["slot"].tolist())]
+
+    @property
+    def periods(self) -> np.ndarray:
+        """Орбитальные периоды (в секундах)."""
+        return 2 * np.pi * np.sqrt(self.data["semi_major_axis"]**3 / GM)
+
+    def elements(self) -> dict:
+        """Словарь столбцов в формате satellite_slots для propagate_elements (без копирования)."""
+        return {key: self.data[key] for key in ELEMENT_FIELDS}
+
+    def plane_groups(self):
+        """Список ((система, плоскость), индексы строк) в порядке первого появления плоскости."""
+        keys = self.data["system"].astype(np.int64) << 32 | self.data["plane"].astype(np.int64)
+        unique, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        order = np.argsort(first)
+        members = np.argsort(inverse, kind="stable")
+        bounds = np.cumsum(np.bincount(inverse, minlength=unique.size))[:-1]
+        groups = np.split(members, bounds)
+        return [((int(unique[k] >> 32), int(unique[k] & 0xFFFFFFFF)), groups[k]) for k in order]
+
+    def propagate(self, date, time_steps, geodetic: bool = False, workers: Optional[int] = 1, j2: bool = False):
+        """Долготы и широты всех спутников таблицы, массивы формы (n_sats, n_steps) в градусах.
+
+        Слоты с общей формой орбиты рассчитываются по опорной орбите (см. symmetry); workers != 1 -
+        расчёт в пуле процессов, которые делят между собой группы симметрии (см. parallel), None - по
+        числу процессоров; j2=True - с вековыми возмущениями J2.
+        """
+        return propagate_elements_parallel(self.elements(), julian_date(date), time_steps, workers=workers,
+                                           j2=j2, geodetic=geodetic)
@@ -0,0 +1,151 @@
+from typing import Optional
+
+import numpy as np  # Импортируем библиотеку NumPy для работы с массивами
+
+from transforms import geodetic_to_ecef
+from utilities import ecef_positions
+
+CHUNK_ELEMENTS = 4_000_000  # Наибольшее число проверок (точка x спутник x момент) в одном блоке
+EPOCH_BLOCK = 16  # Моментов времени в одном блоке положений спутников
+FIELDS = ("minimum", "mean", "maximum", "coverage")  # Поля CoverageMap, которые можно отобразить
+
+
+class CoverageMap:
+    """Статистика числа видимых спутников в узлах сетки широта/долгота за набор моментов времени.
+
+    minimum, mean, maximum - число спутников над маской (массивы (n_lat, n_lon)), coverage - доля
+    моментов (в процентах), когда видно не меньше min_satellites спутников.
+    """
+
+    __slots__ = ("longitudes", "latitudes", "minimum", "mean", "maximum", "coverage",
+                 "elevation_mask", "min_satellites", "epochs")
+
+    def __init__(self, longitudes, latitudes, minimum, mean, maximum, coverage, elevation_mask, min_satellites, epochs):
+        self.longitudes = longitudes  # Долготы узлов (в градусах)
+        self.latitudes = latitudes  # Широты узлов (в градусах)
+        self.minimum = minimum
+        self.mean = mean
+        self.maximum = maximum
+        self.coverage = coverage
+        self.elevation_mask = elevation_mask  # Маска угла места (в градусах)
+        self.min_satellites = min_satellites  # Сколько спутников нужно одновременно (4 - навигационное решение)
+        self.epochs = epochs  # Число моментов времени
+
+    def global_mean(self, field: str = "coverage") -> float:
+        """Среднее поля по поверхности Земли (узлы взвешены по площади, cos широты)."""
+        weights = np.broadcast_to(np.cos(np.radians(self.latitudes))[:, np.newaxis], self.mean.shape)
+        return float(np.average(getattr(self, field), weights=weights))
+
+    def save(self, path: str):
+        np.savez_compressed(path, longitudes=self.longitudes, latitudes=self.latitudes, minimum=self.minimum,
+                            mean=self.mean, maximum=self.maximum, coverage=self.coverage,
+                            elevation_mask=self.elevation_mask, min_satellites=self.min_satellites, epochs=self.epochs)
+
+    @classmethod
+    def load(cls, path: str):
+        with np.load(path) as data:
+            return cls(**{name: data[name][()] if data[name].ndim == 0 else data[name] for name in cls.__slots__})
+
+
+def grid_axes(resolution: float):
+    """Центры ячеек сетки с шагом resolution (в градусах): долготы и широты."""
+    longitudes = np.arange(-180.0 + resolution / 2, 180.0, resolution)
+    latitudes = np.arange(-90.0 + resolution / 2, 90.0, resolution)
+    return longitudes, latitudes
+
+
+def satellites_in_view(points, up, satellites, elevation_mask: float, dtype=np.float64) -> np.ndarray:
+    """Число спутников над маской для каждой точки и момента: массив (n_points, n_epochs).
+
+    points и up - положения точек в ECEF и единичные вертикали (n_points, 3), satellites - положения
+    спутников (n_sats, n_epochs, 3). Проверка угла места сводится к двум матричным произведениям:
+    (r - p)·u = r·u - p·u и |r - p|² = |r|² - 2 r·p + |p|², промежуточные массивы обновляются на месте.
+    """
+    n_sats, n_epochs, _ = satellites.shape
+    r = np.asarray(satellites, dtype=dtype).reshape(-1, 3).T  # (3, n_sats * n_epochs)
+    points, up = np.asarray(points, dtype=dtype), np.asarray(up, dtype=dtype)
+    height = up @ r  # Проекция направления на спутник на вертикаль
+    height -= np.einsum("pk,pk->p", points, up)[:, np.newaxis]
+    threshold = points @ r  # sin²(маски) * |r - p|²
+    threshold *= -2
+    threshold += (r * r).sum(axis=0)
+    threshold += (points * points).sum(axis=1)[:, np.newaxis]
+    threshold *= np.sin(np.radians(elevation_mask))**2
+    above = height > 0
+    np.square(height, out=height)
+    if elevation_mask >= 0:
+        visible = above & (height >= threshold)
+    else:
+        visible = above | (height <= threshold)
+    return visible.reshape(len(points), n_sats, n_epochs).sum(axis=1, dtype=np.int32)
+
+
+def coverage_grid(
+    elements: dict,  # Орбитальные элементы по слотам (как возвращает satellite_slots или ConstellationTable.elements)
+    jd: float,  # Начальная дата (юлианская дата)
+    time_steps: np.ndarray,  # Моменты времени от начальной даты (в секундах)
+    resolution: float = 2.0,  # Шаг сетки (в градусах)
+    elevation_mask: float = 10.0,  # Маска угла места (в градусах)
+    min_satellites: int = 1,  # Сколько спутников должно быть видно, чтобы точка считалась покрытой
+    j2: bool = False,  # True - вековые возмущения J2
+    altitude: float = 0.0,  # Высота точек сетки над эллипсоидом WGS-84 (в км)
+    dtype=np.float64  # Тип проверок видимости: np.float64 или np.float32 (быстрее, точности хватает)
+) -> CoverageMap:
+    """Число видимых спутников в узлах сетки за все моменты time_steps.
+
+    Положения спутников рассчитываются блоками по EPOCH_BLOCK моментов, точки сетки
+    обрабатываются блоками, чтобы массив проверок не превышал CHUNK_ELEMENTS. Накапливаются
+    только минимум, сумма, максимум и число покрытых моментов, поэтому память не зависит от
+    длины интервала.
+    """
+    longitudes, latitudes = grid_axes(resolution)
+    lon, lat = np.meshgrid(longitudes, latitudes)
+    points = np.stack(geodetic_to_ecef(lon.ravel(), lat.ravel(), altitude), axis=-1)
+    lon_r, lat_r = np.radians(lon.ravel()), np.radians(lat.ravel())
+    up = np.stack([np.cos(lat_r) * np.cos(lon_r), np.cos(lat_r) * np.sin(lon_r), np.sin(lat_r)], axis=-1)
+
+    n_points = len(points)
+    n_sats = len(elements["semi_major_axis"])
+    minimum = np.full(n_points, np.iinfo(np.int32).max, dtype=np.int32)
+    maximum = np.zeros(n_points, dtype=np.int32)
+    total = np.zeros(n_points, dtype=np.int64)
+    covered = np.zeros(n_points, dtype=np.int64)
+    rows = {key: np.asarray(value, dtype=float)[:, np.newaxis] for key, value in elements.items()}
+
+    t = np.asarray(time_steps, dtype=float)
+    point_block = max(1, CHUNK_ELEMENTS // max(1, n_sats * min(EPOCH_BLOCK, t.size)))
+    for first in range(0, t.size, EPOCH_BLOCK):
+        satellites = np.stack(ecef_positions(rows, jd, t[first:first + EPOCH_BLOCK], j2), axis=-1)
+        for start in range(0, n_points, point_block):
+            block = slice(start, start + point_block)
+            count = satellites_in_view(points[block], up[block], satellites, elevation_mask, dtype)
+            np.minimum(minimum[block], count.min(axis=1), out=minimum[block])
+            np.maximum(maximum[block], count.max(axis=1), out=maximum[block])
+            total[block] += count.sum(axis=1)
+            covered[block] += (count >= min_satellites).sum(axis=1)
+
+    shape = lat.shape
+    epochs = max(t.size, 1)
+    return CoverageMap(longitudes, latitudes, minimum.reshape(shape), (total / epochs).reshape(shape),
+                       maximum.reshape(shape), (100.0 * covered / epochs).reshape(shape),
+                       elevation_mask, min_satellites, t.size)
+
+
+def draw_coverage(ax, coverage: CoverageMap, field: str = "mean", alpha: float = 0.6, cmap: Optional[str] = None):
+    """Рисует поле покрытия полупрозрачной тепловой картой поверх фона с картой; возвращает объект изображения."""
+    from background import MAP_EXTENT
+    if field not in FIELDS:
+        raise ValueError(f"unknown coverage field {field!r}; available: {', '.join(FIELDS)}")
+    values = getattr(coverage, field)
+    if field == "coverage":
+        return ax.imshow(values, extent=MAP_EXTENT, origin="lower", alpha=alpha, cmap=cmap or "RdYlGn",
+                         vmin=0, vmax=100, interpolation="nearest", zorder=2)
+    top = int(np.max(coverage.maximum, initial=1))
+    if field == "mean":
+        return ax.imshow(values, extent=MAP_EXTENT, origin="lower", alpha=alpha, cmap=cmap or "viridis",
+                         vmin=0, vmax=top, interpolation="bilinear", zorder=2)
+    # Минимум и максимум - целые числа, поэтому шкала дискретная: по цвету на каждое значение
+    from matplotlib import colormaps
+    colors = colormaps[cmap or "viridis"].resampled(top + 1)
+    return ax.imshow(values, extent=MAP_EXTENT, origin="lower", alpha=alpha, cmap=colors,
+                     vmin=-0.5, vmax=top + 0.5, interpolation="nearest", zorder=2)
@@ -0,0 +1,175 @@
+from typing import Optional
+
+import numpy as np  # Импортируем библиотеку NumPy для работы с массивами
+
+from constants import R
+from transforms import spherical_coordinates
+from utilities import ecef_positions
+
+GRAZING_ALTITUDE = 100.0  # Наименьшая высота линии визирования над Землёй (в км): ниже - атмосфера
+CHUNK_ELEMENTS = 4_000_000  # Наибольшее число значений (момент x спутник x спутник) в одном блоке
+
+
+class LinkGraph:
+    """Граф прямой видимости между спутниками для каждого момента времени.
+
+    Рёбра всех моментов хранятся подряд в массивах first, second (first < second), упорядоченных
+    по моменту, затем по паре; рёбра момента k - участок [offsets[k], offsets[k + 1]). Это сжатое
+    представление (CSR по моментам); матрица смежности одного момента строится adjacency.
+    Подспутниковые точки в те же моменты (points) хранятся вместе с рёбрами: линии связи рисуются
+    между положениями, для которых проверялась видимость, а не по трассам на другой сетке времени.
+    """
+
+    __slots__ = ("n_satellites", "time_steps", "offsets", "first", "second", "points")
+
+    def __init__(self, n_satellites, time_steps, offsets, first, second, points):
+        self.n_satellites = int(n_satellites)
+        self.time_steps = time_steps  # Моменты времени от начальной даты (в секундах)
+        self.offsets = offsets  # Начало рёбер каждого момента, массив (n_epochs + 1,)
+        self.first = first  # Первые спутники рёбер (int32)
+        self.second = second  # Вторые спутники рёбер (int32)
+        self.points = points  # Долготы и широты спутников (в градусах), массив (n_epochs, n_satellites, 2), float32
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def edges(self, epoch: int):
+        """Рёбра момента epoch: (первые спутники, вторые спутники)."""
+        part = slice(self.offsets[epoch], self.offsets[epoch + 1])
+        return self.first[part], self.second[part]
+
+    def adjacency(self, epoch: int):
+        """Матрица смежности момента epoch в формате CSR: (indptr, indices), каждое ребро в обе стороны."""
+        first, second = self.edges(epoch)
+        rows = np.concatenate([first, second])
+        columns = np.concatenate([second, first])
+        order = np.lexsort((columns, rows))
+        indptr = np.zeros(self.n_satellites + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=self.n_satellites), out=indptr[1:])
+        return indptr, columns[order]
+
+    def _epochs(self) -> np.ndarray:
+        # Номер момента каждого ребра
+        return np.repeat(np.arange(len(self)), np.diff(self.offsets))
+
+    def degrees(self) -> np.ndarray:
+        """Число линий связи каждого спутника в каждый момент: массив (n_epochs, n_satellites)."""
+        base = self._epochs() * self.n_satellites
+        counts = np.bincount(base + self.first, minlength=len(self) * self.n_satellites)
+        counts += np.bincount(base + self.second, minlength=len(self) * self.n_satellites)
+        return counts.reshape(len(self), self.n_satellites)
+
+    def components(self) -> np.ndarray:
+        """Число компонент связности графа в каждый момент: массив (n_epochs,).
+
+        Метки вершин всех моментов распространяются вдоль рёбер (каждая вершина получает
+        наименьшую метку соседа) со сжатием путей, пока метки меняются.
+        """
+        n = self.n_satellites
+        base = self._epochs() * n
+        u, v = base + self.first, base + self.second
+        labels = np.arange(len(self) * n)
+        while True:
+            updated = labels.copy()
+            np.minimum.at(updated, u, labels[v])
+            np.minimum.at(updated, v, labels[u])
+            updated = updated[updated]  # Сжатие путей: метка метки
+            if np.array_equal(updated, labels):
+                break
+            labels = updated
+        roots = labels == np.arange(labels.size)
+        return roots.reshape(len(self), n).sum(axis=1)
+
+    def summary(self) -> dict:
+        """Сводные показатели за интервал: число линий, степени вершин и связность."""
+        degrees = self.degrees()
+        components = self.components()
+        return {
+            "epochs": len(self),
+            "mean_links": float(np.diff(self.offsets).mean()) if len(self) else 0.0,
+            "mean_degree": float(degrees.mean()) if degrees.size else 0.0,
+            "min_degree": int(degrees.min()) if degrees.size else 0,
+            "max_degree": int(degrees.max()) if degrees.size else 0,
+            "isolated_fraction": float((degrees == 0).mean()) if degrees.size else 0.0,  # Доля (момент, спутник) без связи
+            "connected_fraction": float((components == 1).mean()) if len(self) else 0.0,  # Доля моментов со связным графом
+            "max_components": int(components.max(initial=0)),
+        }
+
+    def save(self, path: str):
+        np.savez_compressed(path, **{name: getattr(self, name) for name in self.__slots__})
+
+    @classmethod
+    def load(cls, path: str):
+        with np.load(path) as data:
+            return cls(**{name: data[name][()] if data[name].ndim == 0 else data[name] for name in cls.__slots__})
+
+
+def visible_pairs(positions: np.ndarray, grazing_radius: float, max_range: Optional[float] = None,
+                  others: Optional[np.ndarray] = None) -> np.ndarray:
+    """Матрица прямой видимости для каждого момента: (n_epochs, n_sats, n_others), bool.
+
+    positions - координаты (n_epochs, n_sats, 3), others - координаты вторых концов (по умолчанию
+    те же спутники). Ближайшая к центру Земли точка отрезка a-b лежит внутри него, если
+    0 < -a·(b - a) < |b - a|², и тогда её расстояние до центра в квадрате равно
+    |a|² - (a·(b - a))² / |b - a|². Всё выражается через матрицу скалярных произведений a·b одного
+    момента, поэтому проверка всех пар - одно пакетное произведение матриц. Концы отрезка - сами
+    спутники, они над атмосферой.
+    """
+    others = positions if others is None else others
+    gram = positions @ others.transpose(0, 2, 1)  # a·b для всех пар каждого момента
+    norm2 = np.einsum("kij,kij->ki", positions, positions)[:, :, np.newaxis]  # |a|²
+    other2 = np.einsum("kij,kij->ki", others, others)[:, np.newaxis, :]  # |b|²
+    along = gram - norm2  # a·(b - a)
+    length2 = norm2 + other2 - 2 * gram  # |b - a|²
+    inside = (along < 0) & (-along < length2)
+    visible = ~inside | (along * along < length2 * (norm2 - grazing_radius**2))
+    if max_range is not None:
+        visible &= length2 <= max_range**2
+    return visible
+
+
+def line_of_sight_graph(
+    elements: dict,  # Орбитальные элементы по слотам (как возвращает satellite_slots или ConstellationTable.elements)
+    jd: float,  # Начальная дата (юлианская дата)
+    time_steps,  # Моменты времени от начальной даты (в секундах)
+    grazing_altitude: float = GRAZING_ALTITUDE,  # Линия связи не должна опускаться ниже этой высоты (в км)
+    max_range: Optional[float] = None,  # Наибольшая дальность связи (в км); None - без ограничения
+    j2: bool = False  # True - вековые возмущения J2
+) -> LinkGraph:
+    """Граф прямой видимости между всеми спутниками в каждый момент с учётом заслонения Землёй.
+
+    Положения рассчитываются блоками по времени, проверка всех пар одного блока выполняется
+    пакетно (см. visible_pairs). В блоке не больше CHUNK_ELEMENTS пар: если столько пар больше,
+    чем в одном моменте, момент делится на блоки строк (первых спутников пары), и каждая строка
+    проверяется только со спутниками с большим номером.
+    """
+    t = np.asarray(time_steps, dtype=float)
+    n_sats = len(elements["semi_major_axis"])
+    rows = {key: np.asarray(value)[:, np.newaxis] for key, value in elements.items()}
+    chunk = max(1, CHUNK_ELEMENTS // max(n_sats * n_sats, 1))
+    row_chunk = max(1, min(n_sats, CHUNK_ELEMENTS // max(n_sats, 1)))  # Меньше n_sats, только если chunk = 1
+    radius = R + grazing_altitude
+    counts, firsts, seconds = [], [], []
+    points = np.empty((t.size, n_sats, 2), dtype=np.float32)
+    for start in range(0, t.size, chunk):
+        x, y, z = ecef_positions(rows, jd, t[start:start + chunk], j2)  # (n_sats, n_block)
+        lon, lat = spherical_coordinates(x, y, z)
+        points[start:start + chunk] = np.stack([lon.T, lat.T], axis=-1)
+        positions = np.stack([x.T, y.T, z.T], axis=-1)  # (n_block, n_sats, 3)
+        count = np.zeros(len(positions), dtype=np.int64)
+        for row in range(0, n_sats, row_chunk):
+            # Блок строк [row, row + row_chunk) против спутников с номерами от row: пары first < second.
+            # Если блоков строк несколько, в блоке времени один момент, и порядок рёбер сохраняется
+            visible = visible_pairs(positions[:, row:row + row_chunk], radius, max_range, positions[:, row:])
+            visible &= np.arange(row, min(row + row_chunk, n_sats))[:, np.newaxis] < np.arange(row, n_sats)
+            epoch, first, second = np.nonzero(visible)  # По моменту, затем по паре
+            count += np.bincount(epoch, minlength=len(positions))
+            firsts.append((first + row).astype(np.int32))
+            seconds.append((second + row).astype(np.int32))
+        counts.append(count)
+    offsets = np.zeros(t.size + 1, dtype=np.int64)
+    if t.size:
+        np.cumsum(np.concatenate(counts), out=offsets[1:])
+    empty = np.zeros(0, dtype=np.int32)
+    return LinkGraph(n_sats, t, offsets, np.concatenate(firsts) if firsts else empty,
+                     np.concatenate(seconds) if seconds else empty, points)
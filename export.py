@@ -0,0 +1,235 @@
+import multiprocessing  # Контекст запуска процессов отрисовки
+import shutil  # Поиск ffmpeg в PATH
+import subprocess  # Передача кадров в ffmpeg через канал
+from collections import deque  # Очередь задач отрисовки в порядке кадров
+from itertools import islice  # Первые задачи отрисовки
+from concurrent.futures import ProcessPoolExecutor  # Пул процессов отрисовки кадров
+from multiprocessing.shared_memory import SharedMemory  # Общая память для трасс без сериализации
+from typing import Callable, List, Optional, Sequence
+
+import numpy as np  # Импортируем библиотеку NumPy для работы с массивами
+
+from background import MapBackground
+from rendering import BlitAnimator
+
+FIGSIZE = (10, 6)  # Размер фигуры (в дюймах), как в окне приложения
+DPI = 100  # Разрешение: 1000x600 пикселей
+FRAMES_PER_TASK = 10  # Кадров в одной задаче процесса отрисовки
+MIN_PARALLEL_FRAMES = 200  # Меньше кадров рисуется в текущем процессе: запуск пула дороже самой отрисовки
+GIF_COLORS = 255  # Размер общей палитры GIF
+
+_renderer = None  # Фигура, аниматор и номера кадров процесса отрисовки (создаются один раз на процесс)
+
+
+def track_figure(title: str, labels: Sequence[str], figsize=FIGSIZE, dpi=DPI):
+    """Создаёт фигуру Agg с картой, сеткой и пустыми объектами трасс (без pyplot и дисплея).
+
+    Возвращает (fig, ax, handles, datetime_text).
+    """
+    from matplotlib import colormaps
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize, dpi=dpi)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    fig.subplots_adjust(right=0.82)  # Место справа для легенды
+    fig.map_background = MapBackground(ax)  # Ссылка на фон нужна, пока жива фигура
+    ax.set_xticks(np.arange(-180, 181, 30))
+    ax.set_yticks(np.arange(-90, 91, 30))
+    ax.grid(True, color='gray', linestyle='--', linewidth=0.5)
+    ax.set_xlabel("Longitude")
+    ax.set_ylabel("Latitude")
+    ax.set_title(title)
+    colors = colormaps["plasma"](np.linspace(0, 1, len(labels)))
+    handles = [ax.plot([], [], 'o', markersize=4, color=colors[i], label=label)[0] for i, label in enumerate(labels)]
+    datetime_text = fig.text(0.2, 0.925, "", ha="left", va="top", fontsize=10, bbox=dict(facecolor='white', alpha=0.7))
+    return fig, ax, handles, datetime_text
+
+
+def save_png(path: str, title: str, longitudes, latitudes, labels: Sequence[str], time_label: str = ""):
+    """Сохраняет статичную карту с полными трассами всех спутников."""
+    fig, ax, handles, datetime_text = track_figure(title, labels)
+    for handle, lon, lat in zip(handles, longitudes, latitudes):
+        handle.set_data(lon, lat)
+    if len(handles) <= 40:  # Для больших систем легенда занимает больше места, чем карта
+        ax.legend(handles=handles, loc='center left', bbox_to_anchor=(1, 0.5), fontsize='small')
+    datetime_text.set_text(time_label)
+    fig.savefig(path, bbox_inches="tight")
+
+
+def save_coverage_png(path: str, title: str, coverage, field: str = "mean"):
+    """Сохраняет карту покрытия (coverage.CoverageMap) тепловой картой поверх фона с картой."""
+    from coverage import draw_coverage
+    fig, ax, _, datetime_text = track_figure(title, [])
+    image = draw_coverage(ax, coverage, field)
+    label = "Coverage, %" if field == "coverage" else f"Satellites in view ({field})"
+    colorbar = fig.colorbar(image, ax=ax, fraction=0.03, pad=0.02, label=label)
+    if field in ("minimum", "maximum"):
+        colorbar.set_ticks(np.arange(0, image.norm.vmax, max(1, int(image.norm.vmax) // 10)))
+    datetime_text.set_text(f"mask {coverage.elevation_mask:g}°, {coverage.epochs} epochs, "
+                           f"global {field}: {coverage.global_mean(field):.1f}")
+    fig.savefig(path, bbox_inches="tight")
+
+
+def has_ffmpeg() -> bool:
+    return shutil.which("ffmpeg") is not None
+
+
+def ffmpeg_command(path: str, width: int, height: int, fps: float) -> List[str]:
+    """Команда ffmpeg, читающая кадры RGBA из stdin и пишущая H.264 (или GIF, если путь .gif)."""
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        raise RuntimeError("ffmpeg not found in PATH")
+    if path.lower().endswith(".gif"):
+        # Общая палитра строится по всем кадрам (palettegen), затем применяется к каждому
+        output = ["-vf", "split[a][b];[a]palettegen[p];[b][p]paletteuse", path]
+    else:
+        output = ["-pix_fmt", "yuv420p", "-vcodec", "libx264", path]
+    return [ffmpeg, "-y", "-loglevel", "error",
+            "-f", "rawvideo", "-pix_fmt", "rgba", "-s", f"{width}x{height}", "-r", str(fps), "-i", "-"] + output
+
+
+class FrameEncoder:
+    """Запись кадров RGBA в видео: ffmpeg через канал, а для .gif без ffmpeg - Pillow.
+
+    Pillow собирает GIF целиком в памяти (по байту на пиксель кадра с общей палитрой первого
+    кадра), поэтому для длинных анимаций лучше ffmpeg.
+    """
+
+    def __init__(self, path: str, width: int, height: int, fps: float):
+        self.path = path
+        self.size = (width, height)
+        self.fps = fps
+        self.count = 0  # Число записанных кадров
+        self._process = None
+        self._images = []  # Кадры GIF для Pillow
+        if has_ffmpeg() or not path.lower().endswith(".gif"):
+            self._process = subprocess.Popen(ffmpeg_command(path, width, height, fps), stdin=subprocess.PIPE)
+
+    def write(self, data):
+        """Записывает один или несколько кадров подряд (байты RGBA)."""
+        frame_bytes = self.size[0] * self.size[1] * 4
+        data = memoryview(data).cast("B")
+        if self._process is not None:
+            self._process.stdin.write(data)  # Кадры уходят в ffmpeg без промежуточных файлов
+            self.count += len(data) // frame_bytes
+            return
+        from PIL import Image
+        for start in range(0, len(data), frame_bytes):
+            image = Image.frombuffer("RGBA", self.size, data[start:start + frame_bytes], "raw", "RGBA", 0, 1)
+            image = image.convert("RGB")
+            palette = self._images[0] if self._images else None
+            self._images.append(image.quantize(GIF_COLORS, palette=palette, dither=Image.Dither.NONE))
+            self.count += 1
+
+    def close(self):
+        if self._process is not None:
+            self._process.stdin.close()
+            if self._process.wait() != 0:
+                raise RuntimeError(f"ffmpeg exited with code {self._process.returncode}")
+        elif self._images:
+            self._images[0].save(self.path, save_all=True, append_images=self._images[1:],
+                                 duration=max(20, round(1000 / self.fps)), loop=0)
+            self._images = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _video_animator(title: str, longitudes, latitudes, labels: Sequence[str], time_label: Callable[[int], str]):
+    # Фигура и аниматор для записи кадров; фон с картой и легендой кэшируется аниматором
+    n_steps = np.shape(longitudes)[1]
+    fig, ax, handles, datetime_text = track_figure(title, labels)
+    animator = BlitAnimator(fig, ax, longitudes, latitudes, [h.get_color() for h in handles], handles,
+                            datetime_text, time_label, n_steps)
+    if len(handles) <= 40:
+        animator.update_legend()
+    return fig, animator
+
+
+def _init_renderer(shm_name: str, shape: tuple, title: str, labels: Sequence[str], frames: List[int],
+                   time_labels: dict):
+    """Создаёт в процессе отрисовки фигуру над трассами из общей памяти."""
+    global _renderer
+    shm = SharedMemory(name=shm_name)
+    tracks = np.ndarray(shape, dtype=float, buffer=shm.buf)
+    fig, animator = _video_animator(title, tracks[0], tracks[1], labels, time_labels.__getitem__)
+    _renderer = {"shm": shm, "fig": fig, "animator": animator, "frames": frames, "next": 0}
+
+
+def _render_frames(start: int, stop: int) -> bytes:
+    """Рисует кадры с номерами [start, stop) из списка кадров и возвращает их байты RGBA.
+
+    Фон аниматора переиспользуется между задачами: кадры, нарисованные с прошлой задачи другими
+    процессами, только впечатываются в него (BlitAnimator.skip_frames).
+    """
+    fig, animator, frames = _renderer["fig"], _renderer["animator"], _renderer["frames"]
+    animator.skip_frames(frames[_renderer["next"]:start])
+    rendered = []
+    for frame in frames[start:stop]:
+        animator.draw_frame(frame)
+        rendered.append(bytes(fig.canvas.buffer_rgba()))
+    _renderer["next"] = stop
+    return b"".join(rendered)
+
+
+def _parallel_frames(longitudes, latitudes, title, labels, time_labels, frames, workers):
+    # Задачи по FRAMES_PER_TASK кадров выдаются по порядку; в работе не больше двух задач на процесс,
+    # поэтому готовые, но ещё не записанные кадры не копятся в памяти
+    tracks = np.stack([np.asarray(longitudes, dtype=float), np.asarray(latitudes, dtype=float)])
+    shm = SharedMemory(create=True, size=max(tracks.nbytes, 1))
+    try:
+        np.ndarray(tracks.shape, dtype=float, buffer=shm.buf)[:] = tracks
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_renderer,
+                                 initargs=(shm.name, tracks.shape, title, labels, frames, time_labels)) as executor:
+            tasks = ((start, min(start + FRAMES_PER_TASK, len(frames)))
+                     for start in range(0, len(frames), FRAMES_PER_TASK))
+            pending = deque(executor.submit(_render_frames, *task) for task in islice(tasks, 2 * workers))
+            while pending:
+                data = pending.popleft().result()
+                pending.extend(executor.submit(_render_frames, *task) for task in islice(tasks, 1))
+                yield data
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def save_video(
+    path: str,  # Путь к файлу .mp4 или .gif
+    title: str,  # Заголовок карты
+    longitudes, latitudes,  # Трассы (n_sats, n_steps)
+    labels: Sequence[str],  # Метки спутников
+    time_label: Callable[[int], str],  # Текст метки времени для номера отсчёта
+    frames: Optional[Sequence[int]] = None,  # Номера отсчётов, становящиеся кадрами (по умолчанию все)
+    fps: float = 25.0,  # Частота кадров видео
+    workers: int = 1  # Число процессов отрисовки (1 - в текущем процессе)
+) -> int:
+    """Рендерит анимацию в видео без дисплея и возвращает число записанных кадров.
+
+    При workers > 1 кадры (по возрастанию) делятся на короткие последовательные участки между
+    процессами пула; каждый процесс один раз строит фигуру с картой и дальше только дорисовывает
+    новые точки поверх кэшированного фона, так что кадры совпадают с последовательной отрисовкой.
+    Кадры передаются кодировщику (см. FrameEncoder) по порядку по мере готовности. Если пул
+    процессов недоступен, оставшиеся кадры рисуются в текущем процессе.
+    """
+    n_steps = np.shape(longitudes)[1]
+    frames = list(range(n_steps) if frames is None else frames)
+    fig, animator = _video_animator(title, longitudes, latitudes, labels, time_label)
+    width, height = fig.canvas.get_width_height()
+    with FrameEncoder(path, width, height, fps) as encoder:
+        if workers > 1 and len(frames) >= MIN_PARALLEL_FRAMES:
+            time_labels = {frame: time_label(frame) for frame in frames}  # Функция метки может быть не сериализуемой
+            try:
+                for data in _parallel_frames(longitudes, latitudes, title, labels, time_labels, frames, workers):
+                    encoder.write(data)
+            except (OSError, RuntimeError):
+                pass  # Пул процессов недоступен - дорисовываем оставшиеся кадры последовательно
+        for frame in frames[encoder.count:]:
+            animator.draw_frame(frame)
+            encoder.write(fig.canvas.buffer_rgba())
+    return encoder.count
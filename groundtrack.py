@@ -0,0 +1,495 @@
+"""Расчёт и рендеринг трасс без графического интерфейса.
+
+Примеры (из корня репозитория):
+    python -m groundtrack list
+    python -m groundtrack compute GPS Glonass --span 1d --step 30 --format csv --output out
+    python -m groundtrack compute --config my_system.json --span 3rev --step 0.001rev --format npy
+    python -m groundtrack render BeiDou --format png mp4 --span 1rev --step 0.002rev --jobs 2
+    python -m groundtrack render GPS --format mp4 --span 7d --step 60 --frames 5000 --render-workers 8
+    python -m groundtrack compute --catalog active.tle --span 6h --step 60 --format parquet
+    python -m groundtrack render IRNSS --span 1rev --step 0.01rev --tolerance 1
+    python -m groundtrack passes GPS Glonass --station Moscow:55.75:37.62:0.15 --span 7d --sort max_elevation
+    python -m groundtrack coverage GPS --span 1d --step 5m --min-satellites 4 --field mean coverage
+    python -m groundtrack conjunctions --catalog active.tle --span 1d --threshold 5 --output conjunctions.csv
+    python -m groundtrack links BeiDou --span 1d --step 60 --max-range 60000 --output beidou_links.npz
+
+Файл конфигурации (JSON) описывает одну систему или список систем:
+    {"name": "MySystem", "satellites": [{"name": "...", "num_satellite": 4, "inclination": 55,
+      "longitude_of_ascending_node": [0, 90], "argument_pericenter": [0, 180],
+      "semi_major_axis": 26560, "eccentricity": 0}]}
+
+Файл станций (JSON) - список станций:
+    [{"name": "Moscow", "latitude": 55.75, "longitude": 37.62, "altitude": 0.15, "elevation_mask": 10}]
+"""
+import argparse  # Разбор аргументов командной строки
+import json  # Чтение файлов конфигурации
+import os  # Работа с путями
+import re  # Разбор длительностей
+import sys
+import time  # Замер времени выполнения заданий
+from concurrent.futures import ProcessPoolExecutor  # Параллельное выполнение заданий
+from datetime import timedelta  # Метки времени кадров
+from typing import List, Tuple
+
+import numpy as np  # Импортируем библиотеку NumPy для работы с массивами
+
+from constants import SATELLITES, SatelliteConfig
+from catalog import CatalogError, load_catalog
+from conjunctions import CONJUNCTION_DTYPE, conjunction_rows, screen_conjunctions
+from constellation import ConstellationTable
+from coverage import FIELDS, coverage_grid
+from crosslinks import GRAZING_ALTITUDE, line_of_sight_graph
+from parallel import default_workers
+from passes import PASS_DTYPE, GroundStation, pass_rows, predict_passes, sort_passes
+from sampling import adaptive_time_steps
+from sidereal import julian_date
+from streaming import collect_blocks, count_steps, iter_track_blocks, write_track_blocks
+
+DEFAULT_EPOCH = "2025-02-27 00:00:00"  # Эпоха по умолчанию, как в приложении
+DURATION_UNITS = {"s": 1.0, "m": 60.0, "h": 3600.0, "d": 86400.0}  # Множители единиц длительности
+MAX_VIDEO_FRAMES = 2000  # Ограничение числа кадров видео по умолчанию
+
+
+def parse_duration(text: str, period: float) -> float:
+    """Переводит длительность в секунды: "5400", "90m", "6h", "2d" или "3rev" (витки первой конфигурации)."""
+    match = re.fullmatch(r"\s*([0-9]*\.?[0-9]+(?:[eE][-+]?[0-9]+)?)\s*(s|m|h|d|rev)?\s*", text)
+    if match is None:
+        raise argparse.ArgumentTypeError(f"invalid duration: {text!r}")
+    value, unit = float(match.group(1)), match.group(2) or "s"
+    return value * (period if unit == "rev" else DURATION_UNITS[unit])
+
+
+def satellite_from_dict(data: dict) -> SatelliteConfig:
+    return SatelliteConfig(
+        name=data["name"],
+        num_satellite=data.get("num_satellite", len(data["longitude_of_ascending_node"]) * len(data["argument_pericenter"])),
+        inclination=data["inclination"],
+        longitude_of_ascending_node=list(data["longitude_of_ascending_node"]),
+        argument_pericenter=list(data["argument_pericenter"]),
+        semi_major_axis=data["semi_major_axis"],
+        eccentricity=data.get("eccentricity", 0.0)
+    )
+
+
+def load_systems(names: List[str], config_paths: List[str], catalog_paths: List[str] = ()) -> list:
+    """Собирает системы по именам из SATELLITES, из файлов конфигурации и из каталогов TLE/OMM.
+
+    Каталог становится одной системой (ConstellationTable) с именем файла.
+    """
+    systems = []
+    for name in names:
+        if name not in SATELLITES:
+            raise SystemExit(f"unknown system {name!r}; available: {', '.join(SATELLITES)}")
+        systems.append((name, SATELLITES[name]))
+    for path in config_paths:
+        with open(path, encoding="utf-8") as file:
+            data = json.load(file)
+        for system in data if isinstance(data, list) else [data]:
+            systems.append((system["name"], [satellite_from_dict(s) for s in system["satellites"]]))
+    for path in catalog_paths:
+        try:
+            table = load_catalog(path)
+        except CatalogError as error:
+            raise SystemExit(f"{path}: {error}")
+        if len(table) == 0:
+            raise SystemExit(f"{path}: no objects found")
+        systems.append((os.path.splitext(os.path.basename(path))[0], table))
+    return systems
+
+
+def as_table(satellites) -> ConstellationTable:
+    return satellites if isinstance(satellites, ConstellationTable) else ConstellationTable.from_configs(satellites)
+
+
+def satellite_labels(satellites) -> List[str]:
+    """Метки слотов в том же порядке и формате, что и в окне приложения."""
+    return as_table(satellites).labels
+
+
+def safe_name(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", name)
+
+
+# ------------------ Форматы вывода трасс ------------------ #
+def write_csv(path, blocks, labels):
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("time_s,satellite,longitude,latitude\n")
+        for block in blocks:
+            for i, label in enumerate(labels):
+                label = label.replace("%", "%%")  # Метка входит в строку формата savetxt
+                if "," in label or '"' in label:
+                    label = '"' + label.replace('"', '""') + '"'
+                rows = np.column_stack([block.time, block.longitudes[i], block.latitudes[i]])
+                np.savetxt(file, rows, fmt=f"%.3f,{label},%.8f,%.8f")
+
+
+def write_parquet(path, blocks, labels):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise SystemExit("Parquet output requires pyarrow: pip install pyarrow")
+    labels = np.asarray(labels)
+    writer = None
+    try:
+        for block in blocks:
+            n_sats, n = block.longitudes.shape
+            table = pa.table({
+                "time_s": np.tile(block.time, n_sats),
+                "satellite": pa.array(np.repeat(labels, n)).dictionary_encode(),
+                "longitude": block.longitudes.reshape(-1),
+                "latitude": block.latitudes.reshape(-1),
+            })
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def write_npz(path, blocks, labels):
+    times, longitudes, latitudes = collect_blocks(blocks)
+    np.savez_compressed(path, time=times, longitudes=longitudes, latitudes=latitudes, labels=np.asarray(labels))
+
+
+def parse_station(text: str, elevation_mask: float) -> GroundStation:
+    """Станция из строки "имя:широта:долгота[:высота в км]"."""
+    parts = text.split(":")
+    try:
+        if len(parts) not in (3, 4):
+            raise ValueError
+        return GroundStation(parts[0], *(float(value) for value in parts[1:]), elevation_mask=elevation_mask)
+    except ValueError:
+        raise SystemExit(f"invalid station {text!r}; expected NAME:LAT:LON[:ALT_KM]")
+
+
+def load_stations(specs: List[str], paths: List[str], elevation_mask: float) -> List[GroundStation]:
+    stations = [parse_station(spec, elevation_mask) for spec in specs]
+    for path in paths:
+        with open(path, encoding="utf-8") as file:
+            for data in json.load(file):
+                stations.append(GroundStation(data["name"], data["latitude"], data["longitude"],
+                                              data.get("altitude", 0.0), data.get("elevation_mask", elevation_mask)))
+    return stations
+
+
+def write_passes(file, rows):
+    """Таблица событий в CSV; время - UTC в формате ISO, пустое поле - событие вне интервала."""
+    moment = lambda value: "" if value is None else value.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3]
+    quote = lambda text: '"' + text.replace('"', '""') + '"' if "," in text or '"' in text else text
+    file.write("station,satellite,aos,culmination,los,max_elevation_deg,duration_s\n")
+    for station, satellite, aos, culmination, los, elevation, duration in rows:
+        file.write(f"{quote(station)},{quote(satellite)},{moment(aos)},{moment(culmination)},{moment(los)},"
+                   f"{elevation:.3f},{'' if np.isnan(duration) else f'{duration:.1f}'}\n")
+
+
+def run_passes(args) -> int:
+    from astropy.time import Time
+    systems = load_systems(args.systems, args.config, args.catalog)
+    stations = load_stations(args.station, args.stations, args.mask)
+    if not systems:
+        raise SystemExit("no systems given")
+    if not stations:
+        raise SystemExit("no stations given; use --station NAME:LAT:LON[:ALT_KM] or --stations FILE")
+    table = ConstellationTable.concatenate([as_table(satellites) for _, satellites in systems])
+    period = float(table.periods[0])
+    date = Time(args.epoch, scale="utc")
+    step = None if args.step is None else parse_duration(args.step, period)
+
+    start = time.perf_counter()
+    passes = predict_passes(table.elements(), stations, julian_date(date), parse_duration(args.span, period),
+                            step=step, j2=args.j2)
+    elapsed = time.perf_counter() - start
+    rows = pass_rows(sort_passes(passes, args.sort, args.descending), [s.name for s in stations], table.labels,
+                     date.to_datetime())
+    if args.output == "-":
+        write_passes(sys.stdout, rows)
+    else:
+        with open(args.output, "w", encoding="utf-8") as file:
+            write_passes(file, rows)
+    print(f"{len(passes)} passes for {len(stations) * len(table)} station-satellite pairs in {elapsed:.2f} s",
+          file=sys.stderr)
+    return 0
+
+
+def write_conjunctions(file, rows):
+    """Таблица сближений в CSV; время - UTC в формате ISO."""
+    quote = lambda text: '"' + text.replace('"', '""') + '"' if "," in text or '"' in text else text
+    file.write("first,second,tca,distance_km,relative_speed_km_s\n")
+    for first, second, tca, distance, speed in rows:
+        file.write(f"{quote(first)},{quote(second)},{tca.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]},"
+                   f"{distance:.3f},{speed:.3f}\n")
+
+
+def run_conjunctions(args) -> int:
+    from astropy.time import Time
+    systems = load_systems(args.systems, args.config, args.catalog)
+    if not systems:
+        raise SystemExit("no systems given")
+    # Сближения ищутся между всеми спутниками всех систем вместе
+    table = ConstellationTable.concatenate([as_table(satellites) for _, satellites in systems])
+    period = float(table.periods[0])
+    date = Time(args.epoch, scale="utc")
+    step = None if args.step is None else parse_duration(args.step, period)
+
+    start = time.perf_counter()
+    conjunctions = screen_conjunctions(table.elements(), julian_date(date), parse_duration(args.span, period),
+                                       threshold=args.threshold, step=step, j2=args.j2)
+    elapsed = time.perf_counter() - start
+    conjunctions = conjunctions[np.argsort(conjunctions[args.sort], kind="stable")]
+    rows = conjunction_rows(conjunctions, table.labels, date.to_datetime())
+    if args.output == "-":
+        write_conjunctions(sys.stdout, rows)
+    else:
+        with open(args.output, "w", encoding="utf-8") as file:
+            write_conjunctions(file, rows)
+    print(f"{len(conjunctions)} conjunctions closer than {args.threshold:g} km among {len(table)} satellites "
+          f"in {elapsed:.2f} s", file=sys.stderr)
+    return 0
+
+
+def run_links(args) -> int:
+    from astropy.time import Time
+    systems = load_systems(args.systems, args.config, args.catalog)
+    if not systems:
+        raise SystemExit("no systems given")
+    # Связи ищутся между всеми спутниками всех систем вместе
+    table = ConstellationTable.concatenate([as_table(satellites) for _, satellites in systems])
+    name = "+".join(name for name, _ in systems)
+    period = float(table.periods[0])
+    date = Time(args.epoch, scale="utc")
+    span, step = parse_duration(args.span, period), parse_duration(args.step, period)
+
+    start = time.perf_counter()
+    graph = line_of_sight_graph(table.elements(), julian_date(date), np.arange(0.0, span + step / 2, step),
+                                grazing_altitude=args.grazing_altitude, max_range=args.max_range, j2=args.j2)
+    summary = graph.summary()
+    elapsed = time.perf_counter() - start
+    if args.output:
+        graph.save(args.output)
+    print(f"{name:<12} {elapsed:8.2f} s  {args.output or ''}")
+    print(f"{'':<12} {len(table)} satellites, {summary['epochs']} epochs, links per epoch {summary['mean_links']:.1f}, "
+          f"degree min/mean/max {summary['min_degree']}/{summary['mean_degree']:.2f}/{summary['max_degree']}")
+    print(f"{'':<12} isolated {100 * summary['isolated_fraction']:.2f}% of satellite-epochs, "
+          f"connected {100 * summary['connected_fraction']:.2f}% of epochs, up to {summary['max_components']} components")
+    return 0
+
+
+def run_coverage(args) -> int:
+    from astropy.time import Time
+    systems = load_systems(args.systems, args.config, args.catalog)
+    if not systems:
+        raise SystemExit("no systems given")
+    # Покрытие считается для всех систем вместе (например, GPS + ГЛОНАСС)
+    table = ConstellationTable.concatenate([as_table(satellites) for _, satellites in systems])
+    name = "+".join(name for name, _ in systems)
+    period = float(table.periods[0])
+    date = Time(args.epoch, scale="utc")
+    span, step = parse_duration(args.span, period), parse_duration(args.step, period)
+
+    start = time.perf_counter()
+    coverage = coverage_grid(table.elements(), julian_date(date), np.arange(0.0, span + step / 2, step),
+                             resolution=args.resolution, elevation_mask=args.mask,
+                             min_satellites=args.min_satellites, j2=args.j2)
+    elapsed = time.perf_counter() - start
+    os.makedirs(args.output, exist_ok=True)
+    base = os.path.join(args.output, safe_name(name) + "_coverage")
+    outputs = []
+    if "npz" in args.formats:
+        coverage.save(base + ".npz")
+        outputs.append(base + ".npz")
+    if "png" in args.formats:
+        from export import save_coverage_png
+        for field in args.fields:
+            save_coverage_png(f"{base}_{field}.png", f"{name} coverage", coverage, field)
+            outputs.append(f"{base}_{field}.png")
+    print(f"{name:<12} {elapsed:8.2f} s  {', '.join(outputs)}")
+    print(f"{'':<12} satellites in view min/mean/max: {int(coverage.minimum.min())}/"
+          f"{coverage.global_mean('mean'):.2f}/{int(coverage.maximum.max())}, "
+          f"coverage (>= {args.min_satellites}): {coverage.global_mean('coverage'):.2f}%")
+    return 0
+
+
+# ------------------ Задания ------------------ #
+def run_job(job: dict) -> Tuple[str, float, List[str]]:
+    """Выполняет одно задание (compute или render для одной системы); возвращает (имя, время, файлы)."""
+    start = time.perf_counter()
+    from astropy.time import Time
+    name, satellites = job["name"], job["satellites"]
+    date = Time(job["epoch"], scale="utc")
+    period = float(as_table(satellites).periods[0])  # Единица "rev" - виток первого спутника
+    span = parse_duration(job["span"], period)
+    step = parse_duration(job["step"], period)
+    labels = satellite_labels(satellites)
+    time_steps = None
+    if job["tolerance"]:
+        # Адаптивная сетка: шаг step - наибольший, мельче там, где трасса быстро меняется
+        time_steps, _, _ = adaptive_time_steps(as_table(satellites).elements(), julian_date(date), span,
+                                               job["tolerance"], max_step=step, j2=job["j2"])
+    n_steps = count_steps(span, step) if time_steps is None else time_steps.size
+    base = os.path.join(job["output"], safe_name(name))
+    blocks = lambda: iter_track_blocks(satellites, date, span, step, j2=job["j2"], time_steps=time_steps)
+    outputs = []
+
+    for fmt in job["formats"]:
+        if fmt == "csv":
+            write_csv(base + ".csv", blocks(), labels)
+            outputs.append(base + ".csv")
+        elif fmt == "parquet":
+            write_parquet(base + ".parquet", blocks(), labels)
+            outputs.append(base + ".parquet")
+        elif fmt == "npz":
+            write_npz(base + ".npz", blocks(), labels)
+            outputs.append(base + ".npz")
+        elif fmt == "npy":
+            # Каталог с memory-mapped массивами: память не зависит от длительности интервала
+            write_track_blocks(blocks(), base, len(labels), n_steps)
+            with open(os.path.join(base, "labels.txt"), "w", encoding="utf-8") as file:
+                file.write("\n".join(labels))
+            outputs.append(base)
+        elif fmt in ("png", "mp4", "gif"):
+            from export import has_ffmpeg, save_png, save_video
+            stride = max(1, -(-n_steps // job["max_points"]))  # Прореживание для отрисовки
+            times, longitudes, latitudes = collect_blocks(blocks(), stride=stride)
+            epoch = date.to_datetime()
+            label_at = lambda i: f"Time: {(epoch + timedelta(seconds=float(times[i]))).strftime('%Y-%m-%d %H:%M:%S')}"
+            title = f"{name} Ground Track"
+            if fmt == "png":
+                save_png(base + ".png", title, longitudes, latitudes, labels, label_at(len(times) - 1))
+                outputs.append(base + ".png")
+            else:
+                if fmt == "mp4" and not has_ffmpeg():
+                    fmt = "gif"  # Без ffmpeg видео записывается в GIF через Pillow
+                frames = np.unique(np.linspace(0, len(times) - 1, min(len(times), job["frames"])).astype(int))
+                started = time.perf_counter()
+                count = save_video(f"{base}.{fmt}", title, longitudes, latitudes, labels, label_at, frames,
+                                   fps=job["fps"], workers=job["render_workers"])
+                outputs.append(f"{base}.{fmt} ({count} frames, {count / (time.perf_counter() - started):.1f} frames/s)")
+    return name, time.perf_counter() - start, outputs
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="groundtrack", description="Satellite ground tracks without a display")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="List built-in satellite systems")
+    for command, formats, default in (("compute", ["csv", "parquet", "npz", "npy"], ["npz"]),
+                                      ("render", ["png", "mp4", "gif"], ["png"])):
+        sub = commands.add_parser(command, help=f"{command} tracks for one or more systems")
+        sub.add_argument("systems", nargs="*", help="System names from SATELLITES")
+        sub.add_argument("--config", action="append", default=[], help="JSON file with system definitions")
+        sub.add_argument("--catalog", action="append", default=[], help="TLE or OMM (XML/KVN/JSON) catalog file")
+        sub.add_argument("--epoch", default=DEFAULT_EPOCH, help="Start epoch (UTC, ISO format)")
+        sub.add_argument("--span", default="1rev", help="Time span: seconds or with unit s/m/h/d/rev")
+        sub.add_argument("--step", default="0.01rev", help="Time step: seconds or with unit s/m/h/d/rev")
+        sub.add_argument("--tolerance", type=float, default=None,
+                         help="Adaptive sampling: max track deviation between samples in km (--step is the largest step)")
+        sub.add_argument("--j2", action="store_true", help="Include J2 secular perturbations (node/perigee drift)")
+        sub.add_argument("--format", nargs="+", choices=formats, default=default, dest="formats")
+        sub.add_argument("--output", default=".", help="Output directory")
+        sub.add_argument("--jobs", type=int, default=1, help="Number of systems processed in parallel")
+        sub.add_argument("--max-points", type=int, default=20000, help="Max samples per track drawn in renders")
+        sub.add_argument("--frames", type=int, default=MAX_VIDEO_FRAMES, help="Max frames in mp4/gif renders")
+        sub.add_argument("--fps", type=float, default=25.0, help="Frame rate of mp4/gif renders")
+        sub.add_argument("--render-workers", type=int, default=None,
+                         help="Processes drawing video frames (default: CPUs divided by --jobs)")
+
+    sub = commands.add_parser("passes", help="predict ground station passes (AOS/LOS/max elevation)")
+    sub.add_argument("systems", nargs="*", help="System names from SATELLITES")
+    sub.add_argument("--config", action="append", default=[], help="JSON file with system definitions")
+    sub.add_argument("--catalog", action="append", default=[], help="TLE or OMM (XML/KVN/JSON) catalog file")
+    sub.add_argument("--station", action="append", default=[], help="Ground station NAME:LAT:LON[:ALT_KM]")
+    sub.add_argument("--stations", action="append", default=[], help="JSON file with a list of ground stations")
+    sub.add_argument("--mask", type=float, default=10.0, help="Elevation mask in degrees (for --station)")
+    sub.add_argument("--epoch", default=DEFAULT_EPOCH, help="Start epoch (UTC, ISO format)")
+    sub.add_argument("--span", default="1d", help="Time span: seconds or with unit s/m/h/d/rev")
+    sub.add_argument("--step", default=None, help="Screening step (default: 1/120 of the shortest period)")
+    sub.add_argument("--j2", action="store_true", help="Include J2 secular perturbations (node/perigee drift)")
+    sub.add_argument("--sort", choices=PASS_DTYPE.names, default="aos", help="Sort the event table by this column")
+    sub.add_argument("--descending", action="store_true", help="Sort in descending order")
+    sub.add_argument("--output", default="-", help="Output CSV file (default: stdout)")
+
+    sub = commands.add_parser("conjunctions", help="screen close approaches between satellites")
+    sub.add_argument("systems", nargs="*", help="System names from SATELLITES (screened together)")
+    sub.add_argument("--config", action="append", default=[], help="JSON file with system definitions")
+    sub.add_argument("--catalog", action="append", default=[], help="TLE or OMM (XML/KVN/JSON) catalog file")
+    sub.add_argument("--epoch", default=DEFAULT_EPOCH, help="Start epoch (UTC, ISO format)")
+    sub.add_argument("--span", default="1d", help="Time span: seconds or with unit s/m/h/d/rev")
+    sub.add_argument("--step", default=None, help="Screening window (default: 1/180 of the shortest period)")
+    sub.add_argument("--threshold", type=float, default=10.0, help="Report approaches closer than this, km")
+    sub.add_argument("--j2", action="store_true", help="Include J2 secular perturbations (node/perigee drift)")
+    sub.add_argument("--sort", choices=CONJUNCTION_DTYPE.names, default="tca", help="Sort the table by this column")
+    sub.add_argument("--output", default="-", help="Output CSV file (default: stdout)")
+
+    sub = commands.add_parser("links", help="inter-satellite line-of-sight graph with degree and connectivity metrics")
+    sub.add_argument("systems", nargs="*", help="System names from SATELLITES (evaluated together)")
+    sub.add_argument("--config", action="append", default=[], help="JSON file with system definitions")
+    sub.add_argument("--catalog", action="append", default=[], help="TLE or OMM (XML/KVN/JSON) catalog file")
+    sub.add_argument("--epoch", default=DEFAULT_EPOCH, help="Start epoch (UTC, ISO format)")
+    sub.add_argument("--span", default="1d", help="Time span: seconds or with unit s/m/h/d/rev")
+    sub.add_argument("--step", default="1m", help="Time step: seconds or with unit s/m/h/d/rev")
+    sub.add_argument("--grazing-altitude", type=float, default=GRAZING_ALTITUDE,
+                     help="Lowest altitude of a line of sight above the Earth, km")
+    sub.add_argument("--max-range", type=float, default=None, help="Longest usable link, km (default: unlimited)")
+    sub.add_argument("--j2", action="store_true", help="Include J2 secular perturbations (node/perigee drift)")
+    sub.add_argument("--output", default=None, help="Save the per-epoch graph to this .npz file")
+
+    sub = commands.add_parser("coverage", help="satellites-in-view statistics on a lat/lon grid")
+    sub.add_argument("systems", nargs="*", help="System names from SATELLITES (evaluated together)")
+    sub.add_argument("--config", action="append", default=[], help="JSON file with system definitions")
+    sub.add_argument("--catalog", action="append", default=[], help="TLE or OMM (XML/KVN/JSON) catalog file")
+    sub.add_argument("--epoch", default=DEFAULT_EPOCH, help="Start epoch (UTC, ISO format)")
+    sub.add_argument("--span", default="1d", help="Time span: seconds or with unit s/m/h/d/rev")
+    sub.add_argument("--step", default="5m", help="Time step: seconds or with unit s/m/h/d/rev")
+    sub.add_argument("--resolution", type=float, default=2.0, help="Grid step in degrees")
+    sub.add_argument("--mask", type=float, default=10.0, help="Elevation mask in degrees")
+    sub.add_argument("--min-satellites", type=int, default=1, help="Satellites needed for a point to count as covered")
+    sub.add_argument("--j2", action="store_true", help="Include J2 secular perturbations (node/perigee drift)")
+    sub.add_argument("--field", nargs="+", choices=FIELDS, default=["mean"], dest="fields", help="Heatmaps to render")
+    sub.add_argument("--format", nargs="+", choices=["png", "npz"], default=["png"], dest="formats")
+    sub.add_argument("--output", default=".", help="Output directory")
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.command == "list":
+        for name, satellites in SATELLITES.items():
+            print(f"{name}: {', '.join(s.satellite_name for s in satellites)}")
+        return 0
+    if args.command == "passes":
+        return run_passes(args)
+    if args.command == "coverage":
+        return run_coverage(args)
+    if args.command == "conjunctions":
+        return run_conjunctions(args)
+    if args.command == "links":
+        return run_links(args)
+
+    systems = load_systems(args.systems, args.config, args.catalog)
+    if not systems:
+        raise SystemExit("no systems given")
+    os.makedirs(args.output, exist_ok=True)
+    render_workers = args.render_workers or max(1, default_workers() // max(1, args.jobs))
+    jobs = [dict(name=name, satellites=satellites, epoch=args.epoch, span=args.span, step=args.step,
+                 formats=args.formats, output=args.output, max_points=args.max_points,
+                 frames=args.frames, fps=args.fps, j2=args.j2, tolerance=args.tolerance,
+                 render_workers=render_workers)
+            for name, satellites in systems]
+
+    start = time.perf_counter()
+    if args.jobs > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+            results = executor.map(run_job, jobs)
+            for name, elapsed, outputs in results:
+                print(f"{name:<12} {elapsed:8.2f} s  {', '.join(outputs)}", flush=True)
+    else:
+        for job in jobs:
+            name, elapsed, outputs = run_job(job)
+            print(f"{name:<12} {elapsed:8.2f} s  {', '.join(outputs)}", flush=True)
+    print(f"{'total':<12} {time.perf_counter() - start:8.2f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+import threading  # Фоновый поток для расчёта трасс
+from typing import List, Optional
+
+import numpy as np  # Импортируем библиотеку NumPy для работы с массивами
+
+from cache import TrackCache, track_key
+from constants import SatelliteConfig
+from crosslinks import LinkGraph, line_of_sight_graph
+from parallel import propagate_elements_parallel
+from sidereal import julian_date
+from symmetry import symmetry_groups
+from utilities import period_time_steps, satellite_slots
+
+
+def slot_groups(slots: dict, jd: float, time_steps) -> List[np.ndarray]:
+    """Номера слотов по группам симметрии (см. symmetry_groups), затем остальные слоты по плоскостям."""
+    groups = [group.members for group in symmetry_groups(slots, jd, time_steps)]
+    direct = np.ones(len(slots["semi_major_axis"]), dtype=bool)
+    for members in groups:
+        direct[members] = False
+    nodes = slots["longitude_of_ascending_node"]
+    for node in np.unique(nodes[direct]):
+        groups.append(np.flatnonzero(direct & (nodes == node)))
+    return groups
+
+
+class TrackJob(threading.Thread):
+    """Фоновый расчёт трасс системы по группам слотов.
+
+    Каждая группа симметрии (а слоты вне групп - по плоскостям) считается целиком по всей
+    временной сетке через propagate_elements_parallel, поэтому большие группы уходят в пул
+    процессов, а прогресс обновляется после каждой группы. Результаты пишутся в заранее выделенные массивы longitudes/latitudes (по одному
+    на конфигурацию, форма (n_slots, n_steps)); ещё не рассчитанные точки равны NaN,
+    поэтому главный поток может рисовать частичные трассы, пока расчёт продолжается.
+    """
+
+    def __init__(self, satellites: List[SatelliteConfig], date, dt: float,
+                 cache: Optional[TrackCache] = None, workers: Optional[int] = None):
+        super().__init__(daemon=True)
+        self.satellites = satellites  # Конфигурации спутниковой системы
+        self.date = date  # Начальная дата (объект Time из Astropy)
+        self.cache = cache  # Кэш трасс (None - без кэша)
+        self.workers = workers  # Число процессов пула (None - default_workers(), 1 - без пула)
+        self.time_steps = [period_time_steps(s.T, dt) for s in satellites]  # Своя временная сетка у каждой конфигурации
+        self.longitudes = []  # Массивы долгот по конфигурациям
+        self.latitudes = []  # Массивы широт по конфигурациям
+        for s, steps in zip(satellites, self.time_steps):
+            n_slots = len(s.longitude_of_ascending_node) * len(s.argument_pericenter)
+            self.longitudes.append(np.full((n_slots, steps.size), np.nan))
+            self.latitudes.append(np.full((n_slots, steps.size), np.nan))
+        self.total_points = sum(lons.size for lons in self.longitudes)  # Всего точек трасс по всем конфигурациям
+        self.done_points = 0  # Уже рассчитано точек
+        self.version = 0  # Увеличивается после каждой записанной группы
+        self.error = None  # Исключение, прервавшее расчёт
+        self._cancelled = threading.Event()
+
+    @property
+    def progress(self) -> float:
+        """Доля выполненной работы от 0 до 1."""
+        return self.done_points / self.total_points if self.total_points else 1.0
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        """Просит поток остановиться после текущей группы."""
+        self._cancelled.set()
+
+    def run(self):
+        try:
+            for index, (s, steps) in enumerate(zip(self.satellites, self.time_steps)):
+                if not self._compute_object(index, s, steps):
+                    return
+        except Exception as error:  # Ошибку показывает главный поток
+            self.error = error
+
+    def _compute_object(self, index, satellite, steps) -> bool:
+        jd = julian_date(self.date)
+        key = track_key([satellite], jd, steps)
+        cached = self.cache.get(key) if self.cache is not None else None
+        if cached is not None:
+            self.longitudes[index][:], self.latitudes[index][:] = cached
+            self._advance(self.longitudes[index].size)
+            return True
+        slots = satellite_slots([satellite])
+        for rows in slot_groups(slots, jd, steps):
+            if self._cancelled.is_set():
+                return False
+            elements = {name: values[rows] for name, values in slots.items()}
+            lons, lats = propagate_elements_parallel(elements, jd, steps, workers=self.workers)
+            self.longitudes[index][rows] = lons
+            self.latitudes[index][rows] = lats
+            self._advance(rows.size * steps.size)
+        if self.cache is not None:
+            self.cache.put(key, self.longitudes[index], self.latitudes[index])
+        return True
+
+    def _advance(self, points):
+        self.done_points += points
+        self.version += 1
+
+
+class LinkJob(threading.Thread):
+    """Фоновое построение графа прямой видимости (см. line_of_sight_graph).
+
+    Расчёт занимает O(N²·T), поэтому выполняется вне главного потока; после завершения
+    граф доступен в graph, а исключение, если оно было, - в error.
+    """
+
+    def __init__(self, elements: dict, jd: float, time_steps):
+        super().__init__(daemon=True)
+        self.elements = elements  # Орбитальные элементы по слотам
+        self.jd = jd  # Начальная дата (юлианская дата)
+        self.time_steps = time_steps  # Моменты времени от начальной даты (в секундах)
+        self.graph: Optional[LinkGraph] = None  # Построенный граф
+        self.error = None  # Исключение, прервавшее расчёт
+
+    def run(self):
+        try:
+            self.graph = line_of_sight_graph(self.elements, self.jd, self.time_steps)
+        except Exception as error:  # Ошибку показывает главный поток
+            self.error = error
@@ -1,15 +1,46 @@
 import tkinter as tk  # Импортируем модуль tkinter для создания графического интерфейса
 from tkinter import ttk  # Импортируем ttk для использования стилизованных виджетов
-import matplotlib.pyplot as plt  # Импортируем pyplot для построения графиков с matplotlib
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg  # Импортируем класс для встраивания matplotlib графиков в Tkinter
-import matplotlib.cm as cm  # Импортируем модуль colormap для работы с цветовыми схемами
-import numpy as np  # Импортируем библиотеку NumPy для работы с массивами и математическими функциями
-from astropy.time import Time  # Импортируем класс Time для работы с астрономическим временем
+import importlib  # Импортируем importlib для фоновой загрузки тяжёлых модулей
+import os  # Импортируем os для чтения переменных окружения
+import threading  # Импортируем threading для фонового прогрева импортов
 from datetime import datetime, timedelta  # Импортируем datetime и timedelta для работы с датами и временем
-import matplotlib.animation as animation  # Импортируем модуль анимаций из matplotlib
 
 from constants import TIME_STEPS, SATELLITES  # Импортируем константы TIME_STEPS и SATELLITES из модуля constants
-from utilities import calculate_longitudes_latitudes  # Импортируем функцию вычисления долгот и широт из модуля utilities
+
+# Окну выбора системы нужны только Tk и constants. Модули ниже (NumPy, matplotlib, astropy и расчётные модули)
+# загружаются при первом нажатии "Go", а до этого - в фоновом потоке, пока пользователь выбирает систему
+HEAVY_MODULES = [
+    "numpy",
+    "astropy.time",
+    "utilities",
+    "cache",
+    "parallel",
+    "jobs",
+    "constellation",
+    "rendering",
+    "background",
+    "polylines",
+    "spatial",
+    "crosslinks",
+]
+# pyplot и backend TkAgg при инициализации обращаются к Tk, поэтому импортируются только в главном потоке
+GUI_MODULES = [
+    "matplotlib.pyplot",
+    "matplotlib.backends.backend_tkagg",
+]
+
+def warm_up_imports(names=HEAVY_MODULES):
+    """Заранее импортирует тяжёлые модули; ошибки не страшны - модуль будет импортирован при использовании."""
+    for name in names:
+        try:
+            importlib.import_module(name)
+        except Exception:
+            pass
+
+JOB_POLL_INTERVAL = 100  # Период опроса фонового расчёта (в миллисекундах)
+ANIMATION_INTERVAL = 500  # Интервал между кадрами анимации (в миллисекундах)
+HOVER_RADIUS = 8  # Радиус поиска отсчётов вокруг курсора (в пикселях)
+HOVER_LINES = 8  # Наибольшее число спутников в подсказке
 
 # Класс приложения для отображения следа спутника (Ground Track)
 class SatelliteGroundTrackApp:
@@ -61,11 +92,16 @@ class SatelliteGroundTrackApp:
         self.go_button = tk.Button(self.main_frame, text="Go", command=self.plot_orbit)  # Создаем кнопку, которая вызывает метод plot_orbit при нажатии
         self.go_button.grid(row=5, column=0, columnspan=2, pady=10)  # Размещаем кнопку, объединяя две колонки
 
+        self.track_cache = None  # Кэш трасс создаётся при первом построении (см. get_track_cache)
+
         # Инициализируем переменные для анимации и графических объектов
         self.current_frame = 0  # Номер текущего кадра анимации
-        self.ani = None  # Переменная для хранения объекта анимации
+        self.animator = None  # Переменная для хранения объекта анимации
         self.fig = None  # Переменная для фигуры matplotlib
         self.canvas = None  # Переменная для холста (canvas) в Tkinter
+        self.map_background = None  # Фон с картой текущего окна
+        self.tracks = None  # Трассы текущего окна карты (TrackCollection)
+        self.links = None  # Линии связи между спутниками (LinkLines); создаются при первом включении "Links"
 
     def display_satellite_info(self, event):
         """Отображает информацию о всех спутниках выбранной системы."""
@@ -83,8 +119,31 @@ class SatelliteGroundTrackApp:
             self.info_text.insert(tk.END, info)  # Вставляем информацию о спутнике
             self.info_text.config(state='disabled')  # Делам текстовое поле только для чтения
 
+    def get_track_cache(self):
+        """Возвращает кэш трасс, создавая его при первом обращении."""
+        if self.track_cache is None:
+            from cache import TrackCache  # Импортируем кэш рассчитанных трасс
+            # Кэш трасс: повторное нажатие "Go" с теми же параметрами не пересчитывает трассы.
+            # Дисковый уровень включается переменной окружения GROUNDTRACK_CACHE_DIR.
+            self.track_cache = TrackCache(directory=os.environ.get("GROUNDTRACK_CACHE_DIR"))
+        return self.track_cache
+
     def plot_orbit(self):
         """Открывает новое окно с анимацией следа спутника на Земле, сгруппированного по плоскостям орбиты (Ω)."""
+        # Тяжёлые модули импортируются здесь, а не при запуске программы
+        import numpy as np  # Импортируем библиотеку NumPy для работы с массивами и математическими функциями
+        import matplotlib.pyplot as plt  # Импортируем pyplot для построения графиков с matplotlib
+        import matplotlib.cm as cm  # Импортируем модуль colormap для работы с цветовыми схемами
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg  # Импортируем класс для встраивания matplotlib графиков в Tkinter
+        from astropy.time import Time  # Импортируем класс Time для работы с астрономическим временем
+        from utilities import period_time_steps  # Импортируем функцию построения временной сетки из модуля utilities
+        from jobs import LinkJob, TrackJob  # Импортируем фоновые расчёты трасс и графа прямой видимости
+        from constellation import ConstellationTable  # Импортируем таблицу спутников группировки
+        from background import MapBackground  # Импортируем фон с картой мира
+        from rendering import LinkLines, TrackCollection  # Импортируем коллекцию трасс и линии связи
+        from spatial import TrackIndex  # Импортируем пространственный индекс отсчётов трасс
+        from constants import R  # Радиус Земли для перевода радиуса поиска в километры
+
         sat_key = self.sat_var.get()  # Получаем выбранную систему спутников
         dt = self.time_var.get()  # Получаем выбранный временной шаг
         if sat_key not in SATELLITES or dt == 0:  # Если система не выбрана или временной шаг равен 0, выходим из функции
@@ -99,11 +158,8 @@ class SatelliteGroundTrackApp:
         map_window.geometry("1680x1050")  # Задаем размеры нового окна
 
         self.fig, ax = plt.subplots(figsize=(10, 6))  # Создаем фигуру и ось для графика с заданным размером
-        try:
-            img = plt.imread("Word300dpi.jpg")  # Пытаемся загрузить изображение для фона
-        except Exception:
-            img = np.ones((600, 1200, 3))  # Если загрузка не удалась, создаем белое изображение
-        ax.imshow(img, extent=[-180, 180, -90, 90])  # Отображаем изображение, задавая диапазон координат (долгота и широта)
+        # Фон с картой: изображение декодируется один раз за процесс, уровень детализации подбирается под размер холста
+        self.map_background = MapBackground(ax)
         ax.set_xlabel("Longitude")  # Устанавливаем подпись оси X
         ax.set_ylabel("Latitude")  # Устанавливаем подпись оси Y
         ax.set_title(f"{sat_key} Ground Track")  # Устанавливаем заголовок графика
@@ -112,37 +168,33 @@ class SatelliteGroundTrackApp:
         date = Time("2025-02-27 00:00:00", format="iso", scale="utc")  # Создаем объект времени Astropy
 
         T_common = sats[0].T  # Получаем период орбиты первого спутника
-        time_steps = np.linspace(0, T_common, int(T_common / (dt * T_common)) + 1)  # Генерируем равномерные временные шаги от 0 до T
+        time_steps = period_time_steps(T_common, dt)  # Генерируем равномерные временные шаги от 0 до T
         all_datetimes = [reference_datetime + timedelta(seconds=t) for t in time_steps]  # Формируем список дат для каждого временного шага
 
         # Вычисляем следы спутников: долготы и широты
         all_longitudes = []  # Список для хранения долгот траекторий
         all_latitudes = []  # Список для хранения широт траекторий
-        sat_labels = []  # Список меток для каждого подспутника
-        plane_indices = []  # Список индексов плоскостей для каждого подспутника
 
+        # Таблица спутников: одна строка на слот с номерами системы и плоскости
+        table = ConstellationTable.from_configs(sats)
+        sat_labels = table.labels  # Метки для каждого подспутника
         plane_columns = []  # Список для хранения информации о плоскостях орбиты
-        for obj_idx, s in enumerate(sats):  # Перебираем спутники с индексами
-            num_planes = len(s.longitude_of_ascending_node) or 1  # Определяем число плоскостей (если отсутствуют, считаем 1)
-            for p_idx in range(num_planes):  # Перебираем плоскости
-                plane_omega = s.longitude_of_ascending_node[p_idx] if p_idx < len(s.longitude_of_ascending_node) else "?"  # Получаем значение Ω для плоскости
-                plane_label = f"Plane {p_idx+1}: (Ω = {plane_omega}°)"  # Формируем метку для плоскости
-                plane_columns.append((obj_idx, p_idx, plane_label))  # Сохраняем информацию о плоскости
-
-        for obj_idx, s in enumerate(sats):  # Для каждого спутника
-            lons, lats = calculate_longitudes_latitudes(satellite=s, date=date, dt=dt)  # Вычисляем траектории (долготы и широты)
-            num_planes = len(s.longitude_of_ascending_node) or 1  # Число плоскостей
-            num_args = len(s.argument_pericenter) or 1  # Число значений аргумента перицентра
-            for sub_idx in range(len(lons)):  # Перебираем каждую траекторию
-                plane_idx = sub_idx // num_args  # Определяем индекс плоскости для данной траектории
-                all_longitudes.append(lons[sub_idx])  # Сохраняем долготу
-                all_latitudes.append(lats[sub_idx])  # Сохраняем широту
-                sat_labels.append(f"{s.satellite_name} {sub_idx+1}")  # Формируем метку для спутника с номером траектории
-                plane_indices.append((obj_idx, plane_idx))  # Сохраняем индексы спутника и плоскости
+        plane_subsat_indices = []  # Индексы подспутников по каждой плоскости
+        for (obj_idx, p_idx), members in table.plane_groups():
+            plane_omega = sats[obj_idx].longitude_of_ascending_node[p_idx]  # Значение Ω для плоскости
+            plane_columns.append((obj_idx, p_idx, f"Plane {p_idx+1}: (Ω = {plane_omega}°)"))  # Сохраняем информацию о плоскости
+            plane_subsat_indices.append(members.tolist())
+
+        # Трассы считаются в фоновом потоке; массивы заполнены NaN и дописываются по мере расчёта.
+        # При промахе кэша группы симметрии от MIN_PARALLEL_POINTS точек считаются в пуле процессов (GROUNDTRACK_WORKERS)
+        job = TrackJob(sats, date, dt, cache=self.get_track_cache())
+        for lons, lats in zip(job.longitudes, job.latitudes):  # Строки массивов идут в том же порядке, что и в таблице
+            all_longitudes.extend(lons)  # Массивы траекторий, которые заполняет фоновый поток
+            all_latitudes.extend(lats)
 
         total_sub_sats = len(all_longitudes)  # Определяем общее количество подспутников (траекторий)
 
-        # Подготавливаем scatter-графики для отображения точек на графике
+        # Объекты для легенды; сами трассы рисует одна коллекция TrackCollection
         scatters = []  # Список для хранения объектов scatter
         colors = cm.plasma(np.linspace(0, 1, total_sub_sats))  # Генерируем цвета для каждого подспутника из цветовой схемы plasma
         for i in range(total_sub_sats):
@@ -162,6 +214,8 @@ class SatelliteGroundTrackApp:
 
         # Настройки для управления сеткой и анимацией
         animation_on_var = tk.BooleanVar(value=True)  # Булевая переменная для включения/выключения анимации (по умолчанию True)
+        lines_on_var = tk.BooleanVar(value=False)  # Режим отображения трасс линиями вместо точек
+        links_on_var = tk.BooleanVar(value=False)  # Линии прямой видимости между спутниками
         grid_step_var = tk.IntVar(value=30)  # Переменная для выбора шага сетки (по умолчанию 30°)
         grid_on = True  # Флаг отображения сетки
         grid_lines = []  # Список для хранения линий сетки
@@ -210,24 +264,18 @@ class SatelliteGroundTrackApp:
         # Создаем флажки для выбора отображения каждого подспутника
         check_vars = [tk.BooleanVar(value=True) for _ in range(total_sub_sats)]  # Список булевых переменных для каждого подспутника (по умолчанию включены)
         select_all_plane_vars = [tk.BooleanVar(value=True) for _ in plane_columns]  # Булевые переменные для выбора всех подспутников в каждой плоскости
-        plane_subsat_indices = [[] for _ in plane_columns]  # Список для хранения индексов подспутников по каждой плоскости
-
-        # Строим словарь для сопоставления плоскости с её индексом
-        plane_lookup = {}  # Инициализируем пустой словарь
-        for plane_idx, (o_i, p_i, plane_lbl) in enumerate(plane_columns):  # Перебираем плоскости с индексами
-            plane_lookup[(o_i, p_i)] = plane_idx  # Сохраняем индекс для ключа (индекс спутника, индекс плоскости)
 
-        for i in range(total_sub_sats):  # Для каждого подспутника
-            obj_i, p_i = plane_indices[i]  # Получаем индексы спутника и плоскости
-            plane_idx = plane_lookup[(obj_i, p_i)]  # Определяем индекс плоскости из словаря
-            plane_subsat_indices[plane_idx].append(i)  # Добавляем индекс подспутника в соответствующую группу
-
-        # Функция для перерисовки графика после изменения состояния флажков
+        # Функция для перерисовки графика после изменения состояния флажков: меняется только маска
+        # видимости коллекции трасс, а карта и сетка берутся из кэшированного фона
         def draw_after_toggling():
-            if animation_on_var.get():  # Если анимация включена
-                draw_current_frame()  # Рисуем текущий кадр анимации
-            else:
-                draw_static_plot()  # Рисуем статичный график
+            if self.animator is not None and self.animator.running:
+                self.animator.set_visible([v.get() for v in check_vars])  # Во время воспроизведения только меняем маску видимости
+                return
+            self.tracks.set_visible([v.get() for v in check_vars])
+            self.tracks.set_frame(self.current_frame if animation_on_var.get() else None)
+            self.tracks.update_legend()
+            self.follow_links()
+            self.tracks.redraw()
 
         # Размещаем флажки для каждой плоскости в отдельных строках
         for row_i, (obj_i, p_i, plane_lbl) in enumerate(plane_columns):
@@ -283,18 +331,26 @@ class SatelliteGroundTrackApp:
         grid_step_dropdown.bind("<<ComboboxSelected>>", on_grid_step_changed)  # Привязываем событие выбора к функции изменения шага сетки
         animation_cb = tk.Checkbutton(control_frame, text="Animation", variable=animation_on_var)  # Создаем флажок для включения/выключения анимации
         animation_cb.grid(row=0, column=3, padx=5)  # Размещаем флажок
+        lines_cb = tk.Checkbutton(control_frame, text="Lines", variable=lines_on_var)  # Флажок отображения трасс линиями
+        lines_cb.grid(row=0, column=4, padx=5)  # Размещаем флажок
+        links_cb = tk.Checkbutton(control_frame, text="Links", variable=links_on_var)  # Флажок линий связи между спутниками
+        links_cb.grid(row=0, column=5, padx=5)  # Размещаем флажок
         stop_button = tk.Button(control_frame, text="Stop", command=self.stop_animation)  # Создаем кнопку для остановки анимации
-        stop_button.grid(row=0, column=4, padx=5)  # Размещаем кнопку
+        stop_button.grid(row=0, column=6, padx=5)  # Размещаем кнопку
         play_button = tk.Button(control_frame, text="Play",
                                 command=lambda: self.play_animation(all_datetimes, scatters, check_vars,
                                                                     all_longitudes, all_latitudes, datetime_text, ax))  # Создаем кнопку для запуска анимации
-        play_button.grid(row=0, column=5, padx=5)  # Размещаем кнопку
+        play_button.grid(row=0, column=7, padx=5)  # Размещаем кнопку
         reset_button = tk.Button(control_frame, text="Reset",
-                                 command=lambda: self.reset_animation(scatters, all_longitudes, all_latitudes,
-                                                                      check_vars, all_datetimes, datetime_text))  # Создаем кнопку для сброса анимации
-        reset_button.grid(row=0, column=6, padx=5)  # Размещаем кнопку
+                                 command=lambda: self.reset_animation(check_vars, all_datetimes, datetime_text))  # Создаем кнопку для сброса анимации
+        reset_button.grid(row=0, column=8, padx=5)  # Размещаем кнопку
         quit_button = tk.Button(control_frame, text="Quit", command=map_window.destroy)  # Создаем кнопку для закрытия окна карты
-        quit_button.grid(row=0, column=7, padx=5)  # Размещаем кнопку
+        quit_button.grid(row=0, column=9, padx=5)  # Размещаем кнопку
+        progress_bar = ttk.Progressbar(control_frame, length=200, maximum=1.0)  # Индикатор выполнения фонового расчёта
+        progress_bar.grid(row=0, column=10, padx=5)  # Размещаем индикатор
+        cancel_button = tk.Button(control_frame, text="Cancel", command=job.cancel)  # Кнопка отмены расчёта (рассчитанная часть остаётся на карте)
+        cancel_button.grid(row=0, column=11, padx=5)  # Размещаем кнопку
+        map_window.bind("<Destroy>", lambda event: job.cancel() if event.widget is map_window else None)  # При закрытии окна прекращаем расчёт
 
         # Функция, вызываемая при переключении состояния анимации
         def on_animation_toggled(*args):
@@ -312,66 +368,170 @@ class SatelliteGroundTrackApp:
                 draw_static_plot()  # Рисуем статичный график
         animation_on_var.trace_add("write", on_animation_toggled)  # Привязываем изменение состояния анимации к функции
 
-        # ----------------- Функции для отрисовки графика ----------------- #
-        def refresh_legend():
-            visible_scatters = [sc for sc in scatters if len(sc.get_xdata()) > 0]  # Находим scatter-объекты с данными
-            if visible_scatters:
-                ax.legend(handles=visible_scatters, loc='center left', bbox_to_anchor=(1, 0.5), fontsize='small')  # Обновляем легенду с видимыми объектами
-            else:
-                legend = ax.get_legend()  # Если объектов нет, получаем текущую легенду
-                if legend:
-                    legend.remove()  # Удаляем легенду
+        # Режим линий: трассы разбиваются на участки по антимеридиану внутри коллекции трасс
+        def on_lines_toggled(*args):
+            lines = lines_on_var.get()
+            self.tracks.set_lines(lines)
+            for sc in scatters:
+                sc.set_linestyle('-' if lines else 'None')  # Линия вместо маркеров (в легенде)
+                sc.set_marker('None' if lines else 'o')
+            if self.animator is not None and self.animator.running:
+                return  # Во время воспроизведения точки рисует аниматор
+            self.tracks.update_legend()
+            self.tracks.redraw()
+        lines_on_var.trace_add("write", on_lines_toggled)  # Привязываем переключение режима линий к функции
+
+        # Линии связи: граф прямой видимости строится в фоновом потоке при первом включении на сетке
+        # времени первой конфигурации (по ней идёт метка времени) и хранит свои подспутниковые точки
+        links_job = None  # Фоновое построение графа (LinkJob)
+        def on_links_toggled(*args):
+            nonlocal links_job
+            if self.links is None:
+                if links_job is None:
+                    from sidereal import julian_date
+                    links_job = LinkJob(table.elements(), julian_date(date), time_steps)
+                    links_job.start()
+                    poll_links()
+                return  # Линии появятся, когда граф будет построен (см. poll_links)
+            self.links.enabled = links_on_var.get()
+            if self.animator is not None and self.animator.running:
+                return  # Во время воспроизведения линии рисует аниматор
+            self.follow_links()
+            self.tracks.redraw()
+        links_on_var.trace_add("write", on_links_toggled)  # Привязываем переключение линий связи к функции
+
+        # Опрос построения графа: окно не блокируется, линии добавляются после завершения
+        def poll_links():
+            nonlocal links_job
+            if not map_window.winfo_exists():
+                return
+            if links_job.is_alive():
+                map_window.after(JOB_POLL_INTERVAL, poll_links)  # Продолжаем опрос
+                return
+            if links_job.error is not None:
+                datetime_text.set_text(f"Error: {links_job.error}")  # Сообщаем об ошибке на карте
+                links_job = None  # Повторное включение "Links" запустит построение заново
+                self.canvas.draw()
+                return
+            self.links = LinkLines(ax, links_job.graph)
+            self.tracks.overlays.extend(self.links.artists)
+            on_links_toggled()  # Показываем линии, если флажок всё ещё включён
 
+        # ----------------- Функции для отрисовки графика ----------------- #
         def draw_static_plot():
-            for i in range(total_sub_sats):
-                if check_vars[i].get():
-                    scatters[i].set_data(all_longitudes[i], all_latitudes[i])  # Если флажок включен, отображаем полную траекторию
-                else:
-                    scatters[i].set_data([], [])  # Иначе очищаем данные
-            refresh_legend()  # Обновляем легенду
+            self.tracks.set_visible([v.get() for v in check_vars])
+            self.tracks.set_frame(None)  # Полные траектории
+            self.tracks.update_legend()  # Обновляем легенду
+            self.follow_links()  # Линии связи в последний момент
             datetime_text.set_text(f"Time: {all_datetimes[-1].strftime('%Y-%m-%d %H:%M:%S')}")  # Отображаем последнее время из списка
             self.canvas.draw()  # Обновляем канву
 
         def draw_current_frame():
-            self.update_frame(self.current_frame, all_datetimes, scatters, check_vars,
-                              all_longitudes, all_latitudes, datetime_text, ax)  # Обновляем данные для текущего кадра
+            if self.animator is not None and self.animator.running:
+                self.animator.set_visible([v.get() for v in check_vars])  # Во время воспроизведения только меняем маску видимости
+                return
+            self.update_frame(self.current_frame, all_datetimes, check_vars, datetime_text)  # Обновляем данные для текущего кадра
             self.canvas.draw()  # Рисуем канву
 
-        # Инициализируем scatter-объекты данными для первого кадра
-        for i in range(total_sub_sats):
-            if check_vars[i].get() and len(all_longitudes[i]) > 0:
-                scatters[i].set_data([all_longitudes[i][0]], [all_latitudes[i][0]])  # Устанавливаем первую точку траектории
-            else:
-                scatters[i].set_data([], [])
         datetime_text.set_text(f"Time: {reference_datetime.strftime('%Y-%m-%d %H:%M:%S')}")  # Отображаем начальное время
 
+        self.links = None  # Линии связи предыдущего окна относятся к другой фигуре
         self.canvas = FigureCanvasTkAgg(self.fig, master=map_window)  # Встраиваем фигуру matplotlib в окно карты
         self.canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)  # Размещаем виджет канвы в верхней части окна
-        refresh_legend()  # Обновляем легенду
+        # Все трассы в одном массиве: флажки меняют только маску видимости, карта берётся из кэшированного фона
+        self.tracks = TrackCollection(ax, all_longitudes, all_latitudes, colors, legend_handles=scatters)
+        self.tracks.set_frame(1)  # Первая точка каждой траектории
+        self.tracks.update_legend()  # Обновляем легенду
         self.canvas.draw()  # Рисуем канву
 
+        # Подсказка при наведении: спутники, проходившие рядом с курсором, и время прохождения.
+        # Индекс строится по уже рассчитанным точкам и перестраивается, когда фоновый расчёт добавил новые
+        hover_text = ax.annotate("", xy=(0, 0), xytext=(12, 12), textcoords="offset points", fontsize=8,
+                                 bbox=dict(boxstyle="round", facecolor="white", alpha=0.85), zorder=5, visible=False)
+        track_index = None  # Индекс отсчётов трасс
+        index_version = None  # Версия данных фонового расчёта, для которой построен индекс
+        def on_hover(event):
+            nonlocal track_index, index_version
+            if self.animator is not None and self.animator.running:
+                return  # Во время воспроизведения кадры рисует аниматор
+            if event.inaxes is not ax or event.xdata is None:
+                if hover_text.get_visible():
+                    hover_text.set_visible(False)
+                    self.canvas.draw_idle()
+                return
+            if index_version != job.version:
+                track_index = TrackIndex(all_longitudes, all_latitudes)
+                index_version = job.version
+            x0 = ax.transData.inverted().transform((event.x, event.y))[0]
+            x1 = ax.transData.inverted().transform((event.x + HOVER_RADIUS, event.y))[0]
+            radius = np.radians(abs(x1 - x0)) * R  # HOVER_RADIUS пикселей в километрах по экватору
+            sats_near, steps_near, _ = track_index.nearest_per_satellite(event.xdata, event.ydata, radius)
+            lines = []
+            for i, k in zip(sats_near, steps_near):
+                # Только точки, которые сейчас нарисованы на карте
+                if not check_vars[i].get() or (animation_on_var.get() and k >= self.current_frame):
+                    continue
+                moment = all_datetimes[k].strftime('%Y-%m-%d %H:%M:%S') if k < len(all_datetimes) else ""
+                lines.append(f"{sat_labels[i]}  {moment}")
+            if not lines:
+                if hover_text.get_visible():
+                    hover_text.set_visible(False)
+                    self.canvas.draw_idle()
+                return
+            if len(lines) > HOVER_LINES:
+                lines = lines[:HOVER_LINES] + [f"... +{len(lines) - HOVER_LINES}"]
+            hover_text.xy = (event.xdata, event.ydata)
+            hover_text.set_text("\n".join(lines))
+            hover_text.set_visible(True)
+            self.canvas.draw_idle()
+        self.canvas.mpl_connect("motion_notify_event", on_hover)  # Привязываем подсказку к движению мыши
+
         if not animation_on_var.get():
             on_animation_toggled()  # Если анимация выключена, переключаем режим отображения
 
+        # Опрос фонового расчёта: перерисовываем карту по мере поступления новых блоков
+        drawn_version = 0  # Версия данных, уже показанная на карте
+        def poll_job():
+            nonlocal drawn_version
+            if not map_window.winfo_exists():
+                return
+            progress_bar["value"] = job.progress  # Обновляем индикатор выполнения
+            if job.version != drawn_version:
+                drawn_version = job.version
+                self.tracks.set_data(all_longitudes, all_latitudes)  # Копируем новые блоки в общий массив трасс
+                draw_after_toggling()  # Показываем уже рассчитанные части трасс
+            if job.is_alive():
+                map_window.after(JOB_POLL_INTERVAL, poll_job)  # Продолжаем опрос
+                return
+            progress_bar.grid_remove()  # Расчёт завершён или отменён - скрываем индикатор и кнопку отмены
+            cancel_button.grid_remove()
+            if job.error is not None:
+                datetime_text.set_text(f"Error: {job.error}")  # Сообщаем об ошибке расчёта на карте
+                self.canvas.draw()
+        job.start()  # Запускаем расчёт только после того, как окно полностью построено
+        poll_job()
+
     # ------------------ Вспомогательные функции для анимации ------------------ #
-    def update_frame(self, frame, all_datetimes, scatters, check_vars,
-                     all_longitudes, all_latitudes, datetime_text, ax):
+    def follow_links(self):
+        """Приводит линии связи к текущему кадру и маске видимости трасс."""
+        if self.links is not None:
+            self.links.follow(self.tracks)
+
+    def link_overlay(self, frame):
+        """Линии связи для кадра аниматора (frame=None - убрать их перед полной перерисовкой)."""
+        if self.links is None:
+            return ()
+        if frame is None:
+            self.links.clear()
+            return ()
+        return self.links.set_frame(frame, self.animator.visible)
+
+    def update_frame(self, frame, all_datetimes, check_vars, datetime_text):
         self.current_frame = frame  # Обновляем текущий кадр
-        for i, sc in enumerate(scatters):  # Для каждого scatter-объекта
-            if check_vars[i].get():  # Если флажок для данного подспутника включен
-                if frame < len(all_longitudes[i]):
-                    sc.set_data(all_longitudes[i][:frame], all_latitudes[i][:frame])  # Отображаем данные до текущего кадра
-                else:
-                    sc.set_data([], [])  # Если кадр превышает длину данных, очищаем scatter
-            else:
-                sc.set_data([], [])
-        visible_scatters = [sc for sc in scatters if len(sc.get_xdata()) > 0]  # Находим scatter-объекты с данными
-        if visible_scatters:
-            ax.legend(handles=visible_scatters, loc='center left', bbox_to_anchor=(1, 0.5), fontsize='small')  # Обновляем легенду
-        else:
-            legend = ax.get_legend()
-            if legend:
-                legend.remove()  # Удаляем легенду, если данных нет
+        self.tracks.set_visible([v.get() for v in check_vars])
+        self.tracks.set_frame(frame)  # Отображаем данные до текущего кадра
+        self.tracks.update_legend()  # Обновляем легенду
+        self.follow_links()  # Линии связи в текущий момент
         if frame < len(all_datetimes):
             datetime_text.set_text(f"Time: {all_datetimes[frame].strftime('%Y-%m-%d %H:%M:%S')}")  # Обновляем текст временной метки
         else:
@@ -379,39 +539,55 @@ class SatelliteGroundTrackApp:
 
     def play_animation(self, all_datetimes, scatters, check_vars,
                        all_longitudes, all_latitudes, datetime_text, ax):
-        # Создаем новую анимацию, чтобы избежать использования устаревшего event_source
-        self.ani = animation.FuncAnimation(
-            self.fig,  # Фигура для анимации
-            lambda f: self.update_frame(f, all_datetimes, scatters, check_vars,
-                                          all_longitudes, all_latitudes, datetime_text, ax),  # Функция обновления кадра
-            frames=len(all_datetimes),  # Количество кадров равно числу временных меток
-            interval=500,  # Интервал между кадрами (в миллисекундах)
-            blit=False,  # Не используем blit для перерисовки
-            repeat=False  # Анимация не повторяется после завершения
+        import numpy as np  # Импортируем библиотеку NumPy для работы с массивами
+        from rendering import BlitAnimator  # Импортируем аниматор с кэшированием фона
+        if self.animator is not None:
+            self.animator.remove()  # Убираем аниматор предыдущего запуска
+        start_frame = self.current_frame if self.current_frame < len(all_datetimes) - 1 else 0  # Продолжаем с текущего кадра или начинаем сначала
+
+        def on_stop():
+            # После остановки возвращаем обычные объекты графика к текущему кадру
+            self.update_frame(self.current_frame, all_datetimes, check_vars, datetime_text)
+            self.canvas.draw()
+
+        # Аниматор с кэшированием фона: на каждом кадре дорисовываются только новые точки
+        self.animator = BlitAnimator(
+            self.fig, ax, all_longitudes, all_latitudes,
+            colors=[sc.get_color() for sc in scatters],  # Цвета спутников как у объектов легенды
+            legend_handles=scatters,
+            datetime_text=datetime_text,
+            time_label=lambda f: f"Time: {all_datetimes[f].strftime('%Y-%m-%d %H:%M:%S')}",
+            n_frames=len(all_datetimes),  # Количество кадров равно числу временных меток
+            fps=1000 / ANIMATION_INTERVAL,
+            on_frame=lambda f: setattr(self, "current_frame", f),  # Запоминаем текущий кадр
+            on_stop=on_stop,
+            overlay=self.link_overlay  # Линии связи текущего момента поверх кадра
         )
-        if self.ani.event_source is not None:
-            self.ani.event_source.start()  # Запускаем event_source анимации
-        self.canvas.draw()  # Обновляем канву
+        self.animator.visible = np.array([v.get() for v in check_vars])  # Начальная маска видимости
+        self.tracks.set_frame(0)  # Во время воспроизведения точки рисует аниматор
+        self.follow_links()  # Линии связи тоже рисует аниматор (см. link_overlay)
+        self.animator.start(start_frame)
 
     def stop_animation(self):
-        if self.ani is not None and hasattr(self.ani, 'event_source') and self.ani.event_source:
-            self.ani.event_source.stop()  # Останавливаем анимацию
-
-    def reset_animation(self, scatters, all_longitudes, all_latitudes, check_vars,
-                        all_datetimes, datetime_text):
-        if self.ani is not None:
-            self.ani.event_source.stop()  # Останавливаем текущую анимацию
-            self.ani.frame_seq = self.ani.new_frame_seq()  # Сбрасываем последовательность кадров
+        if self.animator is not None:
+            self.animator.stop()  # Останавливаем анимацию
+
+    def reset_animation(self, check_vars, all_datetimes, datetime_text):
+        if self.animator is not None:
+            self.animator.stop(notify=False)  # Останавливаем текущую анимацию
         self.current_frame = 0  # Сбрасываем текущий кадр
-        for i, sc in enumerate(scatters):
-            if check_vars[i].get() and len(all_longitudes[i]) > 0:
-                sc.set_data([all_longitudes[i][0]], [all_latitudes[i][0]])  # Устанавливаем начальные данные
-            else:
-                sc.set_data([], [])
+        self.tracks.set_visible([v.get() for v in check_vars])
+        self.tracks.set_frame(1)  # Устанавливаем начальные данные: первая точка каждой траектории
+        self.tracks.update_legend()
+        self.follow_links()
         datetime_text.set_text(f"Time: {all_datetimes[0].strftime('%Y-%m-%d %H:%M:%S')}")  # Обновляем временную метку
         self.canvas.draw()  # Обновляем канву
 
 if __name__ == "__main__":
     root = tk.Tk()  # Создаем корневое окно приложения
     app = SatelliteGroundTrackApp(root)  # Создаем экземпляр приложения, передавая корневое окно
+    # Прогреваем импорты после появления окна, чтобы не задерживать его первую отрисовку:
+    # модули без GUI - в фоновом потоке, pyplot и backend TkAgg - в главном потоке, когда Tk простаивает
+    root.after_idle(lambda: threading.Thread(target=warm_up_imports, daemon=True).start())
+    root.after_idle(lambda: warm_up_imports(GUI_MODULES))
     root.mainloop()  # Запускаем главный цикл обработки событий Tkinter
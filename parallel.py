@@ -0,0 +1,126 @@
+import atexit  # Завершение пула процессов при выходе из программы
+import multiprocessing  # Контекст запуска процессов
+import os  # Число доступных процессоров
+from concurrent.futures import ProcessPoolExecutor  # Пул процессов для параллельного расчёта
+from multiprocessing.shared_memory import SharedMemory  # Общая память для результатов без сериализации
+from typing import List, Optional
+
+import numpy as np  # Импортируем библиотеку NumPy для работы с массивами
+
+from constants import SatelliteConfig
+from sidereal import julian_date
+from symmetry import propagate_symmetric, symmetry_groups
+from utilities import satellite_slots
+
+MIN_PARALLEL_POINTS = 2_000_000  # Меньшие задачи считаются в текущем процессе: запуск пула дороже самого расчёта
+
+_executors = {}  # Пулы процессов, переиспользуемые между вызовами (число процессов -> пул)
+
+
+def default_workers() -> int:
+    """Число процессов по умолчанию: переменная GROUNDTRACK_WORKERS или число процессоров."""
+    return int(os.environ.get("GROUNDTRACK_WORKERS", 0)) or os.cpu_count() or 1
+
+
+def _get_executor(workers: int) -> ProcessPoolExecutor:
+    if workers not in _executors:
+        # spawn безопасен при запущенном Tk и одинаково работает на всех платформах
+        context = multiprocessing.get_context("spawn")
+        _executors[workers] = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+    return _executors[workers]
+
+
+@atexit.register
+def shutdown_executors():
+    """Останавливает все созданные пулы процессов."""
+    for executor in _executors.values():
+        executor.shutdown(cancel_futures=True)
+    _executors.clear()
+
+
+def _propagate_chunk(shm_name: str, shape: tuple, rows, elements: dict, jd: float, time_steps, geodetic: bool = False,
+                     j2: bool = False):
+    """Рассчитывает слоты rows (по группам симметрии) и пишет результат прямо в общую память."""
+    shm = SharedMemory(name=shm_name)
+    try:
+        out = np.ndarray(shape, dtype=float, buffer=shm.buf)
+        out[0, rows], out[1, rows] = propagate_symmetric(elements, jd, time_steps, geodetic=geodetic, j2=j2)
+        del out  # Буфер должен быть освобождён до закрытия общей памяти
+    finally:
+        shm.close()
+    return len(rows)
+
+
+def symmetric_order(elements: dict, jd: float, time_steps, j2: bool = False) -> np.ndarray:
+    """Слоты подряд по группам симметрии (см. symmetry_groups), затем слоты без группы.
+
+    Непрерывный участок такого порядка содержит целые группы или части одной группы, поэтому
+    процесс, получивший участок, рассчитывает по одной опорной орбите на группу, а не каждый слот.
+    """
+    n_sats = len(elements["semi_major_axis"])
+    grouped = [group.members for group in symmetry_groups(elements, jd, time_steps, j2)]
+    direct = np.ones(n_sats, dtype=bool)
+    for members in grouped:
+        direct[members] = False
+    return np.concatenate(grouped + [np.flatnonzero(direct)]).astype(np.int64)
+
+
+def propagate_elements_parallel(
+    elements: dict,  # Орбитальные элементы по слотам (как возвращает satellite_slots)
+    jd: float,  # Начальная дата (юлианская дата)
+    time_steps: np.ndarray,  # Моменты времени от начальной даты (в секундах)
+    workers: Optional[int] = None,  # Число процессов (None - default_workers(), 1 - последовательно)
+    chunk_size: Optional[int] = None,  # Число слотов в одной задаче
+    j2: bool = False,  # True - вековые возмущения J2
+    geodetic: bool = False  # True - геодезические широты WGS-84 вместо геоцентрических
+):
+    """Распределяет расчёт слотов по пулу процессов; результаты пишутся в общую память.
+
+    Слоты делятся между задачами в порядке групп симметрии (symmetric_order), и каждая задача
+    считает свои слоты через propagate_symmetric. Если задача мала, задан один процесс или пул
+    недоступен, расчёт идёт последовательно, тоже через propagate_symmetric.
+    """
+    time_steps = np.asarray(time_steps, dtype=float)
+    n_sats = len(elements["semi_major_axis"])
+    workers = workers or default_workers()
+    if workers <= 1 or n_sats < 2 or n_sats * time_steps.size < MIN_PARALLEL_POINTS:
+        return propagate_symmetric(elements, jd, time_steps, geodetic=geodetic, j2=j2)
+
+    # Несколько задач на процесс сглаживают неравномерную загрузку
+    chunk_size = chunk_size or max(1, -(-n_sats // (4 * workers)))
+    order = symmetric_order(elements, jd, time_steps, j2)
+    shape = (2, n_sats, time_steps.size)
+    shm = SharedMemory(create=True, size=int(np.prod(shape)) * np.dtype(float).itemsize)
+    try:
+        executor = _get_executor(workers)
+        futures = []
+        for start in range(0, n_sats, chunk_size):
+            rows = order[start:start + chunk_size]
+            chunk = {key: np.asarray(values)[rows] for key, values in elements.items()}
+            futures.append(executor.submit(_propagate_chunk, shm.name, shape, rows, chunk, jd, time_steps,
+                                           geodetic, j2))
+        for future in futures:
+            future.result()
+        result = np.ndarray(shape, dtype=float, buffer=shm.buf).copy()
+    except (OSError, RuntimeError):
+        # Пул процессов недоступен (ограничения окружения, упавший процесс) - считаем последовательно
+        broken = _executors.pop(workers, None)
+        if broken is not None:
+            broken.shutdown(wait=False, cancel_futures=True)
+        return propagate_symmetric(elements, jd, time_steps, geodetic=geodetic, j2=j2)
+    finally:
+        shm.close()
+        shm.unlink()
+    return result[0], result[1]
+
+
+def propagate_parallel(
+    satellites: List[SatelliteConfig],  # Конфигурации спутниковой системы
+    date,  # Начальная дата (объект Time из Astropy)
+    time_steps: np.ndarray,  # Моменты времени от начальной даты (в секундах)
+    workers: Optional[int] = None,  # Число процессов
+    j2: bool = False  # True - вековые возмущения J2
+):
+    """Параллельный аналог propagate_constellation с тем же форматом результата."""
+    return propagate_elements_parallel(satellite_slots(satellites), julian_date(date), time_steps,
+                                       workers=workers, j2=j2)
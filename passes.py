@@ -0,0 +1,242 @@
+from typing import List, Optional, Sequence
+
+import numpy as np  # Импортируем библиотеку NumPy для работы с массивами
+
+from constants import GM
+from transforms import geodetic_to_ecef
+from utilities import ecef_positions
+
+SCREEN_STEPS_PER_PERIOD = 120  # Шагов грубой сетки на виток самого быстрого спутника
+CHUNK_ELEMENTS = 4_000_000  # Наибольшее число значений (станция x спутник x момент) в одном блоке грубой сетки
+PEAK_MARGIN = 0.02  # Насколько (в синусе угла места) оценка вершины может не доходить до маски, чтобы её уточнить
+GOLDEN = (np.sqrt(5) - 1) / 2
+
+# Одна строка на пролёт; времена - секунды от начала интервала
+PASS_DTYPE = np.dtype([
+    ("station", np.int32),  # Номер станции (индекс в списке станций)
+    ("satellite", np.int32),  # Номер спутника (строка элементов)
+    ("aos", np.float64),  # Восход над маской; NaN - пролёт начался до начала интервала
+    ("culmination", np.float64),  # Момент наибольшего угла места
+    ("los", np.float64),  # Заход под маску; NaN - пролёт продолжается после конца интервала
+    ("max_elevation", np.float64),  # Наибольший угол места (в градусах)
+    ("duration", np.float64),  # Длительность пролёта (в секундах); NaN, если пролёт не целиком в интервале
+])
+
+
+class GroundStation:
+    def __init__(
+        self,
+        name: str,
+        latitude: float,  # Геодезическая широта (в градусах)
+        longitude: float,  # Долгота (в градусах)
+        altitude: float = 0.0,  # Высота над эллипсоидом WGS-84 (в км)
+        elevation_mask: float = 10.0  # Наименьший угол места, при котором спутник считается видимым (в градусах)
+    ):
+        self.name = name
+        self.latitude = latitude
+        self.longitude = longitude
+        self.altitude = altitude
+        self.elevation_mask = elevation_mask
+
+
+class _Geometry:
+    # Положения станций, локальные вертикали и маски, а также элементы спутников в виде массивов
+    def __init__(self, elements: dict, stations: Sequence[GroundStation], jd: float, j2: bool):
+        lat = np.array([s.latitude for s in stations], dtype=float)
+        lon = np.array([s.longitude for s in stations], dtype=float)
+        alt = np.array([s.altitude for s in stations], dtype=float)
+        self.position = np.stack(geodetic_to_ecef(lon, lat, alt))  # (3, n_stations)
+        lat, lon = np.radians(lat), np.radians(lon)
+        self.up = np.stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)])  # Нормаль к эллипсоиду
+        self.mask = np.sin(np.radians([s.elevation_mask for s in stations]))
+        self.elements = {key: np.asarray(value, dtype=float) for key, value in elements.items()}
+        self.jd, self.j2 = jd, j2
+
+    def _sine(self, r, station, shape):
+        # Синус угла места минус синус маски; station и shape задают, как станции совмещаются с r
+        position = [c[station].reshape(shape) for c in self.position]
+        up = [c[station].reshape(shape) for c in self.up]
+        d = [r[k] - position[k] for k in range(3)]
+        dot = d[0] * up[0] + d[1] * up[1] + d[2] * up[2]
+        return dot / np.sqrt(d[0] * d[0] + d[1] * d[1] + d[2] * d[2]) - self.mask[station].reshape(shape)
+
+    def grid(self, satellites: slice, t: np.ndarray) -> np.ndarray:
+        # Значения на сетке для всех станций: форма (n_stations, n_satellites, n_steps)
+        rows = {key: value[satellites, np.newaxis] for key, value in self.elements.items()}
+        r = ecef_positions(rows, self.jd, t, self.j2)
+        return self._sine(r, slice(None), (-1, 1, 1))
+
+    def pairs(self, station: np.ndarray, satellite: np.ndarray, t: np.ndarray) -> np.ndarray:
+        # То же для произвольных пар станция-спутник, каждая в свой момент времени
+        rows = {key: value[satellite] for key, value in self.elements.items()}
+        return self._sine(ecef_positions(rows, self.jd, t, self.j2), station, (-1,))
+
+
+def _bisect(f, lo, hi, rising, tolerance):
+    # Корень f на [lo, hi] для всех интервалов сразу; rising - f < 0 на lo и f > 0 на hi
+    width = float(np.max(hi - lo, initial=0.0))
+    for _ in range(int(np.ceil(np.log2(max(width / tolerance, 1.0))))):
+        mid = (lo + hi) / 2
+        below = f(mid) <= 0
+        move_lo = below == rising  # Корень правее середины
+        lo = np.where(move_lo, mid, lo)
+        hi = np.where(move_lo, hi, mid)
+    return (lo + hi) / 2
+
+
+def _golden_max(f, lo, hi, tolerance):
+    # Максимум f на [lo, hi] методом золотого сечения для всех интервалов сразу
+    a, b = lo.copy(), hi.copy()
+    c, d = b - GOLDEN * (b - a), a + GOLDEN * (b - a)
+    fc, fd = f(c), f(d)
+    while a.size and np.max(b - a) > tolerance:
+        left = fc > fd  # Максимум в [a, d]
+        a, b = np.where(left, a, c), np.where(left, d, b)
+        c_new = np.where(left, b - GOLDEN * (b - a), d)
+        d_new = np.where(left, c, a + GOLDEN * (b - a))
+        f_new = f(np.where(left, c_new, d_new))
+        fc, fd = np.where(left, f_new, fd), np.where(left, fc, f_new)
+        c, d = c_new, d_new
+    t = (a + b) / 2
+    return t, f(t)
+
+
+def _screen(f: np.ndarray):
+    """Кандидаты в пролёты на грубой сетке f (n_rows, n_steps).
+
+    Возвращает (строки, индекс вершины, начала, концы участков над маской); для вершин между
+    отсчётами, не поднявшихся над маской на сетке (короткие пролёты), начало и конец равны -1.
+    """
+    n_rows, n = f.shape
+    above = f > 0
+    padded = np.zeros((n_rows, n + 2), dtype=np.int8)
+    padded[:, 1:-1] = above
+    edges = np.diff(padded, axis=1)
+    run_rows, starts = np.nonzero(edges == 1)
+    _, ends = np.nonzero(edges == -1)  # В порядке строк, поэтому начала и концы участков совпадают попарно
+    ends -= 1
+
+    # Локальные максимумы сетки (на краях - по одному соседу)
+    maximum = np.ones((n_rows, n), dtype=bool)
+    maximum[:, 1:] = f[:, 1:] >= f[:, :-1]
+    maximum[:, :-1] &= f[:, :-1] > f[:, 1:]
+
+    # Вершина каждого участка - наибольший из его локальных максимумов
+    peak_rows, peak_steps = np.nonzero(maximum & above)
+    run = np.searchsorted(run_rows * n + starts, peak_rows * n + peak_steps, side="right") - 1
+    order = np.lexsort((f[peak_rows, peak_steps], run))
+    last = np.flatnonzero(np.diff(run[order], append=starts.size))  # Последний (наибольший) максимум каждого участка
+    peaks = peak_steps[order[last]]
+
+    # Локальные максимумы под маской: пролёт мог подняться над маской между отсчётами
+    maximum[:, [0, -1]] = False
+    near_rows, near_peaks = np.nonzero(maximum & ~above)
+    prev, inner, next_ = (f[near_rows, near_peaks + k] for k in (-1, 0, 1))
+    curvature = prev - 2 * inner + next_
+    with np.errstate(divide="ignore", invalid="ignore"):
+        vertex = inner - (next_ - prev)**2 / (8 * curvature)  # Вершина параболы через три отсчёта
+    near = (curvature < 0) & (vertex > -PEAK_MARGIN)
+    near_rows, near_peaks = near_rows[near], near_peaks[near]
+
+    none = np.full(near_rows.size, -1)
+    return (np.concatenate([run_rows, near_rows]), np.concatenate([peaks, near_peaks]),
+            np.concatenate([starts, none]), np.concatenate([ends, none]))
+
+
+def predict_passes(
+    elements: dict,  # Орбитальные элементы по слотам (как возвращает satellite_slots или ConstellationTable.elements)
+    stations: Sequence[GroundStation],  # Наземные станции
+    jd: float,  # Начальная дата (юлианская дата)
+    span: float,  # Длительность интервала (в секундах)
+    step: Optional[float] = None,  # Шаг грубой сетки (по умолчанию 1/120 витка самого быстрого спутника)
+    tolerance: float = 0.01,  # Точность моментов событий (в секундах)
+    j2: bool = False  # True - вековые возмущения J2
+) -> np.ndarray:
+    """Восход, кульминация и заход всех спутников над всеми станциями за интервал.
+
+    Угол места рассчитывается сразу для всех пар станция-спутник на грубой сетке (блоками по
+    спутникам). Точные моменты уточняются только около найденных событий: восход и заход -
+    делением пополам, кульминация - золотым сечением, одним векторизованным вызовом на итерацию
+    для всех пролётов. Возвращает структурированный массив PASS_DTYPE, упорядоченный по восходу.
+    """
+    n_sats = len(elements["semi_major_axis"])
+    if step is None:
+        shortest_period = 2 * np.pi * np.sqrt(np.min(np.asarray(elements["semi_major_axis"], dtype=float))**3 / GM)
+        step = shortest_period / SCREEN_STEPS_PER_PERIOD
+    t = np.linspace(0.0, span, int(np.ceil(span / step)) + 1)
+    n = t.size
+    geometry = _Geometry(elements, stations, jd, j2)
+    if n_sats == 0 or not len(stations):
+        return np.zeros(0, dtype=PASS_DTYPE)
+
+    # Грубая сетка блоками по спутникам
+    chunk = max(1, CHUNK_ELEMENTS // (len(stations) * n))
+    found = []
+    for first in range(0, n_sats, chunk):
+        count = min(chunk, n_sats - first)
+        f = geometry.grid(slice(first, first + count), t).reshape(-1, n)
+        rows, peaks, starts, ends = _screen(f)
+        found.append((rows // count, first + rows % count, peaks, starts, ends))
+    station, satellite, peaks, starts, ends = (np.concatenate(column) for column in zip(*found))
+
+    # Кульминация: максимум между соседними с вершиной отсчётами
+    f = lambda index: (lambda time: geometry.pairs(station[index], satellite[index], time))
+    everything = np.arange(station.size)
+    culmination, peak_value = _golden_max(f(everything), t[np.maximum(peaks - 1, 0)],
+                                          t[np.minimum(peaks + 1, n - 1)], tolerance)
+
+    # Короткие пролёты, найденные по вершине, остаются, только если поднялись над маской
+    short = starts < 0
+    keep = ~short | (peak_value > 0)
+    station, satellite, peaks, starts, ends = station[keep], satellite[keep], peaks[keep], starts[keep], ends[keep]
+    culmination, peak_value, short = culmination[keep], peak_value[keep], short[keep]
+    everything = np.arange(station.size)
+
+    aos = np.full(station.size, np.nan)
+    los = np.full(station.size, np.nan)
+    # Интервалы, содержащие восход и заход: между отсчётами вокруг границы участка или вокруг вершины
+    aos_lo = np.where(short, t[np.maximum(peaks - 1, 0)], t[np.maximum(starts - 1, 0)])
+    aos_hi = np.where(short, culmination, t[np.maximum(starts, 0)])
+    los_lo = np.where(short, culmination, t[np.maximum(ends, 0)])
+    los_hi = np.where(short, t[np.minimum(peaks + 1, n - 1)], t[np.minimum(ends + 1, n - 1)])
+    rising = short | (starts > 0)  # Участок, начавшийся в первом отсчёте, - пролёт до начала интервала
+    setting = short | (ends < n - 1)
+    index = everything[rising]
+    aos[index] = _bisect(f(index), aos_lo[index], aos_hi[index], True, tolerance)
+    index = everything[setting]
+    los[index] = _bisect(f(index), los_lo[index], los_hi[index], False, tolerance)
+
+    passes = np.zeros(station.size, dtype=PASS_DTYPE)
+    passes["station"], passes["satellite"] = station, satellite
+    passes["aos"], passes["culmination"], passes["los"] = aos, culmination, los
+    sin_max = peak_value + geometry.mask[station]
+    passes["max_elevation"] = np.degrees(np.arcsin(np.clip(sin_max, -1.0, 1.0)))
+    passes["duration"] = los - aos
+    return sort_passes(passes)
+
+
+def sort_passes(passes: np.ndarray, key: str = "aos", descending: bool = False) -> np.ndarray:
+    """Упорядочивает пролёты по полю PASS_DTYPE; при равенстве - по станции и спутнику.
+
+    Пролёты, начавшиеся до интервала (aos = NaN), идут первыми, незавершённые (los = NaN) - последними.
+    """
+    if key not in PASS_DTYPE.names:
+        raise ValueError(f"unknown pass field {key!r}; available: {', '.join(PASS_DTYPE.names)}")
+    values = passes[key].astype(float)
+    if key == "aos":
+        values = np.where(np.isnan(values), -np.inf, values)
+    values = np.where(np.isnan(values), np.inf, values)
+    order = np.lexsort((passes["satellite"], passes["station"], -values if descending else values))
+    return passes[order]
+
+
+def pass_rows(passes: np.ndarray, station_names: Sequence[str], satellite_labels: Sequence[str], epoch) -> List[tuple]:
+    """Строки таблицы событий: (станция, спутник, восход, кульминация, заход, угол места, длительность).
+
+    Моменты - объекты datetime (epoch - datetime начала интервала) или None для событий вне интервала.
+    """
+    from datetime import timedelta
+    moment = lambda seconds: None if np.isnan(seconds) else epoch + timedelta(seconds=float(seconds))
+    return [(station_names[p["station"]], satellite_labels[p["satellite"]], moment(p["aos"]),
+             moment(p["culmination"]), moment(p["los"]), float(p["max_elevation"]), float(p["duration"]))
+            for p in passes]
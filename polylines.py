@@ -0,0 +1,42 @@
+import numpy as np  # Импортируем библиотеку NumPy для работы с массивами
+
+
+def split_antimeridian(longitudes, latitudes, return_index: bool = False):
+    """Разбивает трассы на участки в местах перехода через ±180° для отрисовки линиями.
+
+    На каждом переходе вставляются три точки: край карты с интерполированной широтой, NaN
+    (разрыв линии) и противоположный край. Принимает массивы (n_steps,) или (n_sats, n_steps);
+    строки результата дополняются NaN до общей длины. При return_index=True также возвращается
+    позиция каждого исходного отсчёта в результате: префикс трассы до отсчёта k - это
+    out[..., :index[..., k] + 1].
+    """
+    lon = np.asarray(longitudes, dtype=float)
+    lat = np.asarray(latitudes, dtype=float)
+    one_dimensional = lon.ndim == 1
+    lon, lat = np.atleast_2d(lon), np.atleast_2d(lat)
+    n_rows, n = lon.shape
+
+    with np.errstate(invalid="ignore"):
+        cross = np.abs(np.diff(lon, axis=1)) > 180.0  # Ещё не рассчитанные точки (NaN) переходом не считаются
+    index = np.tile(np.arange(n), (n_rows, 1))
+    index[:, 1:] += 3 * np.cumsum(cross, axis=1)
+    width = n + 3 * int(cross.sum(axis=1).max(initial=0))
+
+    out_lon = np.full((n_rows, width), np.nan)
+    out_lat = np.full((n_rows, width), np.nan)
+    rows = np.arange(n_rows)[:, np.newaxis]
+    out_lon[rows, index] = lon
+    out_lat[rows, index] = lat
+
+    r, k = np.nonzero(cross)
+    a, b = lon[r, k], lon[r, k + 1]
+    edge = np.where(a > 0, 180.0, -180.0)  # Край карты, к которому уходит трасса
+    fraction = (edge - a) / (b + 2 * edge - a)  # Доля шага до края (b переносится на другую сторону края)
+    lat_edge = lat[r, k] + fraction * (lat[r, k + 1] - lat[r, k])
+    position = index[r, k]
+    out_lon[r, position + 1], out_lat[r, position + 1] = edge, lat_edge
+    out_lon[r, position + 3], out_lat[r, position + 3] = -edge, lat_edge
+
+    if one_dimensional:
+        out_lon, out_lat, index = out_lon[0], out_lat[0], index[0]
+    return (out_lon, out_lat, index) if return_index else (out_lon, out_lat)
@@ -0,0 +1,486 @@
+import time  # Отсчёт времени для поддержания заданной частоты кадров
+from typing import Callable, Optional, Sequence
+
+import numpy as np  # Импортируем библиотеку NumPy для работы с массивами
+from matplotlib import rcParams
+from matplotlib.artist import Artist
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgba_array  # Преобразование цветов в массив RGBA
+from matplotlib.markers import MarkerStyle
+from matplotlib.path import Path
+
+
+class BlitAnimator:
+    """Анимация трасс с кэшированием фона и инкрементальной дорисовкой.
+
+    Фон (карта, сетка, легенда и уже пройденные участки трасс) хранится как растровая
+    копия холста. На каждом кадре восстанавливается фон, одной коллекцией дорисовываются
+    только новые точки всех видимых спутников, после чего фон обновляется. Стоимость
+    кадра поэтому не растёт с номером кадра. Полная перерисовка выполняется только при
+    изменении видимости спутников, новых данных или шаге назад по кадрам.
+    """
+
+    def __init__(
+        self,
+        fig,  # Фигура matplotlib
+        ax,  # Ось с картой
+        longitudes: Sequence[np.ndarray],  # Долготы по спутникам
+        latitudes: Sequence[np.ndarray],  # Широты по спутникам
+        colors: Sequence,  # Цвета спутников
+        legend_handles: Sequence,  # Объекты для легенды (по одному на спутник)
+        datetime_text,  # Текстовая метка времени на фигуре
+        time_label: Callable[[int], str],  # Текст метки времени для номера кадра
+        n_frames: int,  # Число кадров
+        fps: float = 2.0,  # Целевая частота кадров
+        markersize: float = 4,  # Размер маркера (как у Line2D)
+        on_frame: Optional[Callable[[int], None]] = None,  # Вызывается после отрисовки каждого кадра
+        on_stop: Optional[Callable[[], None]] = None,  # Вызывается после остановки анимации
+        overlay: Optional[Callable[[Optional[int]], Sequence]] = None  # Объекты поверх кадра (см. draw_frame)
+    ):
+        self.fig = fig
+        self.ax = ax
+        self.canvas = fig.canvas
+        self.longitudes = longitudes
+        self.latitudes = latitudes
+        self.colors = to_rgba_array(colors)  # Цвета спутников в формате RGBA (n_sats, 4)
+        self.legend_handles = list(legend_handles)
+        self.datetime_text = datetime_text
+        self.time_label = time_label
+        self.n_frames = n_frames
+        self.fps = fps
+        self.on_frame = on_frame
+        self.on_stop = on_stop
+        self.overlay = overlay
+        self.visible = np.ones(len(longitudes), dtype=bool)  # Маска видимых спутников
+        self.frame = 0  # Последний отрисованный кадр
+        # Одна коллекция для новых точек всех спутников: один вызов отрисовки на кадр
+        self.points = ax.scatter([], [], s=markersize**2, marker="o", linewidths=0, zorder=3, animated=True)
+        self._background = None  # Растровая копия фона с уже пройденными участками трасс
+        self._drawn = 0  # До какого отсчёта трассы уже «впечатаны» в фон
+        self._timer = None
+        self._start_frame = 0
+        self._start_time = 0.0
+
+    # ------------------ Управление состоянием ------------------ #
+    def set_visible(self, visible: Sequence[bool]):
+        """Меняет маску видимости; легенда и фон перестраиваются только при реальном изменении."""
+        visible = np.asarray(visible, dtype=bool)
+        if not np.array_equal(visible, self.visible):
+            self.visible = visible
+            self.update_legend()
+        self.invalidate()
+
+    def update_legend(self):
+        """Перестраивает легенду по текущей маске видимости."""
+        handles = [h for h, v in zip(self.legend_handles, self.visible) if v]
+        if handles:
+            self.ax.legend(handles=handles, loc='center left', bbox_to_anchor=(1, 0.5), fontsize='small')
+        elif self.ax.get_legend():
+            self.ax.get_legend().remove()
+
+    def invalidate(self):
+        """Сбрасывает кэшированный фон: следующий кадр будет построен с полной перерисовкой."""
+        self._background = None
+
+    # ------------------ Отрисовка ------------------ #
+    def _set_points(self, first: int, last: int):
+        """Помещает в коллекцию отсчёты [first, last) всех видимых спутников."""
+        offsets, colors = [], []
+        for i in np.flatnonzero(self.visible):
+            lon = np.asarray(self.longitudes[i][first:last])
+            lat = np.asarray(self.latitudes[i][first:last])
+            if lon.size:
+                offsets.append(np.column_stack([lon, lat]))
+                colors.append(np.broadcast_to(self.colors[i], (lon.size, 4)))
+        if offsets:
+            self.points.set_offsets(np.concatenate(offsets))
+            self.points.set_facecolors(np.concatenate(colors))
+        else:
+            self.points.set_offsets(np.empty((0, 2)))
+
+    def _rebuild(self, frame: int):
+        """Полная перерисовка: статичные элементы и трассы до кадра frame становятся новым фоном."""
+        self.datetime_text.set_animated(True)  # Метка времени рисуется поверх фона на каждом кадре
+        self.points.set_offsets(np.empty((0, 2)))
+        if self.overlay is not None:
+            self.overlay(None)  # Наложение не должно попасть в фон
+        self.canvas.draw()
+        self._set_points(0, frame)
+        self.ax.draw_artist(self.points)
+        self._background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self._drawn = frame
+
+    def draw_frame(self, frame: int):
+        """Рисует кадр frame: на карте видны отсчёты [0, frame) каждого видимого спутника.
+
+        Объекты, которые возвращает overlay(frame) (например, линии связи текущего момента),
+        рисуются поверх фона и не впечатываются в него; overlay(None) убирает их.
+        """
+        frame = max(0, min(frame, self.n_frames - 1))
+        if self._background is None or frame < self._drawn:
+            self._rebuild(frame)
+        elif frame > self._drawn:
+            self.canvas.restore_region(self._background)
+            self._set_points(self._drawn, frame)  # Только новые точки с прошлого кадра
+            self.ax.draw_artist(self.points)
+            self._background = self.canvas.copy_from_bbox(self.fig.bbox)
+            self._drawn = frame
+        else:
+            self.canvas.restore_region(self._background)
+        for artist in (() if self.overlay is None else self.overlay(frame)):
+            self.ax.draw_artist(artist)
+        self.datetime_text.set_text(self.time_label(frame))
+        self.fig.draw_artist(self.datetime_text)
+        self.canvas.blit(self.fig.bbox)
+        self.frame = frame
+        if self.on_frame is not None:
+            self.on_frame(frame)
+
+    def skip_frames(self, frames: Sequence[int]):
+        """Впечатывает в фон точки кадров frames (по возрастанию), не выводя сами кадры.
+
+        Точки дорисовываются теми же участками, что и при draw_frame каждого кадра, поэтому
+        перекрывающиеся маркеры ложатся в том же порядке и следующий кадр совпадает с
+        последовательной отрисовкой до пикселя.
+        """
+        frames = [max(0, min(frame, self.n_frames - 1)) for frame in frames]
+        if not frames:
+            return
+        if self._background is None or frames[0] < self._drawn:
+            self._rebuild(frames[0])
+        else:
+            self.canvas.restore_region(self._background)
+        for frame in frames:
+            if frame > self._drawn:
+                self._set_points(self._drawn, frame)
+                self.ax.draw_artist(self.points)
+                self._drawn = frame
+        self._background = self.canvas.copy_from_bbox(self.fig.bbox)
+
+    # ------------------ Воспроизведение ------------------ #
+    @property
+    def running(self) -> bool:
+        return self._timer is not None
+
+    def start(self, frame: int = 0):
+        """Запускает воспроизведение с кадра frame.
+
+        Номер кадра вычисляется по прошедшему времени, поэтому при медленной отрисовке
+        кадры пропускаются, а скорость анимации остаётся равной fps.
+        """
+        self.stop(notify=False)
+        self.update_legend()
+        self.invalidate()
+        self._start_frame = frame
+        self._start_time = time.perf_counter()
+        self._timer = self.canvas.new_timer(interval=max(1, int(1000 / self.fps)))
+        self._timer.add_callback(self._tick)
+        self._timer.start()
+        self.draw_frame(frame)
+
+    def _tick(self):
+        if self._timer is None:
+            return
+        frame = self._start_frame + int((time.perf_counter() - self._start_time) * self.fps)
+        self.draw_frame(frame)
+        if frame >= self.n_frames - 1:
+            self.stop()  # Анимация не повторяется после завершения
+
+    def stop(self, notify: bool = True):
+        """Останавливает воспроизведение и возвращает метке времени обычный режим отрисовки."""
+        if self._timer is None:
+            return
+        self._timer.stop()
+        self._timer = None
+        self.datetime_text.set_animated(False)
+        self.points.set_offsets(np.empty((0, 2)))
+        self.invalidate()
+        if notify and self.on_stop is not None:
+            self.on_stop()
+
+    def remove(self):
+        """Удаляет вспомогательные объекты аниматора с оси."""
+        self.stop(notify=False)
+        self.points.remove()
+
+
+class _TrackArtist(Artist):
+    """Трассы всех спутников из общего массива TrackCollection.
+
+    Видимые спутники группируются по цвету, и каждая группа рисуется одним вызовом рендерера:
+    точки - draw_markers (растр маркера строится один раз и копируется в каждую точку), линии -
+    draw_path по одному пути с разрывами NaN между спутниками. Agg ставит маркеры в целые
+    пиксели, поэтому из точек группы, попавших в один пиксель, рисуется одна.
+    """
+
+    def __init__(self, tracks, markersize: float, linewidth: float, zorder: float):
+        super().__init__()
+        self.tracks = tracks
+        self.markersize = markersize
+        self.linewidth = linewidth
+        self.marker = MarkerStyle("o")
+        self._stamp = np.empty(0, dtype=np.int64)  # Номер последней точки группы в каждом пикселе холста
+        self.set_zorder(zorder)
+        self.set_animated(True)
+
+    def draw(self, renderer):
+        if not self.get_visible():
+            return
+        renderer.open_group("tracks", self.get_gid())
+        gc = renderer.new_gc()
+        self._set_gc_clip(gc)
+        if self.tracks.lines:
+            self._draw_lines(renderer, gc)
+        else:
+            self._draw_markers(renderer, gc)
+        gc.restore()
+        renderer.close_group("tracks")
+        self.stale = False
+
+    def _draw_markers(self, renderer, gc):
+        tracks = self.tracks
+        points = tracks.data[:tracks.frame]
+        transform = self.axes.transData
+        width, height = int(renderer.width), int(renderer.height)
+        if self._stamp.size != width * height:
+            self._stamp = np.empty(width * height, dtype=np.int64)  # Новый буфер только при смене размера холста
+        stamp = self._stamp
+        marker_path = self.marker.get_path()
+        marker_trans = self.marker.get_transform().frozen().scale(renderer.points_to_pixels(self.markersize))
+        gc.set_linewidth(rcParams["lines.markeredgewidth"])  # Обводка цвета точки, как у маркеров Line2D
+        for color, members in tracks.groups:
+            xy = points[:, members].reshape(-1, 2)
+            pixel = np.floor(transform.transform(xy) + 0.5)
+            inside = (pixel[:, 0] >= 0) & (pixel[:, 0] < width) & (pixel[:, 1] >= 0) & (pixel[:, 1] < height)
+            xy, pixel = xy[inside], pixel[inside].astype(np.int64)  # NaN и точки за пределами холста отбрасываются
+            if not xy.size:
+                continue
+            key = pixel[:, 1] * width + pixel[:, 0]
+            order = np.arange(key.size)
+            stamp[key] = order  # Из нескольких точек в одном пикселе остаётся последняя
+            xy = xy[stamp[key] == order]
+            gc.set_foreground(color, isRGBA=True)
+            renderer.draw_markers(gc, marker_path, marker_trans, Path(xy), transform, color)
+
+    def _draw_lines(self, renderer, gc):
+        tracks = self.tracks
+        lon, lat, stops = tracks.line_parts()
+        gc.set_linewidth(self.linewidth)
+        gc.set_capstyle("projecting")
+        gc.set_joinstyle("round")
+        for color, members in tracks.groups:
+            width = int(stops[members].max(initial=0))
+            if width == 0:
+                continue
+            # Трассы группы до своих кадров подряд, через столбец NaN (разрыв линии)
+            xy = np.full((members.size, width + 1, 2), np.nan)
+            xy[:, :width, 0] = lon[members, :width]
+            xy[:, :width, 1] = lat[members, :width]
+            xy[np.arange(width + 1)[np.newaxis, :] >= stops[members, np.newaxis]] = np.nan
+            gc.set_foreground(color, isRGBA=True)
+            renderer.draw_path(gc, Path(xy.reshape(-1, 2)), self.axes.transData)
+
+
+class TrackCollection:
+    """Все трассы в одном массиве с маской видимости по спутникам.
+
+    Отсчёты хранятся в порядке (момент, спутник), поэтому трассы до кадра frame - это первые
+    frame строк массива. Переключение флажка меняет только маску и списки спутников в группах
+    одного цвета; все трассы рисует один объект (_TrackArtist). Он анимированный: статичная часть
+    холста (карта, сетка) кэшируется при каждой полной отрисовке, а redraw восстанавливает её и
+    рисует только трассы и легенду.
+    """
+
+    def __init__(
+        self,
+        ax,  # Ось с картой
+        longitudes: Sequence[np.ndarray],  # Долготы по спутникам (строки могут быть разной длины)
+        latitudes: Sequence[np.ndarray],  # Широты по спутникам
+        colors: Sequence,  # Цвета спутников
+        legend_handles: Optional[Sequence] = None,  # Объекты для легенды (по одному на спутник); None - без легенды
+        markersize: float = 4,  # Размер маркера (как у Line2D)
+        linewidth: float = 1.5,  # Толщина линий в режиме линий
+        zorder: float = 3
+    ):
+        self.ax = ax
+        self.fig = ax.figure
+        self.colors = to_rgba_array(colors)  # Цвета спутников в формате RGBA (n_sats, 4)
+        self.legend_handles = None if legend_handles is None else list(legend_handles)
+        # Различные цвета и номер цвета каждого спутника
+        self.palette, self.color_index = np.unique(self.colors, axis=0, return_inverse=True)
+        self.color_index = self.color_index.ravel()
+        self.visible = np.ones(len(self.colors), dtype=bool)  # Маска видимых спутников
+        self.groups = []  # (цвет, номера видимых спутников этого цвета)
+        self.frame = None  # Отображаются отсчёты [0, frame); None - трассы целиком
+        self.lines = False  # True - линии с разрывами на ±180°, False - точки
+        self.artist = _TrackArtist(self, markersize, linewidth, zorder)
+        ax.add_artist(self.artist)
+        self.overlays = []  # Другие анимированные объекты (например, LinkLines), рисуемые под трассами
+        self._split = None  # Трассы, разбитые по антимеридиану: (долготы, широты, позиции отсчётов)
+        self._background = None  # Растровая копия холста без трасс и легенды
+        self._cid = self.canvas.mpl_connect("draw_event", self._on_draw)
+        self._update_groups()
+        self.set_data(longitudes, latitudes)
+
+    @property
+    def canvas(self):
+        return self.fig.canvas  # Холст может быть заменён после создания (например, FigureCanvasTkAgg)
+
+    # ------------------ Данные и состояние ------------------ #
+    def set_data(self, longitudes: Sequence[np.ndarray], latitudes: Sequence[np.ndarray]):
+        """Копирует трассы в общий массив (n_steps, n_sats, 2); вызывается, когда появились новые отсчёты."""
+        n_steps = max((len(track) for track in longitudes), default=0)
+        self.data = np.full((n_steps, len(self.colors), 2), np.nan)  # Недостающие отсчёты - NaN, они не рисуются
+        for i, (lon, lat) in enumerate(zip(longitudes, latitudes)):
+            self.data[:len(lon), i, 0] = lon
+            self.data[:len(lat), i, 1] = lat
+        self._split = None
+
+    def set_visible(self, visible: Sequence[bool]):
+        """Меняет маску видимости; массив трасс не копируется."""
+        visible = np.asarray(visible, dtype=bool)
+        if not np.array_equal(visible, self.visible):
+            self.visible = visible.copy()
+            self._update_groups()
+
+    def set_frame(self, frame: Optional[int]):
+        """Показывает отсчёты [0, frame) каждого спутника; None - трассы целиком."""
+        self.frame = frame
+
+    def set_lines(self, lines: bool):
+        """Переключает отображение трасс между точками и линиями."""
+        self.lines = lines
+
+    def shown(self) -> np.ndarray:
+        """Маска спутников, у которых на карте сейчас есть хотя бы одна точка."""
+        return self.visible & ~np.isnan(self.data[:self.frame, :, 0]).all(axis=0)
+
+    def line_parts(self):
+        """Трассы с разрывами на ±180° (долготы, широты) и длина участка каждого спутника до текущего кадра."""
+        if self._split is None:
+            from polylines import split_antimeridian
+            self._split = split_antimeridian(self.data[..., 0].T, self.data[..., 1].T, return_index=True)
+        lon, lat, index = self._split
+        if self.frame is None or self.frame >= index.shape[1]:
+            stops = np.full(len(lon), lon.shape[1])
+        elif self.frame > 0:
+            stops = index[:, self.frame - 1] + 1  # Участок до кадра frame (как трасса[:frame])
+        else:
+            stops = np.zeros(len(lon), dtype=np.int64)
+        return lon, lat, stops
+
+    def _update_groups(self):
+        visible = np.flatnonzero(self.visible)
+        members = visible[np.argsort(self.color_index[visible], kind="stable")]
+        bounds = np.searchsorted(self.color_index[members], np.arange(len(self.palette) + 1))
+        self.groups = [(self.palette[k], members[bounds[k]:bounds[k + 1]])
+                       for k in range(len(self.palette)) if bounds[k + 1] > bounds[k]]
+
+    def update_legend(self):
+        """Легенда по спутникам, у которых на карте есть точки; рисуется поверх фона вместе с трассами."""
+        if self.legend_handles is None:
+            return
+        handles = [self.legend_handles[i] for i in np.flatnonzero(self.shown())]
+        if handles:
+            self.ax.legend(handles=handles, loc='center left', bbox_to_anchor=(1, 0.5), fontsize='small').set_animated(True)
+        elif self.ax.get_legend():
+            self.ax.get_legend().remove()
+
+    # ------------------ Отрисовка ------------------ #
+    def _draw_animated(self):
+        for artist in self.overlays:
+            self.ax.draw_artist(artist)
+        self.ax.draw_artist(self.artist)
+        legend = self.ax.get_legend()
+        if legend is not None and legend.get_animated():
+            self.ax.draw_artist(legend)
+
+    def _on_draw(self, event):
+        # После каждой полной отрисовки холста запоминаем фон без трасс и дорисовываем их
+        self._background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self._draw_animated()
+
+    def invalidate(self):
+        """Сбрасывает кэшированный фон: следующая перерисовка будет полной."""
+        self._background = None
+
+    def redraw(self):
+        """Перерисовывает только трассы и легенду поверх кэшированного фона (или весь холст, если фона нет)."""
+        if self._background is None:
+            self.canvas.draw()
+            return
+        self.canvas.restore_region(self._background)
+        self._draw_animated()
+        self.canvas.blit(self.fig.bbox)
+
+    def remove(self):
+        """Удаляет трассы с оси и отключает кэширование фона."""
+        self.canvas.mpl_disconnect(self._cid)
+        self.artist.remove()
+
+
+class LinkLines:
+    """Линии прямой видимости между спутниками (crosslinks.LinkGraph) в текущий момент.
+
+    Отрезок соединяет подспутниковые точки пары из самого графа (LinkGraph.points): у систем из
+    нескольких конфигураций трассы рассчитаны на разных сетках времени, и один номер отсчёта в
+    них - разные моменты. Отрезок, пересекающий антимеридиан, рисуется
+    двумя частями у разных краёв карты. Линии и подпись с показателями графа анимированные:
+    их рисует TrackCollection (через overlays) или BlitAnimator (через overlay) поверх
+    кэшированного фона, поэтому смена момента не требует полной перерисовки холста.
+    """
+
+    def __init__(self, ax, graph, color="#303030", linewidth: float = 0.6, alpha: float = 0.45, zorder: float = 2.5):
+        self.graph = graph
+        self.enabled = True  # False - линии не показываются
+        self.collection = LineCollection([], colors=color, linewidths=linewidth, alpha=alpha, zorder=zorder,
+                                         animated=True)
+        ax.add_collection(self.collection, autolim=False)
+        self.text = ax.text(0.01, 0.01, "", transform=ax.transAxes, ha="left", va="bottom", fontsize=8, zorder=5,
+                            bbox=dict(boxstyle="round", facecolor="white", alpha=0.7), animated=True)
+        self.text.set_visible(False)
+        self._degrees = graph.degrees()  # Показатели графа считаются один раз для всех моментов
+        self._components = graph.components()
+
+    @property
+    def artists(self):
+        return [self.collection, self.text]
+
+    def clear(self):
+        self.collection.set_segments([])
+        self.text.set_visible(False)
+
+    def set_frame(self, frame: Optional[int], visible: np.ndarray):
+        """Линии момента, последнего из показанных в кадре frame (None - последний момент интервала).
+
+        visible - маска спутников. Возвращает объекты для отрисовки.
+        """
+        epoch = len(self.graph) - 1 if frame is None else min(frame, len(self.graph)) - 1
+        if not self.enabled or epoch < 0:
+            self.clear()
+            return self.artists
+        first, second = self.graph.edges(epoch)
+        keep = visible[first] & visible[second]
+        points = self.graph.points[epoch]
+        start, end = points[first[keep]], points[second[keep]]
+        # Через антимеридиан: второй конец переносится на 360° к первому, и наоборот
+        shift = np.where(np.abs(end[:, 0] - start[:, 0]) > 180.0, np.sign(start[:, 0] - end[:, 0]) * 360.0, 0.0)
+        wrapped = shift != 0
+        segments = [np.stack([start, end + np.column_stack([shift, np.zeros_like(shift)])], axis=1),
+                    np.stack([start[wrapped] - np.column_stack([shift[wrapped], np.zeros(wrapped.sum())]),
+                              end[wrapped]], axis=1)]
+        self.collection.set_segments(np.concatenate(segments))
+
+        degrees = self._degrees[epoch]
+        self.text.set_text(f"Links: {keep.sum()} of {first.size}   degree: mean {degrees.mean():.1f}, "
+                           f"min {degrees.min()}   components: {self._components[epoch]}")
+        self.text.set_visible(True)
+        return self.artists
+
+    def follow(self, tracks: "TrackCollection"):
+        """Линии для текущего кадра и маски видимости коллекции трасс."""
+        return self.set_frame(tracks.frame, tracks.visible)
+
+    def remove(self):
+        self.collection.remove()
+        self.text.remove()
@@ -0,0 +1,62 @@
+from typing import Optional
+
+import numpy as np  # Импортируем библиотеку NumPy для работы с массивами
+
+from constants import GM
+from transforms import ground_distance
+from utilities import propagate_elements
+
+COARSE_STEPS_PER_PERIOD = 64  # Шагов на виток самого быстрого спутника в начальной сетке
+MAX_REFINEMENTS = 30  # Ограничение числа делений одного интервала
+
+
+def interpolation_error(lon_a, lat_a, lon_b, lat_b, lon_mid, lat_mid):
+    """Отклонение (в км) истинной точки середины интервала от середины отрезка, по которому трасса рисуется."""
+    lon_line = lon_a + ((lon_b - lon_a + 180.0) % 360.0 - 180.0) / 2  # Отрезок через антимеридиан - короткий путь
+    lat_line = (lat_a + lat_b) / 2
+    return ground_distance(lon_line, lat_line, lon_mid, lat_mid)
+
+
+def adaptive_time_steps(
+    elements: dict,  # Орбитальные элементы по слотам (как возвращает satellite_slots)
+    jd: float,  # Начальная дата (юлианская дата)
+    span: float,  # Длительность интервала (в секундах)
+    tolerance: float = 1.0,  # Допустимое отклонение трассы между отсчётами (в км)
+    max_step: Optional[float] = None,  # Наибольший шаг (по умолчанию 1/64 витка самого быстрого спутника)
+    min_step: float = 0.1,  # Наименьший шаг (в секундах)
+    j2: bool = False  # True - вековые возмущения J2
+):
+    """Общая для всех слотов временная сетка: шаг мельче там, где трасса быстро меняет направление или скорость.
+
+    Интервалы делятся пополам, пока середина трассы, соединённой отрезками, отклоняется от истинной
+    больше чем на tolerance км хотя бы у одного спутника. Все середины одной итерации рассчитываются
+    одним вызовом propagate_elements. Возвращает (моменты времени, долготы, широты).
+    """
+    if max_step is None:
+        shortest_period = 2 * np.pi * np.sqrt(np.min(np.asarray(elements["semi_major_axis"], dtype=float))**3 / GM)
+        max_step = shortest_period / COARSE_STEPS_PER_PERIOD
+    t = np.linspace(0.0, span, int(np.ceil(span / max_step)) + 1)
+    lon, lat = propagate_elements(elements, jd, t, j2=j2)
+    check = np.ones(t.size - 1, dtype=bool)  # Интервалы, которые нужно проверить на этой итерации
+
+    for _ in range(MAX_REFINEMENTS):
+        check &= np.diff(t) > 2 * min_step
+        intervals = np.flatnonzero(check)
+        if intervals.size == 0:
+            break
+        mid = (t[intervals] + t[intervals + 1]) / 2
+        lon_mid, lat_mid = propagate_elements(elements, jd, mid, j2=j2)
+        error = interpolation_error(lon[:, intervals], lat[:, intervals], lon[:, intervals + 1],
+                                    lat[:, intervals + 1], lon_mid, lat_mid).max(axis=0)
+        split = error > tolerance
+        if not split.any():
+            break
+        # Вставляем середины делящихся интервалов; проверять дальше нужно только их половины
+        position = intervals[split] + 1
+        t = np.insert(t, position, mid[split])
+        lon = np.insert(lon, position, lon_mid[:, split], axis=1)
+        lat = np.insert(lat, position, lat_mid[:, split], axis=1)
+        inserted = np.zeros(t.size, dtype=bool)
+        inserted[position + np.arange(position.size)] = True
+        check = inserted[:-1] | inserted[1:]
+    return t, lon, lat
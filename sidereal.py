@@ -0,0 +1,106 @@
+import functools  # Кэширование звездного времени эпохи
+import os  # Проверка файла таблицы вращения Земли
+from typing import Optional
+
+import numpy as np  # Импортируем библиотеку NumPy для работы с массивами
+
+from constants import W
+
+J2000 = 2451545.0  # Юлианская дата эпохи J2000
+DAY = 86400.0  # Длительность суток (в секундах)
+
+
+def gmst(jd, wrap: bool = True):
+    """Среднее гринвичское звездное время (в радианах) для юлианских дат UT, скаляр или массив.
+
+    Формула IAU 1982 (Aoki et al.) для произвольного момента суток; при wrap=False угол
+    не приводится к [0, 2π) и растёт непрерывно.
+    """
+    tu = (np.asarray(jd, dtype=float) - J2000) / 36525.0  # Юлианские столетия от J2000
+    seconds = 67310.54841 + (876600.0 * 3600.0 + 8640184.812866) * tu + 0.093104 * tu**2 - 6.2e-6 * tu**3
+    if wrap:
+        seconds = np.mod(seconds, DAY)
+    return seconds * (2 * np.pi / DAY)  # Секунды звездного времени переводим в радианы
+
+
+def julian_date(date) -> float:
+    """Юлианская дата из объекта Time (Astropy) или числа; атрибут jd читается один раз."""
+    return float(date) if isinstance(date, (int, float, np.floating)) else float(date.jd)
+
+
+@functools.lru_cache(maxsize=1024)
+def epoch_sidereal_time(jd: float) -> float:
+    """Звездное время эпохи (в радианах); полином вычисляется один раз для каждой эпохи."""
+    return float(gmst(jd))
+
+
+class EarthRotationTable:
+    """Таблица звездного времени с равномерным шагом по датам, хранимая в .npy и открываемая через memory map.
+
+    Столбцы: юлианская дата узла и непрерывное (без приведения к 2π) звездное время в радианах.
+    Звездное время между узлами находится линейной интерполяцией.
+    """
+
+    def __init__(self, table: np.ndarray):
+        self.table = table
+        self.jd = table[:, 0]
+        self.angle = table[:, 1]
+
+    @classmethod
+    def build(cls, start_jd: float, days: float, step_days: float = 1.0, path: Optional[str] = None):
+        """Рассчитывает таблицу на интервал days суток от start_jd и, если указан path, сохраняет её."""
+        jd = start_jd + step_days * np.arange(int(np.ceil(days / step_days)) + 1)
+        angle = gmst(jd, wrap=False)  # Непрерывное звездное время для корректной интерполяции
+        table = np.column_stack([jd, angle])
+        if path is not None:
+            np.save(path, table)
+        return cls(table)
+
+    @classmethod
+    def open(cls, path: str):
+        """Открывает сохранённую таблицу без загрузки в память."""
+        return cls(np.load(path, mmap_mode="r"))
+
+    def covers(self, jd_first: float, jd_last: float) -> bool:
+        return self.jd[0] <= jd_first and jd_last <= self.jd[-1]
+
+    def angles(self, jd: float, t):
+        """Звездное время (в радианах) в моменты jd + t/86400, t - секунды от jd."""
+        return np.interp(jd + np.asarray(t, dtype=float) / DAY, self.jd, self.angle)
+
+
+_rotation_table = None  # Таблица, используемая sidereal_angles (None - вычисление по формуле)
+
+
+def set_rotation_table(table: Optional[EarthRotationTable]):
+    """Включает (или выключает при None) использование таблицы вращения Земли."""
+    global _rotation_table
+    _rotation_table = table
+
+
+def get_rotation_table() -> Optional[EarthRotationTable]:
+    return _rotation_table
+
+
+if os.environ.get("GROUNDTRACK_ROTATION_TABLE"):
+    # Таблицу можно подключить без изменения кода, указав путь к файлу .npy
+    set_rotation_table(EarthRotationTable.open(os.environ["GROUNDTRACK_ROTATION_TABLE"]))
+
+
+def sidereal_angles(jd: float, t, out=None):
+    """Звездное время (в радианах) для всего временного ряда t (в секундах от эпохи jd) одним вызовом.
+
+    Если подключена таблица вращения Земли и она покрывает интервал, значения берутся из неё;
+    иначе используется звездное время эпохи (кэшируется) плюс вращение Земли W*t.
+    """
+    t = np.asarray(t, dtype=float)
+    table = _rotation_table
+    if table is not None and t.size and table.covers(jd + t.min() / DAY, jd + t.max() / DAY):
+        result = table.angles(jd, t)
+        if out is None:
+            return result
+        out[...] = result
+        return out
+    out = np.multiply(W, t, out=out)
+    out += epoch_sidereal_time(float(jd))
+    return out
@@ -0,0 +1,108 @@
+from typing import Sequence
+
+import numpy as np  # Импортируем библиотеку NumPy для работы с массивами
+
+from constants import R
+from transforms import ground_distance
+
+DEFAULT_CELL_SIZE = 2.0  # Размер ячейки сетки (в градусах)
+
+
+class TrackIndex:
+    """Индекс отсчётов трасс по ячейкам сетки широта/долгота.
+
+    Отсчёты упорядочены по номеру ячейки (строка широты, затем столбец долготы), поэтому ячейки
+    одной строки, попадающие в прямоугольник, занимают один непрерывный участок массивов: запрос
+    просматривает по одному срезу на строку сетки и точно фильтрует только эти кандидаты.
+    """
+
+    __slots__ = ("cell_size", "n_rows", "n_cols", "offsets", "satellite", "step", "longitude", "latitude")
+
+    def __init__(self, longitudes: Sequence[np.ndarray], latitudes: Sequence[np.ndarray],
+                 cell_size: float = DEFAULT_CELL_SIZE):
+        """longitudes, latitudes - трассы по спутникам (массив (n_sats, n_steps) или список массивов разной длины); NaN пропускаются."""
+        self.cell_size = cell_size
+        self.n_rows = int(np.ceil(180.0 / cell_size))
+        self.n_cols = int(np.ceil(360.0 / cell_size))
+        lengths = np.array([len(track) for track in longitudes], dtype=np.int64)
+        lon = np.concatenate([np.asarray(track, dtype=float) for track in longitudes]) if len(lengths) else np.zeros(0)
+        lat = np.concatenate([np.asarray(track, dtype=float) for track in latitudes]) if len(lengths) else np.zeros(0)
+        satellite = np.repeat(np.arange(lengths.size, dtype=np.int32), lengths)
+        step = (np.arange(lon.size) - np.repeat(np.cumsum(lengths) - lengths, lengths)).astype(np.int32)
+
+        valid = ~(np.isnan(lon) | np.isnan(lat))  # Ещё не рассчитанные отсчёты в индекс не попадают
+        lon, lat, satellite, step = lon[valid], lat[valid], satellite[valid], step[valid]
+        cell = self._rows(lat) * self.n_cols + self._cols(lon)
+        order = np.argsort(cell, kind="stable")
+        self.offsets = np.searchsorted(cell[order], np.arange(self.n_rows * self.n_cols + 1))  # Начало каждой ячейки
+        self.satellite, self.step = satellite[order], step[order]
+        self.longitude, self.latitude = lon[order], lat[order]
+
+    def __len__(self) -> int:
+        return self.satellite.size
+
+    def _rows(self, lat):
+        return np.clip(((np.asarray(lat) + 90.0) // self.cell_size).astype(np.int64), 0, self.n_rows - 1)
+
+    def _cols(self, lon):
+        return np.clip(((np.asarray(lon) + 180.0) // self.cell_size).astype(np.int64), 0, self.n_cols - 1)
+
+    def _candidates(self, lon_min: float, lon_max: float, lat_min: float, lat_max: float) -> np.ndarray:
+        # Позиции отсчётов в ячейках, пересекающих прямоугольник; lon_min > lon_max - прямоугольник через ±180°
+        rows = np.arange(self._rows(lat_min), self._rows(lat_max) + 1)
+        if lon_min <= lon_max:
+            col_ranges = [(self._cols(lon_min), self._cols(lon_max))]
+        else:
+            col_ranges = [(self._cols(lon_min), self.n_cols - 1), (0, self._cols(lon_max))]
+        starts, stops = [], []
+        for first, last in col_ranges:
+            starts.append(self.offsets[rows * self.n_cols + first])
+            stops.append(self.offsets[rows * self.n_cols + last + 1])
+        starts, stops = np.concatenate(starts), np.concatenate(stops)
+        lengths = stops - starts
+        total = int(lengths.sum())
+        if total == 0:
+            return np.zeros(0, dtype=np.int64)
+        # Срезы [start, stop) одним массивом без цикла по строкам
+        return np.repeat(starts - (np.cumsum(lengths) - lengths), lengths) + np.arange(total)
+
+    def query_bbox(self, lon_min: float, lon_max: float, lat_min: float, lat_max: float):
+        """Отсчёты внутри прямоугольника (в градусах): (номера спутников, номера отсчётов).
+
+        Если lon_min > lon_max, прямоугольник пересекает антимеридиан (например, 170 ... -170).
+        """
+        index = self._candidates(lon_min, lon_max, lat_min, lat_max)
+        lon, lat = self.longitude[index], self.latitude[index]
+        inside = (lat >= lat_min) & (lat <= lat_max)
+        inside &= ((lon >= lon_min) & (lon <= lon_max)) if lon_min <= lon_max else ((lon >= lon_min) | (lon <= lon_max))
+        index = index[inside]
+        return self.satellite[index], self.step[index]
+
+    def query_radius(self, lon: float, lat: float, radius: float):
+        """Отсчёты не дальше radius км от точки по дуге большого круга: (номера спутников, номера отсчётов, расстояния в км)."""
+        angle = np.degrees(radius / R)  # Угловой радиус
+        lat_min, lat_max = max(lat - angle, -90.0), min(lat + angle, 90.0)
+        if lat_min <= -90.0 or lat_max >= 90.0 or angle >= 90.0:
+            lon_min, lon_max = -180.0, 180.0  # Круг накрывает полюс - все долготы
+        else:
+            # Наибольшее отклонение по долготе на круге радиуса angle
+            half = np.degrees(np.arcsin(min(np.sin(np.radians(angle)) / np.cos(np.radians(lat)), 1.0)))
+            lon_min, lon_max = (lon - half + 180.0) % 360.0 - 180.0, (lon + half + 180.0) % 360.0 - 180.0
+        index = self._candidates(lon_min, lon_max, lat_min, lat_max)
+        distance = ground_distance(lon, lat, self.longitude[index], self.latitude[index])
+        inside = distance <= radius
+        index = index[inside]
+        return self.satellite[index], self.step[index], distance[inside]
+
+    def nearest_per_satellite(self, lon: float, lat: float, radius: float):
+        """Для каждого спутника, прошедшего в пределах radius км от точки, - ближайший отсчёт.
+
+        Возвращает (номера спутников, номера отсчётов, расстояния в км), упорядоченные по расстоянию.
+        """
+        satellite, step, distance = self.query_radius(lon, lat, radius)
+        order = np.lexsort((distance, satellite))
+        first = np.ones(order.size, dtype=bool)
+        first[1:] = satellite[order][1:] != satellite[order][:-1]
+        order = order[first]
+        order = order[np.argsort(distance[order], kind="stable")]
+        return satellite[order], step[order], distance[order]
@@ -0,0 +1,97 @@
+import os  # Работа с каталогами для записи трасс на диск
+from collections import namedtuple  # Лёгкий контейнер для блока трассы
+from typing import Iterable, Iterator, List, Optional
+
+import numpy as np  # Импортируем библиотеку NumPy для работы с массивами
+
+from constants import SatelliteConfig
+from constellation import ConstellationTable
+from sidereal import julian_date
+from symmetry import propagate_symmetric
+from utilities import satellite_slots
+
+DEFAULT_BLOCK_SIZE = 4096  # Число временных шагов в одном блоке
+
+# Блок трассы: моменты времени (n,), индексы спутников (n_sats,), долготы и широты (n_sats, n)
+TrackBlock = namedtuple("TrackBlock", ["time", "satellite", "longitudes", "latitudes"])
+
+
+def count_steps(span: float, step: float) -> int:
+    """Число отсчётов на интервале [0, span] с шагом step (в секундах), включая оба конца."""
+    return int(np.floor(span / step + 1e-9)) + 1
+
+
+def iter_track_blocks(
+    satellites: List[SatelliteConfig],  # Конфигурации спутниковой системы или ConstellationTable
+    date,  # Начальная дата (объект Time из Astropy)
+    span: float,  # Длительность интервала (в секундах)
+    step: float,  # Шаг по времени (в секундах)
+    block_size: int = DEFAULT_BLOCK_SIZE,  # Число временных шагов в блоке
+    j2: bool = False,  # True - вековые возмущения J2
+    time_steps: Optional[np.ndarray] = None  # Явная временная сетка (например, адаптивная); span и step не используются
+) -> Iterator[TrackBlock]:
+    """Генерирует трассы блоками фиксированного размера.
+
+    Память не зависит от длительности интервала: одновременно существует только один блок.
+    """
+    n_steps = count_steps(span, step) if time_steps is None else len(time_steps)
+    # Элементы и дата подготавливаются один раз для всех блоков
+    elements = satellites.elements() if isinstance(satellites, ConstellationTable) else satellite_slots(satellites)
+    jd = julian_date(date)
+    satellite_index = None
+    for first in range(0, n_steps, block_size):
+        if time_steps is None:
+            time_block = step * np.arange(first, min(first + block_size, n_steps), dtype=float)
+        else:
+            time_block = np.asarray(time_steps[first:first + block_size], dtype=float)
+        longitudes, latitudes = propagate_symmetric(elements, jd, time_block, j2=j2)
+        if satellite_index is None:
+            satellite_index = np.arange(longitudes.shape[0])
+        yield TrackBlock(time_block, satellite_index, longitudes, latitudes)
+
+
+def write_track_blocks(blocks: Iterable[TrackBlock], directory: str, n_sats: int, n_steps: int) -> str:
+    """Записывает поток блоков в каталог как time.npy, longitudes.npy и latitudes.npy.
+
+    Файлы создаются через memory map, поэтому в памяти держится только текущий блок.
+    """
+    os.makedirs(directory, exist_ok=True)
+    open_memmap = np.lib.format.open_memmap
+    time = open_memmap(os.path.join(directory, "time.npy"), mode="w+", dtype=float, shape=(n_steps,))
+    longitudes = open_memmap(os.path.join(directory, "longitudes.npy"), mode="w+", dtype=float, shape=(n_sats, n_steps))
+    latitudes = open_memmap(os.path.join(directory, "latitudes.npy"), mode="w+", dtype=float, shape=(n_sats, n_steps))
+    position = 0
+    for block in blocks:
+        n = block.time.size
+        time[position:position + n] = block.time
+        longitudes[:, position:position + n] = block.longitudes
+        latitudes[:, position:position + n] = block.latitudes
+        position += n
+    for array in (time, longitudes, latitudes):
+        array.flush()
+    return directory
+
+
+def open_track_files(directory: str):
+    """Открывает записанные write_track_blocks трассы без загрузки в память (mmap)."""
+    load = lambda name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r")
+    return load("time"), load("longitudes"), load("latitudes")
+
+
+def collect_blocks(blocks: Iterable[TrackBlock], stride: int = 1):
+    """Собирает поток в массивы для графика, оставляя каждый stride-й отсчёт.
+
+    Возвращает (time, longitudes, latitudes); при stride > 1 объём результата
+    уменьшается пропорционально, а прореживание идёт по сквозному номеру отсчёта.
+    """
+    times, longitudes, latitudes = [], [], []
+    position = 0
+    for block in blocks:
+        offset = (-position) % stride  # Первый отсчёт блока, попадающий в сквозную сетку с шагом stride
+        times.append(block.time[offset::stride])
+        longitudes.append(block.longitudes[:, offset::stride])
+        latitudes.append(block.latitudes[:, offset::stride])
+        position += block.time.size
+    if not times:
+        return np.empty(0), np.empty((0, 0)), np.empty((0, 0))
+    return np.concatenate(times), np.concatenate(longitudes, axis=1), np.concatenate(latitudes, axis=1)
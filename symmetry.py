@@ -0,0 +1,213 @@
+from typing import List, Optional
+
+import numpy as np  # Импортируем библиотеку NumPy для работы с массивами
+
+from constants import GM
+from sidereal import sidereal_angles
+from transforms import geodetic_coordinates, spherical_coordinates
+from utilities import _orbit_coordinates, epoch_offsets, j2_secular_rates, propagate_elements
+
+ELEMENT_DECIMALS = 9  # Знаков после запятой при сравнении элементов орбит (км, градусы)
+ALIGN_TOLERANCE = 1e-6  # Допустимое отклонение сдвига по времени от целого числа шагов сетки (в шагах)
+CHUNK_ELEMENTS = 4_000_000  # Наибольшее число отсчётов (спутник x момент) в одном блоке выборки
+
+
+class SymmetryGroup:
+    """Слоты, трассы которых получаются из одной опорной орбиты.
+
+    Положение слота members[j] в инерциальной системе с неподвижным узлом - это положение опорной
+    орбиты через shifts[j] шагов сетки, повёрнутое на node_offsets[j] вокруг оси Z. Поворот вокруг
+    оси Z - это сдвиг долготы, поэтому трасса слота получается выборкой из опорной трассы. Если
+    period больше нуля, опорная орбита повторяется через period шагов, и её достаточно рассчитать
+    на одном периоде независимо от длины интервала.
+    """
+
+    __slots__ = ("members", "reference", "node_offsets", "shifts", "period", "node_rate")
+
+    def __init__(self, members, reference, node_offsets, shifts, period, node_rate):
+        self.members = members  # Номера слотов
+        self.reference = reference  # Элементы опорной орбиты (как у satellite_slots, по одному значению)
+        self.node_offsets = node_offsets  # Сдвиг узла слотов относительно опорной орбиты (в радианах)
+        self.shifts = shifts  # Сдвиг слотов по времени (в шагах сетки)
+        self.period = period  # Период опорной орбиты (в шагах сетки); 0 - не кратен шагу
+        self.node_rate = node_rate  # Скорость смещения узла от J2 (радиан/с)
+
+
+def uniform_step(time_steps) -> Optional[float]:
+    """Шаг равномерной сетки времени (в секундах) или None, если сетка неравномерная."""
+    t = np.asarray(time_steps, dtype=float)
+    if t.size < 2:
+        return None
+    step = (t[-1] - t[0]) / (t.size - 1)
+    if step <= 0 or np.abs(np.diff(t) - step).max() > 1e-9 * step:
+        return None
+    return step
+
+
+def symmetry_groups(
+    elements: dict,  # Орбитальные элементы по слотам (как возвращает satellite_slots; "epoch" - необязательно)
+    jd: float,  # Начальная дата (юлианская дата)
+    time_steps,  # Моменты времени от начальной даты (в секундах)
+    j2: bool = False  # True - вековые возмущения J2
+) -> List[SymmetryGroup]:
+    """Разбивает слоты на группы с общей опорной орбитой.
+
+    Слоты с одинаковыми a, e, i (и ω у эллиптических орбит) отличаются только узлом и фазой.
+    Разница узлов - точный сдвиг долготы. Разница фаз - сдвиг по времени: у круговой орбиты фаза -
+    это аргумент широты ω + M, у эллиптической в задаче двух тел - M (с J2 перицентр эллиптической
+    орбиты смещается, и сдвиг по времени не точен, поэтому M тоже входит в ключ). Сдвиг
+    используется, только если он равен целому числу шагов сетки; слоты с другой дробной частью
+    сдвига получают свою опорную орбиту. Слоты, которым повторное использование ничего не даёт
+    (единственный в группе и без повторения опорной орбиты на интервале), в группы не входят.
+    """
+    t = np.asarray(time_steps, dtype=float)
+    step = uniform_step(t)
+    column = lambda key: np.asarray(elements[key], dtype=float)
+    a, e, i = column("semi_major_axis"), column("eccentricity"), column("inclination")
+    offset = epoch_offsets(elements["epoch"], jd) if "epoch" in elements else np.zeros(a.size)
+    if j2:
+        node_rate, pericenter_rate, anomaly_rate = j2_secular_rates(a, e, i)
+    else:
+        node_rate, pericenter_rate, anomaly_rate = np.zeros(a.size), np.zeros(a.size), np.sqrt(GM / a**3)
+    # Элементы на начальную дату: разные эпохи сводятся к сдвигу узла, перицентра и аномалии
+    node = np.radians(column("longitude_of_ascending_node")) + node_rate * offset
+    pericenter = np.radians(column("argument_pericenter")) + pericenter_rate * offset
+    anomaly = np.radians(column("mean_anomaly")) + anomaly_rate * offset
+
+    circular = e == 0
+    shiftable = circular | (not j2)
+    phase = np.where(circular, pericenter + anomaly, anomaly)  # Фаза, от которой зависит положение на орбите
+    phase_rate = np.where(circular, anomaly_rate + pericenter_rate, anomaly_rate)
+    wrapped = lambda angle: np.round(np.degrees(np.mod(angle, 2 * np.pi)), ELEMENT_DECIMALS) % 360.0
+    key = np.column_stack([
+        np.round(a, ELEMENT_DECIMALS), np.round(e, ELEMENT_DECIMALS), np.round(i, ELEMENT_DECIMALS),
+        np.where(circular, 0.0, wrapped(pericenter)),
+        np.where(shiftable, 0.0, wrapped(anomaly)),
+    ])
+    # Слоты с одинаковым ключом - одна форма орбиты (lexsort заметно быстрее np.unique(axis=0))
+    by_shape = np.lexsort(key.T[::-1])
+    boundaries = np.flatnonzero(np.any(np.diff(key[by_shape], axis=0) != 0, axis=1)) + 1
+
+    groups = []
+    for members in np.split(by_shape, boundaries):
+        rate = phase_rate[members[0]]
+        period = 2 * np.pi / rate / step if step is not None and shiftable[members[0]] else 0.0
+        delta = np.mod(phase[members] - phase[members[0]], 2 * np.pi)
+        if period:
+            # Сдвиги двух слотов отличаются на целое число шагов, если у них одинаковая дробная часть
+            shift = delta / rate / step
+            resolution = int(round(1 / ALIGN_TOLERANCE))
+            fraction = np.round((shift - np.floor(shift)) * resolution) % resolution
+        else:
+            shift = np.zeros(members.size)
+            fraction = np.round(np.angle(np.exp(1j * delta)), 2 * ELEMENT_DECIMALS)  # Только совпадающие фазы
+        _, label, counts = np.unique(fraction, return_inverse=True, return_counts=True)
+        label = label.ravel()
+        if not 0 < _tiling(period, t.size, 0) < t.size:
+            # Одиночный слот без повторения опорной орбиты ничего не выигрывает - такие слоты
+            # отбрасываются сразу, без цикла по ним
+            keep = counts[label] > 1
+            members, shift, label = members[keep], shift[keep], label[keep]
+        order = np.argsort(label, kind="stable")
+        for part in np.split(order, np.flatnonzero(np.diff(label[order])) + 1):
+            if part.size == 0:
+                continue
+            part = part[np.argsort(shift[part], kind="stable")]  # Опорная орбита - слот с наименьшим сдвигом
+            group, first = members[part], members[part[0]]
+            steps = np.round(shift[part] - shift[part[0]]).astype(np.int64)
+            repeat = _tiling(period, t.size, int(steps.max(initial=0)))
+            if repeat:
+                steps %= repeat
+            reference = {
+                "semi_major_axis": a[first], "eccentricity": e[first], "inclination": i[first],
+                "longitude_of_ascending_node": np.degrees(node[first]),
+                "argument_pericenter": np.degrees(pericenter[first]), "mean_anomaly": np.degrees(anomaly[first]),
+            }
+            groups.append(SymmetryGroup(group, reference, node[group] - node[first], steps, repeat, node_rate[first]))
+    return groups
+
+
+def _tiling(period: float, n_steps: int, max_shift: int) -> int:
+    # Период опорной орбиты в целых шагах или 0, если за интервал набегает больше ALIGN_TOLERANCE шага
+    repeat = int(round(period))
+    span = n_steps + max_shift
+    if repeat < 1 or abs(period - repeat) * (span / repeat + 1) > ALIGN_TOLERANCE:
+        return 0
+    return repeat
+
+
+def _member_blocks(group: SymmetryGroup, n_steps: int):
+    # Блоки слотов группы и номера отсчётов опорной орбиты для каждого их момента
+    per_block = max(1, CHUNK_ELEMENTS // max(n_steps, 1))
+    k = np.arange(n_steps)
+    for start in range(0, group.members.size, per_block):
+        block = slice(start, start + per_block)
+        index = group.shifts[block, np.newaxis] + k
+        if group.period:
+            index %= group.period
+        yield block, index
+
+
+def propagate_symmetric(
+    elements: dict,  # Орбитальные элементы по слотам (как возвращает satellite_slots; "epoch" - необязательно)
+    jd: float,  # Начальная дата (юлианская дата)
+    time_steps: np.ndarray,  # Моменты времени от начальной даты (в секундах)
+    geodetic: bool = False,  # True - геодезические широты WGS-84 вместо геоцентрических
+    j2: bool = False,  # True - вековые возмущения J2
+    return_info: bool = False  # True - дополнительно вернуть число рассчитанных отсчётов опорных орбит
+):
+    """То же, что propagate_elements, но орбиты рассчитываются по одной на группу симметрии.
+
+    Для каждой группы (см. symmetry_groups) опорная орбита рассчитывается только в нужных
+    отсчётах, а трассы слотов получаются выборкой с учётом сдвига по времени и сдвигом долготы
+    на разницу узлов и поворот Земли. Если сетка времени неравномерная, используются только
+    сдвиги узла. Возвращает два массива формы (n_sats, n_steps) в градусах.
+    """
+    t = np.asarray(time_steps, dtype=float)
+    n_sats, n_steps = len(elements["semi_major_axis"]), t.size
+    step = uniform_step(t)  # None - сдвиги по времени не используются (см. symmetry_groups)
+    longitudes = np.empty((n_sats, n_steps))
+    latitudes = np.empty((n_sats, n_steps))
+    angles = sidereal_angles(jd, t)
+    computed = 0
+    direct = np.ones(n_sats, dtype=bool)  # Слоты, для которых повторное использование ничего не даёт
+    for group in symmetry_groups(elements, jd, t, j2):
+        direct[group.members] = False
+        span = group.period or n_steps + int(group.shifts.max(initial=0))
+        needed = np.zeros(span, dtype=bool)
+        for _, index in _member_blocks(group, n_steps):
+            needed[index] = True
+        samples = np.flatnonzero(needed)
+        position = np.cumsum(needed) - 1  # Номер отсчёта опорной орбиты среди рассчитанных
+        computed += samples.size
+
+        sample_times = t[0] + step * samples if step is not None else t[samples]
+        x, y, z, _ = _orbit_coordinates(*(group.reference[key] for key in (
+            "semi_major_axis", "eccentricity", "longitude_of_ascending_node", "argument_pericenter",
+            "inclination", "mean_anomaly")), sample_times, j2)
+        if geodetic:
+            right_ascension, latitude, _ = geodetic_coordinates(x, y, z)
+        else:
+            right_ascension, latitude = spherical_coordinates(x, y, z)
+        right_ascension = np.radians(right_ascension)
+
+        # Звездное время за вычетом смещения узла (J2), приведённое к [0, 2π) для точности
+        rotation = np.mod(angles - group.node_rate * t, 2 * np.pi)
+        for block, index in _member_blocks(group, n_steps):
+            rows = group.members[block]
+            lon = right_ascension[position[index]]
+            lon += group.node_offsets[block, np.newaxis] + np.pi
+            lon -= rotation
+            np.mod(lon, 2 * np.pi, out=lon)
+            lon -= np.pi
+            longitudes[rows] = np.degrees(lon, out=lon)
+            latitudes[rows] = latitude[position[index]]
+    if direct.any():
+        # Такие слоты рассчитываются вместе одним векторизованным проходом
+        rows = np.flatnonzero(direct)
+        subset = {key: np.asarray(value)[rows] for key, value in elements.items()}
+        longitudes[rows], latitudes[rows] = propagate_elements(subset, jd, t, geodetic=geodetic, j2=j2)
+        computed += rows.size * n_steps
+    if return_info:
+        return longitudes, latitudes, computed
+    return longitudes, latitudes
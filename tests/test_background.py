@@ -0,0 +1,48 @@
+import os
+
+import numpy as np
+import pytest
+
+import background
+from background import map_pyramid
+
+
+@pytest.fixture
+def image_path(tmp_path):
+    from matplotlib.image import imsave
+    path = str(tmp_path / "map.png")
+    imsave(path, np.random.default_rng(0).random((512, 1024, 3)))
+    yield path
+    map_pyramid.cache_clear()
+    background.load_map_image.cache_clear()
+
+
+def test_pyramid_is_reused_from_disk(tmp_path, image_path):
+    cache_dir = str(tmp_path / "cache")
+    levels = map_pyramid(image_path, cache_dir)
+    assert [level.shape[1] for level in levels] == [1024, 512, 256]
+    assert [name for name in os.listdir(cache_dir) if name.startswith("tmp_")] == []
+    map_pyramid.cache_clear()
+    reloaded = map_pyramid(image_path, cache_dir)
+    assert all(isinstance(level, np.memmap) for level in reloaded)
+    assert all(np.array_equal(a, b) for a, b in zip(levels, reloaded))
+
+
+def test_interrupted_write_leaves_no_partial_pyramid(tmp_path, image_path, monkeypatch):
+    cache_dir = str(tmp_path / "cache")
+    save = np.save
+    calls = []
+
+    def failing_save(path, level):
+        calls.append(path)
+        if len(calls) == 2:
+            raise OSError("disk full")
+        save(path, level)
+
+    monkeypatch.setattr(np, "save", failing_save)
+    assert len(map_pyramid(image_path, cache_dir)) == 3  # Пирамида всё равно возвращается из памяти
+    assert os.listdir(cache_dir) == []  # Ни неполного каталога уровней, ни временного каталога
+    monkeypatch.setattr(np, "save", save)
+    map_pyramid.cache_clear()
+    assert len(map_pyramid(image_path, cache_dir)) == 3
+    assert len(os.listdir(cache_dir)) == 1
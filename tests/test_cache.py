@@ -0,0 +1,25 @@
+import numpy as np
+
+from cache import TrackCache, track_key
+from constants import GLONASS
+from utilities import propagate_constellation
+
+JD = 2460733.5
+
+
+def test_j2_is_part_of_the_key():
+    t = np.linspace(0.0, GLONASS.T, 11)
+    assert track_key([GLONASS], JD, t) != track_key([GLONASS], JD, t, j2=True)
+
+
+def test_get_or_compute_keeps_j2_and_two_body_apart(tmp_path):
+    t = np.linspace(0.0, 10 * GLONASS.T, 11)
+    cache = TrackCache(directory=str(tmp_path))
+    two_body = cache.get_or_compute([GLONASS], JD, t)
+    with_j2 = cache.get_or_compute([GLONASS], JD, t, j2=True)
+    assert np.allclose(with_j2[0], propagate_constellation([GLONASS], JD, t, j2=True)[0])
+    assert not np.allclose(two_body[0], with_j2[0])
+    # Дисковый уровень тоже хранит их раздельно
+    disk = TrackCache(directory=str(tmp_path))
+    assert np.array_equal(disk.get_or_compute([GLONASS], JD, t, j2=True)[0], with_j2[0])
+    assert disk.disk_hits == 1 and len(list(tmp_path.glob("*.npz"))) == 2
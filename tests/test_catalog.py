@@ -0,0 +1,80 @@
+import json
+
+import numpy as np
+import pytest
+
+from catalog import CatalogError, parse_omm_json, parse_omm_kvn, parse_omm_xml, parse_tle
+
+NAME = "ISS (ZARYA)"
+LINE1 = "1 25544U 98067A   08264.51782528 -.00002182  00000-0 -11606-4 0  2927"
+LINE2 = "2 25544  51.6416 247.4627 0006703 130.5360 325.0288 15.72125391563537"
+EPOCH_JD = 2454730.01782528  # 2008, день 264.51782528 (20 сентября 12:25:40.104 UTC)
+SEMI_MAJOR_AXIS = 6730.96067694  # Для 15.72125391 оборотов в сутки
+
+
+def with_checksum(line):
+    # Строка TLE с пересчитанной контрольной цифрой: сумма цифр, "-" считается за 1
+    body = line[:68]
+    total = sum(int(c) for c in body if c.isdigit()) + body.count("-")
+    return body + str(total % 10)
+
+
+def check_iss(table, number=25544):
+    assert table.names == [NAME]
+    row = table.data[0]
+    assert row["number"] == number
+    assert np.isclose(row["epoch"], EPOCH_JD, rtol=0.0, atol=1e-8)
+    assert np.isclose(row["semi_major_axis"], SEMI_MAJOR_AXIS, rtol=0.0, atol=1e-6)
+    assert np.isclose(row["eccentricity"], 0.0006703)
+    assert (row["inclination"], row["longitude_of_ascending_node"]) == (51.6416, 247.4627)
+    assert (row["argument_pericenter"], row["mean_anomaly"]) == (130.536, 325.0288)
+
+
+def test_two_line_tle():
+    table = parse_tle(f"{LINE1}\n{LINE2}\n")
+    assert table.names == ["25544"]
+    assert table.data[0]["number"] == 25544
+
+
+def test_three_line_tle():
+    check_iss(parse_tle(f"{NAME}\n{LINE1}\n{LINE2}\n"))
+
+
+def test_alpha5_catalog_number():
+    line1 = with_checksum(LINE1.replace("25544", "A0000", 1))
+    line2 = with_checksum(LINE2.replace("25544", "A0000", 1))
+    check_iss(parse_tle(f"{NAME}\n{line1}\n{line2}\n"), number=100000)
+
+
+def test_bad_checksum():
+    line2 = LINE2[:68] + str((int(LINE2[68]) + 1) % 10)
+    with pytest.raises(CatalogError, match="checksum"):
+        parse_tle(f"{NAME}\n{LINE1}\n{line2}\n")
+
+
+def test_malformed_field():
+    line2 = with_checksum(LINE2[:8] + " 51.6x16" + LINE2[16:])
+    with pytest.raises(CatalogError, match="inclination"):
+        parse_tle(f"{NAME}\n{LINE1}\n{line2}\n")
+
+
+OMM = {"OBJECT_NAME": NAME, "NORAD_CAT_ID": "25544", "EPOCH": "2008-09-20T12:25:40.104192",
+       "MEAN_MOTION": "15.72125391", "ECCENTRICITY": "0.0006703", "INCLINATION": "51.6416",
+       "RA_OF_ASC_NODE": "247.4627", "ARG_OF_PERICENTER": "130.5360", "MEAN_ANOMALY": "325.0288"}
+
+
+def test_omm_json():
+    check_iss(parse_omm_json(json.dumps([OMM])))
+
+
+def test_omm_xml():
+    fields = "".join(f"<{key}>{value}</{key}>" for key, value in OMM.items())
+    text = (f'<?xml version="1.0"?><ndm xmlns="urn:ccsds"><omm><body><segment>'
+            f'<data>{fields}</data></segment></body></omm></ndm>')
+    check_iss(parse_omm_xml(text))
+
+
+def test_omm_kvn():
+    lines = ["CCSDS_OMM_VERS = 2.0"] + [f"{key} = {value}" for key, value in OMM.items()]
+    lines[lines.index("MEAN_MOTION = 15.72125391")] = "MEAN_MOTION = 15.72125391 [rev/day]"
+    check_iss(parse_omm_kvn("\n".join(lines)))
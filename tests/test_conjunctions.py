@@ -0,0 +1,29 @@
+import numpy as np
+
+from conjunctions import screen_conjunctions
+from constants import R
+
+JD = 2460733.5
+
+
+def random_catalog(count, seed):
+    """Случайные орбиты в слое LEO 400-1200 км."""
+    rng = np.random.default_rng(seed)
+    return dict(
+        semi_major_axis=R + rng.uniform(400, 1200, count),
+        eccentricity=rng.uniform(0, 0.02, count),
+        inclination=np.degrees(np.arccos(rng.uniform(-1, 1, count))),
+        longitude_of_ascending_node=rng.uniform(0, 360, count),
+        argument_pericenter=rng.uniform(0, 360, count),
+        mean_anomaly=rng.uniform(0, 360, count),
+    )
+
+
+def test_hash_grid_matches_all_pairs():
+    elements = random_catalog(300, seed=1)
+    found = screen_conjunctions(elements, JD, 3600.0, 100.0)
+    brute = screen_conjunctions(elements, JD, 3600.0, 100.0, brute_force=True)
+    assert len(found) > 0
+    assert np.array_equal(found["first"], brute["first"]) and np.array_equal(found["second"], brute["second"])
+    assert np.allclose(found["tca"], brute["tca"], rtol=0.0, atol=1e-6)
+    assert np.allclose(found["distance"], brute["distance"], rtol=0.0, atol=1e-9)
@@ -0,0 +1,16 @@
+import numpy as np
+import pytest
+
+from constellation import ConstellationTable
+
+
+def test_walker_phasing():
+    table = ConstellationTable.walker("Walker", 24, 3, 1, 56.0, 29600.0)
+    # Сдвиг фаз между соседними плоскостями равен f*360/t
+    assert np.allclose(table.data["mean_anomaly"][[0, 8, 16]], [0.0, 15.0, 30.0])
+
+
+@pytest.mark.parametrize("phasing", [-1, 3, 7, 1.5, 1.0, True])
+def test_walker_rejects_invalid_phasing(phasing):
+    with pytest.raises(ValueError, match="phasing"):
+        ConstellationTable.walker("Walker", 24, 3, phasing, 56.0, 29600.0)
@@ -0,0 +1,33 @@
+import numpy as np
+
+from constants import GPS
+from coverage import coverage_grid
+from transforms import geodetic_to_ecef
+from utilities import ecef_positions, satellite_slots
+
+JD = 2460733.5
+MASK = 10.0
+
+
+def test_satellites_in_view_matches_elevation():
+    elements = satellite_slots([GPS])
+    t = np.linspace(0.0, 6 * 3600.0, 7)
+    coverage = coverage_grid(elements, JD, t, resolution=10.0, elevation_mask=MASK, min_satellites=4)
+
+    # Прямой расчёт угла места каждого спутника из каждого узла сетки
+    lon, lat = np.meshgrid(coverage.longitudes, coverage.latitudes)
+    points = np.stack(geodetic_to_ecef(lon, lat, 0.0), axis=-1)[..., np.newaxis, np.newaxis, :]
+    lon_r, lat_r = np.radians(lon), np.radians(lat)
+    up = np.stack([np.cos(lat_r) * np.cos(lon_r), np.cos(lat_r) * np.sin(lon_r), np.sin(lat_r)], axis=-1)
+    rows = {key: value[:, np.newaxis] for key, value in elements.items()}
+    satellites = np.stack(ecef_positions(rows, JD, t, False), axis=-1)  # (n_sats, n_epochs, 3)
+    d = satellites - points
+    elevation = np.degrees(np.arcsin((d * up[..., np.newaxis, np.newaxis, :]).sum(axis=-1)
+                                     / np.linalg.norm(d, axis=-1)))
+    count = (elevation >= MASK).sum(axis=2)  # (n_lat, n_lon, n_epochs)
+
+    assert np.array_equal(coverage.minimum, count.min(axis=-1))
+    assert np.array_equal(coverage.maximum, count.max(axis=-1))
+    assert np.allclose(coverage.mean, count.mean(axis=-1))
+    assert np.allclose(coverage.coverage, 100.0 * (count >= 4).mean(axis=-1))
+    assert coverage.maximum.max() >= 4
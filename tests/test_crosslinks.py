@@ -0,0 +1,36 @@
+import numpy as np
+
+import crosslinks
+from constellation import ConstellationTable
+from crosslinks import line_of_sight_graph
+
+JD = 2460733.5
+
+
+def pair(mean_anomalies):
+    # Два спутника на одной круговой орбите высотой около 600 км
+    return dict(semi_major_axis=np.full(2, 6978.0), eccentricity=np.zeros(2), inclination=np.full(2, 53.0),
+                longitude_of_ascending_node=np.zeros(2), argument_pericenter=np.zeros(2),
+                mean_anomaly=np.asarray(mean_anomalies, dtype=float))
+
+
+def test_earth_blocks_opposite_satellites():
+    graph = line_of_sight_graph(pair([0.0, 180.0]), JD, [0.0, 600.0])
+    assert np.array_equal(graph.offsets, [0, 0, 0])
+
+
+def test_adjacent_satellites_are_linked():
+    graph = line_of_sight_graph(pair([0.0, 10.0]), JD, [0.0, 600.0])
+    assert np.array_equal(graph.offsets, [0, 1, 2])
+    assert np.array_equal(graph.first, [0, 0]) and np.array_equal(graph.second, [1, 1])
+
+
+def test_row_blocks_match_single_block(monkeypatch):
+    table = ConstellationTable.walker("LEO", 60, 6, 1, 86.4, 7158.0)
+    t = np.linspace(0.0, table.periods[0], 7)
+    whole = line_of_sight_graph(table.elements(), JD, t)
+    monkeypatch.setattr(crosslinks, "CHUNK_ELEMENTS", 200)  # Меньше 60² пар: моменты делятся на блоки по 3 строки
+    blocks = line_of_sight_graph(table.elements(), JD, t)
+    assert whole.first.size > 0
+    assert np.array_equal(blocks.offsets, whole.offsets)
+    assert np.array_equal(blocks.first, whole.first) and np.array_equal(blocks.second, whole.second)
@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from utilities import calculate_coordinates, j2_secular_rates
+
+# Опорные скорости прецессии узла (градусов в сутки) для номинальных круговых орбит:
+#   GPS - OMEGADOT из альманаха GPS, около -7.74e-9 рад/с (-0.0383°/сут), a = 26 560 км, i = 55°;
+#   ГЛОНАСС - около -0.593e-3 рад/сут (-0.0340°/сут), a = 25 510 км, i = 64.8°
+ORBITS = [(26560.0, 55.0, -0.0383), (25510.0, 64.8, -0.0340)]
+REFERENCE_TOLERANCE = 0.05  # Номинальные орбиты отличаются от реальных
+DAYS = 30.0
+
+
+def node_rate(a, inclination, j2):
+    """Скорость прецессии узла (градусов в сутки) по вектору момента импульса h = r x v."""
+    t = np.linspace(0.0, DAYS * 86400.0, 200)
+    position = lambda dt: np.stack(calculate_coordinates(a, 0.0, 0.0, 0.0, inclination, 0.0, t + dt, j2=j2))
+    h = np.cross(position(0.0), position(0.5) - position(-0.5), axis=0)
+    node = np.unwrap(np.arctan2(h[0], -h[1]))
+    return np.degrees(np.polyfit(t / 86400.0, node, 1)[0])
+
+
+@pytest.mark.parametrize("a, inclination, reference", ORBITS)
+def test_node_regression_matches_reference(a, inclination, reference):
+    formula = np.degrees(j2_secular_rates(a, 0.0, inclination)[0]) * 86400.0
+    measured = node_rate(a, inclination, j2=True)
+    assert abs(formula / reference - 1) < REFERENCE_TOLERANCE
+    assert abs(measured / formula - 1) < 1e-3
+    assert abs(node_rate(a, inclination, j2=False)) < 1e-6
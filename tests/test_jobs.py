@@ -0,0 +1,17 @@
+import numpy as np
+from astropy.time import Time
+
+from constants import GPS, IRNSS_GEOSYNC
+from jobs import TrackJob
+from utilities import propagate_constellation
+
+
+def test_track_job_matches_propagation():
+    date = Time("2025-03-01T00:00:00", scale="utc")
+    job = TrackJob([GPS, IRNSS_GEOSYNC], date, 0.01, workers=1)
+    job.run()
+    assert job.error is None and job.progress == 1.0
+    for satellite, steps, longitudes, latitudes in zip(job.satellites, job.time_steps, job.longitudes, job.latitudes):
+        expected_longitudes, expected_latitudes = propagate_constellation([satellite], date, steps)
+        assert np.allclose(longitudes, expected_longitudes, rtol=0.0, atol=1e-9)
+        assert np.allclose(latitudes, expected_latitudes, rtol=0.0, atol=1e-9)
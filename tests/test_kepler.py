@@ -0,0 +1,26 @@
+import numpy as np
+from astropy.time import Time
+
+from constants import IRNSS_GEOSYNC
+from utilities import propagate_constellation, solve_kepler_newton
+
+# Эталонные значения после перевода решателя в радианы: по ним видно, какое изменение сдвинуло трассы
+ANOMALIES = [0.5, 1.5, 3.0, 4.5]
+ECCENTRIC_ANOMALIES = [1.048946019047839, 2.059195877328555, 3.054855637572305, 4.014726672575895]
+LATITUDES = [0.039290349181, 14.014451159, -0.0019814313304, -14.019812046, 0.039290349181]
+
+
+def test_solve_kepler_newton_in_radians():
+    e = IRNSS_GEOSYNC.eccentricity
+    for M, expected in zip(ANOMALIES, ECCENTRIC_ANOMALIES):
+        E = solve_kepler_newton(M, e)
+        assert abs(E - e * np.sin(E) - M) < 1e-12
+        assert np.isclose(E, expected, rtol=0.0, atol=1e-12)
+
+
+def test_irnss_geosynchronous_latitudes():
+    t = np.linspace(0.0, IRNSS_GEOSYNC.T, 5)
+    _, latitudes = propagate_constellation([IRNSS_GEOSYNC], Time("2025-03-01T00:00:00", scale="utc"), t)
+    # Широта не зависит от звездного времени, поэтому закрепляет только решение уравнения Кеплера
+    assert np.allclose(latitudes[0], LATITUDES, rtol=0.0, atol=1e-8)
+    assert np.allclose(latitudes[1], np.negative(LATITUDES), rtol=0.0, atol=1e-8)
@@ -0,0 +1,23 @@
+import numpy as np
+
+from constants import GM, R, W, WGS84_A
+from passes import GroundStation, predict_passes
+
+JD = 2460733.5
+ALTITUDE = 700.0  # Высота круговой экваториальной орбиты (в км)
+MASK = 10.0
+
+
+def test_overhead_pass_is_symmetric():
+    elements = dict(semi_major_axis=np.array([R + ALTITUDE]), eccentricity=np.zeros(1), inclination=np.zeros(1),
+                    longitude_of_ascending_node=np.zeros(1), argument_pericenter=np.zeros(1),
+                    mean_anomaly=np.zeros(1))
+    # Станция на экваторе: каждый пролёт экваториального спутника проходит через зенит
+    passes = predict_passes(elements, [GroundStation("Equator", 0.0, 30.0, elevation_mask=MASK)], JD, 86400.0)
+    assert len(passes) > 10
+    assert np.all(passes["max_elevation"] > 89.99)
+    assert np.allclose(passes["aos"] + passes["los"], 2 * passes["culmination"], rtol=0.0, atol=0.05)
+    # Длительность: дуга видимости 2λ, пройденная с относительной угловой скоростью n - W
+    r = R + ALTITUDE
+    arc = 2 * (np.arccos(WGS84_A * np.cos(np.radians(MASK)) / r) - np.radians(MASK))
+    assert np.allclose(passes["duration"], arc / (np.sqrt(GM / r**3) - W), rtol=1e-4)
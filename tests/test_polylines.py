@@ -0,0 +1,19 @@
+import numpy as np
+
+from polylines import split_antimeridian
+
+
+def test_eastward_crossing():
+    lon, lat, index = split_antimeridian([178.0, 179.0, -178.0, -177.0], [10.0, 11.0, 14.0, 15.0], return_index=True)
+    # Переход 179° -> -178°: до края 1° из 3°, широта интерполируется на треть шага
+    assert np.array_equal(lon, [178.0, 179.0, 180.0, np.nan, -180.0, -178.0, -177.0], equal_nan=True)
+    assert np.allclose(lat, [10.0, 11.0, 12.0, np.nan, 12.0, 14.0, 15.0], equal_nan=True)
+    assert np.array_equal(index, [0, 1, 5, 6])
+
+
+def test_westward_crossing_and_padding():
+    lon, lat = split_antimeridian([[-179.0, 179.0, 178.0], [10.0, 20.0, 30.0]], [[0.0, 4.0, 5.0], [0.0, 1.0, 2.0]])
+    assert np.array_equal(lon[0], [-179.0, -180.0, np.nan, 180.0, 179.0, 178.0], equal_nan=True)
+    assert np.allclose(lat[0], [0.0, 2.0, np.nan, 2.0, 4.0, 5.0], equal_nan=True)
+    # Строка без перехода дополняется NaN до общей длины
+    assert np.array_equal(lon[1], [10.0, 20.0, 30.0, np.nan, np.nan, np.nan], equal_nan=True)
@@ -0,0 +1,26 @@
+import numpy as np
+from astropy.time import Time
+
+from constants import GPS
+from utilities import calculate_siderial_time, propagate_constellation
+
+# Эталонные значения после перевода звездного времени в радианы: по ним видно, какое изменение сдвинуло трассы
+LONGITUDES = [-159.0479742923, -83.9102739786, -54.3410307286, 20.7869669789]
+
+
+def test_sidereal_time_at_j2000():
+    # GMST в момент J2000.0 (12h UT1 1 января 2000 года) равно 280.46061837504°
+    assert np.isclose(calculate_siderial_time(2451545.0, 0.0), np.radians(280.46061837504), rtol=0.0, atol=1e-10)
+
+
+def test_sidereal_time_series():
+    t = np.array([0.0, 3600.0, 43200.0])
+    expected = [2.7759943950967845, 3.0385105350967843, 5.926188075096785]
+    assert np.allclose(calculate_siderial_time(2460735.5, t), expected, rtol=0.0, atol=1e-10)
+
+
+def test_gps_longitudes():
+    t = np.linspace(0.0, GPS.T, 4)
+    longitudes, _ = propagate_constellation([GPS], Time("2025-03-01T00:00:00", scale="utc"), t)
+    # Орбита GPS круговая, поэтому долгота закрепляет только звездное время
+    assert np.allclose(longitudes[0], LONGITUDES, rtol=0.0, atol=1e-8)
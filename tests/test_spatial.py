@@ -0,0 +1,39 @@
+import numpy as np
+
+from spatial import TrackIndex
+from transforms import ground_distance
+
+
+def tracks(seed=0):
+    # Трассы, часто пересекающие антимеридиан, и NaN ещё не рассчитанных отсчётов
+    rng = np.random.default_rng(seed)
+    longitudes = rng.uniform(-180.0, 180.0, (20, 300))
+    latitudes = rng.uniform(-80.0, 80.0, (20, 300))
+    longitudes[:, 250:] = np.nan
+    return longitudes, latitudes
+
+
+def as_set(satellite, step):
+    return set(zip(satellite.tolist(), step.tolist()))
+
+
+def test_bbox_across_antimeridian():
+    longitudes, latitudes = tracks()
+    index = TrackIndex(longitudes, latitudes)
+    lon_min, lon_max, lat_min, lat_max = 170.0, -165.0, -20.0, 30.0
+    inside = ((longitudes >= lon_min) | (longitudes <= lon_max)) & (latitudes >= lat_min) & (latitudes <= lat_max)
+    found = as_set(*index.query_bbox(lon_min, lon_max, lat_min, lat_max))
+    assert len(found) > 0
+    assert found == as_set(*np.nonzero(inside))
+
+
+def test_radius_across_antimeridian():
+    longitudes, latitudes = tracks(seed=1)
+    index = TrackIndex(longitudes, latitudes)
+    for lon, lat in [(179.5, 10.0), (-179.0, -45.0), (180.0, 60.0)]:
+        distance = ground_distance(lon, lat, longitudes, latitudes)
+        inside = distance <= 1500.0
+        satellite, step, found_distance = index.query_radius(lon, lat, 1500.0)
+        assert len(satellite) > 0
+        assert as_set(satellite, step) == as_set(*np.nonzero(inside))
+        assert np.allclose(np.sort(found_distance), np.sort(distance[inside]))
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from constants import IRNSS_GEOSYNC
+from constellation import ConstellationTable
+from symmetry import propagate_symmetric
+from utilities import propagate_elements
+
+JD = 2460733.5
+TOLERANCE = 1e-9  # Допустимое расхождение долготы и широты (в градусах)
+
+
+def assert_same_tracks(elements, t, j2=False):
+    longitudes, latitudes = propagate_elements(elements, JD, t, j2=j2)
+    symmetric_longitudes, symmetric_latitudes, computed = propagate_symmetric(elements, JD, t, j2=j2,
+                                                                             return_info=True)
+    assert np.abs((symmetric_longitudes - longitudes + 180.0) % 360.0 - 180.0).max() < TOLERANCE
+    assert np.abs(symmetric_latitudes - latitudes).max() < TOLERANCE
+    return computed
+
+
+def test_walker_circular():
+    table = ConstellationTable.walker("Walker", 24, 3, 1, 56.0, 29600.0)
+    t = table.periods[0] / 100 * np.arange(301)  # Три витка, шаг делит период
+    computed = assert_same_tracks(table.elements(), t)
+    assert computed < 24 * t.size // 10  # Рассчитывается только виток опорной орбиты каждой группы
+
+
+@pytest.mark.parametrize("j2", [False, True])
+def test_eccentric(j2):
+    table = ConstellationTable.from_configs([IRNSS_GEOSYNC])
+    t = table.periods[0] / 200 * np.arange(601)
+    assert_same_tracks(table.elements(), t, j2=j2)
+
+
+@pytest.mark.parametrize("j2", [False, True])
+def test_step_not_dividing_period(j2):
+    table = ConstellationTable.walker("Walker", 24, 3, 1, 56.0, 29600.0)
+    t = np.arange(0.0, 2 * 86400.0 + 1, 60.0)
+    assert (table.periods[0] / 60.0) % 1 != 0
+    assert_same_tracks(table.elements(), t, j2=j2)
@@ -0,0 +1,134 @@
+from typing import Optional, Sequence
+
+import numpy as np  # Импортируем библиотеку NumPy для работы с массивами
+
+from constants import R, WGS84_A, WGS84_F
+
+# Параметры эллипсоида WGS-84
+WGS84_B = WGS84_A * (1 - WGS84_F)  # Полярная полуось (в км)
+WGS84_E2 = WGS84_F * (2 - WGS84_F)  # Квадрат первого эксцентриситета
+WGS84_EP2 = WGS84_E2 / (1 - WGS84_E2)  # Квадрат второго эксцентриситета
+
+
+def _buffer(out: Optional[Sequence[np.ndarray]], index: int):
+    return None if out is None else out[index]
+
+
+def _wrapped_angles(angles, dtype):
+    # Угол приводится к [0, 2π) в float64 до перехода к dtype: непрерывное звездное время
+    # за годы достигает 10^4 рад, и в float32 потерялась бы точность
+    return np.mod(np.asarray(angles, dtype=float), 2 * np.pi).astype(dtype, copy=False)
+
+
+def eci_to_ecef(
+    positions,  # Координаты в ECI, массив (..., 3)
+    angles,  # Звездное время (в радианах) для каждого отсчёта, форма positions[..., 0] или совместимая
+    out: Optional[np.ndarray] = None,  # Массив для результата той же формы, что и positions
+    dtype=np.float64  # Тип вычислений: np.float64 или np.float32
+):
+    """Поворот вокруг оси Z на угол звездного времени без построения матриц 3x3."""
+    positions = np.asarray(positions, dtype=dtype)
+    if out is None:
+        out = np.empty(positions.shape, dtype=dtype)
+    H = _wrapped_angles(angles, dtype)
+    cos_H, sin_H = np.cos(H), np.sin(H)
+    x, y = positions[..., 0], positions[..., 1]
+    x_rot = cos_H * x + sin_H * y  # Промежуточные значения нужны, если out совпадает с positions
+    y_rot = cos_H * y - sin_H * x
+    out[..., 0] = x_rot
+    out[..., 1] = y_rot
+    if out is not positions:
+        out[..., 2] = positions[..., 2]
+    return out
+
+
+def _longitudes(x, y, angles, out, dtype):
+    # Долгота в земной системе - это долгота в ECI минус звездное время, поворот координат не нужен
+    lon = np.arctan2(y, x, out=out)
+    if angles is not None:
+        lon -= _wrapped_angles(angles, dtype)
+        lon += np.pi
+        np.mod(lon, 2 * np.pi, out=lon)
+        lon -= np.pi
+    return np.degrees(lon, out=lon)
+
+
+def spherical_coordinates(
+    x, y, z,  # Координаты в ECI (angles задан) или ECEF (angles=None), массивы одной формы (в км)
+    angles=None,  # Звездное время (в радианах), совместимое по форме с x
+    out: Optional[Sequence[np.ndarray]] = None,  # Буферы (долготы, широты)
+    dtype=np.float64  # Тип вычислений: np.float64 или np.float32
+):
+    """Долготы и геоцентрические широты (в градусах), как в прежнем расчёте через arctan2 и arcsin."""
+    x, y, z = (np.asarray(c, dtype=dtype) for c in (x, y, z))
+    lon = _longitudes(x, y, angles, _buffer(out, 0), dtype)
+    lat = np.hypot(x, y, out=_buffer(out, 1))
+    np.arctan2(z, lat, out=lat)  # Равно arcsin(z / r), но без вычисления r
+    return lon, np.degrees(lat, out=lat)
+
+
+def geodetic_coordinates(
+    x, y, z,  # Координаты в ECI (angles задан) или ECEF (angles=None), массивы одной формы (в км)
+    angles=None,  # Звездное время (в радианах), совместимое по форме с x
+    out: Optional[Sequence[np.ndarray]] = None,  # Буферы (долготы, широты, высоты)
+    dtype=np.float64  # Тип вычислений: np.float64 или np.float32
+):
+    """Долготы, геодезические широты (в градусах) и высоты над эллипсоидом WGS-84 (в км).
+
+    Замкнутое решение Хейккинена (Heikkinen, 1982), без итераций.
+    """
+    x, y, z = (np.asarray(c, dtype=dtype) for c in (x, y, z))
+    a, b, e2 = WGS84_A, WGS84_B, WGS84_E2
+    lon = _longitudes(x, y, angles, _buffer(out, 0), dtype)
+
+    p = np.hypot(x, y)  # Расстояние от оси вращения не зависит от поворота Земли
+    z2 = z * z
+    F = 54 * b**2 * z2
+    G = p * p + (1 - e2) * z2 - e2 * (a**2 - b**2)
+    c = e2**2 * F * p * p / G**3
+    s = np.cbrt(1 + c + np.sqrt(c * c + 2 * c))
+    k = s + 1 + 1 / s
+    P = F / (3 * k * k * G * G)
+    Q = np.sqrt(1 + 2 * e2**2 * P)
+    r0 = -P * e2 * p / (1 + Q) + np.sqrt(a**2 / 2 * (1 + 1 / Q) - P * (1 - e2) * z2 / (Q * (1 + Q)) - P * p * p / 2)
+    d2 = (p - e2 * r0)**2
+    V = np.sqrt(d2 + (1 - e2) * z2)
+    z0 = b**2 * z / (a * V)
+
+    lat = np.arctan2(z + WGS84_EP2 * z0, p, out=_buffer(out, 1))
+    alt = np.sqrt(d2 + z2, out=_buffer(out, 2))
+    alt *= 1 - b**2 / (a * V)
+    return lon, np.degrees(lat, out=lat), alt
+
+
+def eci_to_geographic(
+    positions,  # Координаты в ECI, массив (..., 3) (в км)
+    angles,  # Звездное время (в радианах) для каждого отсчёта
+    geodetic: bool = False,  # True - широта и высота над эллипсоидом WGS-84, False - сферическая широта
+    out: Optional[Sequence[np.ndarray]] = None,  # Буферы результатов формы positions[..., 0]
+    dtype=np.float64  # Тип вычислений: np.float64 или np.float32
+):
+    """ECI → ECEF → географические координаты одним проходом.
+
+    Возвращает (долготы, широты) или, при geodetic=True, (долготы, широты, высоты).
+    """
+    positions = np.asarray(positions)
+    x, y, z = positions[..., 0], positions[..., 1], positions[..., 2]
+    if geodetic:
+        return geodetic_coordinates(x, y, z, angles, out=out, dtype=dtype)
+    return spherical_coordinates(x, y, z, angles, out=out, dtype=dtype)
+
+
+def ground_distance(lon1, lat1, lon2, lat2, radius: float = R):
+    """Расстояние по дуге большого круга (в км) между точками, заданными в градусах (формула гаверсинусов)."""
+    lon1, lat1, lon2, lat2 = (np.radians(c) for c in (lon1, lat1, lon2, lat2))
+    h = np.sin((lat2 - lat1) / 2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2)**2
+    return 2 * radius * np.arcsin(np.sqrt(np.minimum(h, 1.0)))
+
+
+def geodetic_to_ecef(lon, lat, alt=0.0):
+    """Координаты ECEF (в км) точки с геодезическими долготой и широтой (в градусах) и высотой над WGS-84 (в км)."""
+    lon, lat = np.radians(lon), np.radians(lat)
+    N = WGS84_A / np.sqrt(1 - WGS84_E2 * np.sin(lat)**2)  # Радиус кривизны первого вертикала
+    return ((N + alt) * np.cos(lat) * np.cos(lon), (N + alt) * np.cos(lat) * np.sin(lon),
+            (N * (1 - WGS84_E2) + alt) * np.sin(lat))
@@ -1,17 +1,24 @@
+from __future__ import annotations  # Аннотации не вычисляются при импорте, поэтому astropy нужен только для проверки типов
+
 import numpy as np  # Импортируем библиотеку NumPy для работы с массивами и математическими функциями
-from astropy.time import Time  # Импортируем класс Time из библиотеки Astropy для работы с астрономическим временем
+from typing import TYPE_CHECKING, List  # Импортируем List для аннотаций типов
+
+if TYPE_CHECKING:
+    from astropy.time import Time  # Класс Time из библиотеки Astropy используется только в аннотациях
 
-from constants import GM, W, SatelliteConfig  # Импортируем константы GM, W и класс SatelliteConstants из модуля constants
+from constants import GM, J2, W, WGS84_A, SatelliteConfig  # Импортируем константы GM, J2, W и класс SatelliteConstants из модуля constants
+from sidereal import julian_date, sidereal_angles  # Векторизованное звездное время с кэшем по эпохам
+from transforms import geodetic_coordinates, spherical_coordinates  # Пакетный переход к географическим координатам
 
 # Метод Ньютона для решения уравнения Кеплера
 def solve_kepler_newton(M, e, tol=1e-15, max_iter=1000):
     # Задаём начальное приближение для эксцентрической аномалии, равное средней аномалии
     E = M
     for _ in range(max_iter):  # Запускаем цикл для итерационного решения до max_iter итераций
-        # Вычисляем значение функции f(E) = E - e*sin(E) - M, преобразуя угол в радианы
-        f_E = E - e * np.sin(np.radians(E)) - M
+        # Вычисляем значение функции f(E) = E - e*sin(E) - M (углы E и M в радианах)
+        f_E = E - e * np.sin(E) - M
         # Вычисляем значение производной функции f'(E) = 1 - e*cos(E)
-        f_prime_E = 1 - e * np.cos(np.radians(E))
+        f_prime_E = 1 - e * np.cos(E)
         
         # Обновляем значение E по формуле метода Ньютона
         E_next = E - f_E / f_prime_E
@@ -25,6 +32,41 @@ def solve_kepler_newton(M, e, tol=1e-15, max_iter=1000):
     # Возвращаем последнее значение E, если достигнуто максимальное число итераций
     return E
 
+def solve_kepler(M, e, tol=1e-14, max_iter=8, return_info=False):
+    """Решает уравнение Кеплера E - e*sin(E) = M сразу для массива средних аномалий (в радианах).
+
+    Начальное приближение Дэнби и итерации Галлея сходятся за 3-4 шага при любом e < 1,
+    уже сошедшиеся элементы из дальнейших итераций исключаются. При return_info=True
+    дополнительно возвращаются число итераций и максимальная невязка уравнения.
+    """
+    M = np.asarray(M, dtype=float)
+    e = np.broadcast_to(np.asarray(e, dtype=float), M.shape)
+    # Приводим аномалию к [-π, π], чтобы начальное приближение не зависело от числа витков
+    revolutions = 2 * np.pi * np.round(M / (2 * np.pi))
+    M_reduced = M - revolutions
+    # Начальное приближение Дэнби: E0 = M + 0.85*e*sign(sin M)
+    E = M_reduced + 0.85 * e * np.sign(np.sin(M_reduced))
+
+    active = np.flatnonzero(np.ones(M.shape, dtype=bool))  # Индексы ещё не сошедшихся элементов
+    E_flat, M_flat, e_flat = E.reshape(-1), M_reduced.reshape(-1), e.reshape(-1)
+    iterations = 0
+    while active.size and iterations < max_iter:
+        iterations += 1
+        E_a, e_a = E_flat[active], e_flat[active]
+        e_sin, e_cos = e_a * np.sin(E_a), e_a * np.cos(E_a)
+        f = E_a - e_sin - M_flat[active]  # f(E)
+        f_prime = 1 - e_cos  # f'(E)
+        delta = f / (f_prime - 0.5 * f * e_sin / f_prime)  # Поправка метода Галлея (использует f''(E) = e*sin(E))
+        E_flat[active] = E_a - delta
+        active = active[np.abs(delta) >= tol]  # Оставляем только несошедшиеся элементы
+
+    E = E_flat.reshape(M.shape) + revolutions
+    if not return_info:
+        return E[()]
+    residual = np.abs(E_flat - e_flat * np.sin(E_flat) - M_flat)
+    max_residual = float(residual.max()) if residual.size else 0.0
+    return E[()], iterations, max_residual
+
 def calculate_coordinate(
     semi_major_axis: float, # Длина полуоси орбиты (в км)
     eccentricity: float, # Эксцентриситет орбиты
@@ -46,7 +88,7 @@ def calculate_coordinate(
     
     M = M0 + n * delta_t  # Вычисляем среднюю аномалию в момент времени t, прибавляя прирост за время delta_t
     
-    E = solve_kepler_newton(M, eccentricity)  # Решаем уравнение Кеплера для нахождения эксцентрической аномалии E с помощью метода Ньютона
+    E = solve_kepler(M, eccentricity)  # Решаем уравнение Кеплера для нахождения эксцентрической аномалии E методом Галлея
     
     v = 2 * np.arctan(np.sqrt((1 + eccentricity) / (1 - eccentricity)) * np.tan(E / 2))  # Вычисляем истинную аномалию (v) через эксцентрическую аномалию
     
@@ -65,11 +107,9 @@ def calculate_coordinate(
     return x, y, z  # Возвращаем кортеж координат (x, y, z)
 
 def calculate_siderial_time(initial_date, t):
-    tu = (initial_date - 2451545.0) / 36525.0  # Вычисляем количество юлианских столетий, прошедших с эпохи J2000
-    H0 = 24110.54841 + 8640184.812866 * tu + 0.093104 * tu**2 - 6.21e-6 * tu**3  # Вычисляем начальное звездное время (в секундах) для эпохи J2000
-    
-    H = H0 + W * t  # Корректируем звездное время с учетом прошедшего времени t
-    return H  # Возвращаем вычисленное звездное время
+    # Звездное время (в радианах) в моменты t (в секундах) от юлианской даты initial_date; t - скаляр или массив.
+    # Полином начального звездного времени вычисляется один раз на эпоху (см. модуль sidereal)
+    return sidereal_angles(initial_date, t)
 
 def generate_transition_matrix(H):
     # Создаем матрицу перехода, которая осуществляет поворот координат на угол H вокруг оси Z
@@ -79,52 +119,186 @@ def generate_transition_matrix(H):
         [0, 0, 1]  # Ось z остаётся неизменной
     ])
     
+def satellite_slots(satellites: List[SatelliteConfig]):
+    """Разворачивает конфигурации в отдельные спутники (слоты) в порядке «Ω внешний, ω внутренний»."""
+    elements = {
+        "semi_major_axis": [],
+        "eccentricity": [],
+        "inclination": [],
+        "longitude_of_ascending_node": [],
+        "argument_pericenter": [],
+        "mean_anomaly": [],
+    }
+    for satellite in satellites:
+        # Тот же порядок перебора, что и во вложенных циклах calculate_longitudes_latitudes
+        for Omega in satellite.longitude_of_ascending_node:
+            for omega in satellite.argument_pericenter:
+                elements["semi_major_axis"].append(satellite.semi_major_axis)
+                elements["eccentricity"].append(satellite.eccentricity)
+                elements["inclination"].append(satellite.inclination)
+                elements["longitude_of_ascending_node"].append(Omega)
+                elements["argument_pericenter"].append(omega)
+                elements["mean_anomaly"].append(satellite.mean_anomaly)
+    return {key: np.array(values, dtype=float) for key, values in elements.items()}
+
+def j2_secular_rates(
+    semi_major_axis, # Большие полуоси (в км)
+    eccentricity, # Эксцентриситеты
+    inclination # Наклонения (в градусах)
+):
+    """Вековые скорости от J2 (в радианах в секунду): узла Ω, перицентра ω и средней аномалии M.
+
+    Скорость M - это среднее движение с поправкой J2 (Vallado, «Fundamentals of Astrodynamics», 9.41).
+    """
+    a = np.asarray(semi_major_axis, dtype=float)
+    e = np.asarray(eccentricity, dtype=float)
+    cos_i = np.cos(np.radians(inclination))
+    n = np.sqrt(GM / a**3)  # Невозмущённое среднее движение
+    k = 1.5 * J2 * (WGS84_A / (a * (1 - e**2)))**2 * n
+    Ω_dot = -k * cos_i
+    ω_dot = 0.5 * k * (5 * cos_i**2 - 1)
+    M_dot = n + 0.5 * k * np.sqrt(1 - e**2) * (3 * cos_i**2 - 1)
+    return Ω_dot, ω_dot, M_dot
+
+def calculate_coordinates(
+    semi_major_axis, # Длины полуосей орбит (в км), массив или скаляр
+    eccentricity, # Эксцентриситеты орбит
+    longitude_of_ascending_node, # Долготы восходящих узлов (в градусах)
+    argument_pericenter, # Аргументы перицентра (в градусах)
+    inclination, # Наклоны орбит (в градусах)
+    mean_anomaly, # Средние аномалии (в градусах)
+    delta_t, # Моменты времени от начального момента (в секундах)
+    j2: bool = False # True - учитывать вековые возмущения от сжатия Земли (J2)
+):
+    """Векторизованный аналог calculate_coordinate: аргументы совместимы по правилам broadcasting NumPy."""
+    x, y, z, node_shift = _orbit_coordinates(semi_major_axis, eccentricity, longitude_of_ascending_node,
+                                             argument_pericenter, inclination, mean_anomaly, delta_t, j2)
+    if j2:
+        # Смещение узла - поворот вокруг оси Z
+        cos_s, sin_s = np.cos(node_shift), np.sin(node_shift)
+        x, y = cos_s * x - sin_s * y, sin_s * x + cos_s * y
+    return x, y, z
+
+def _orbit_coordinates(semi_major_axis, eccentricity, longitude_of_ascending_node, argument_pericenter,
+                       inclination, mean_anomaly, delta_t, j2):
+    # Координаты ECI для узла на эпоху и смещение узла Ω̇·t (в радианах, 0 без J2). Смещение узла не
+    # применяется здесь: для долгот достаточно вычесть его из звездного времени, без поворота координат
+    e = np.asarray(eccentricity, dtype=float)
+    i = np.radians(inclination)
+    Ω = np.radians(longitude_of_ascending_node)
+    ω = np.radians(argument_pericenter)
+    M0 = np.radians(mean_anomaly)
+
+    if j2:
+        # Узел, перицентр и средняя аномалия меняются линейно со временем
+        Ω_dot, ω_dot, n = j2_secular_rates(semi_major_axis, e, inclination)
+        ω = ω + ω_dot * delta_t
+        node_shift = Ω_dot * delta_t
+    else:
+        n = np.sqrt(GM / np.asarray(semi_major_axis, dtype=float)**3)  # Среднее движение (радиан/с)
+        node_shift = 0.0
+    M = M0 + n * delta_t  # Средняя аномалия во все моменты времени
+    E = solve_kepler(M, e)  # Эксцентрическая аномалия сразу для всего массива
+
+    v = 2 * np.arctan(np.sqrt((1 + e) / (1 - e)) * np.tan(E / 2))  # Истинная аномалия
+    r = semi_major_axis * (1 - e**2) / (1 + e * np.cos(v))  # Радиальное расстояние
+    u = v + ω  # Аргумент широты
+
+    x_orb = r * np.cos(u)  # Координаты в орбитальной плоскости
+    y_orb = r * np.sin(u)
+
+    # Переход в инерциальную систему координат (ECI) без построения матриц
+    x = x_orb * np.cos(Ω) - y_orb * np.sin(Ω) * np.cos(i)
+    y = x_orb * np.sin(Ω) + y_orb * np.cos(Ω) * np.cos(i)
+    z = y_orb * np.sin(i)
+    return x, y, z, node_shift
+
+def epoch_offsets(epoch, jd: float):
+    """Время (в секундах) от эпох элементов до даты jd; NaN в epoch означает, что эпоха совпадает с jd."""
+    epoch = np.asarray(epoch, dtype=float)
+    return np.where(np.isnan(epoch), 0.0, (jd - epoch) * 86400.0)
+
+def propagate_elements(
+    elements: dict,  # Орбитальные элементы по слотам (как возвращает satellite_slots; "epoch" - необязательно)
+    jd: float,  # Начальная дата (юлианская дата)
+    time_steps: np.ndarray,  # Моменты времени от начальной даты (в секундах)
+    geodetic: bool = False,  # True - геодезические широты WGS-84 вместо геоцентрических
+    j2: bool = False  # True - вековые возмущения J2 (прецессия узла и перицентра), False - задача двух тел
+):
+    """Вычисляет долготы и широты всех слотов за один векторизованный проход.
+
+    Возвращает два массива формы (n_sats, n_steps) в градусах.
+    """
+    t = np.asarray(time_steps, dtype=float)[np.newaxis, :]  # Время по второй оси
+    column = lambda key: np.asarray(elements[key], dtype=float)[:, np.newaxis]  # Параметры спутников по первой оси
+
+    x, y, z, node_shift = _orbit_coordinates(
+        semi_major_axis=column("semi_major_axis"),
+        eccentricity=column("eccentricity"),
+        longitude_of_ascending_node=column("longitude_of_ascending_node"),
+        argument_pericenter=column("argument_pericenter"),
+        inclination=column("inclination"),
+        mean_anomaly=column("mean_anomaly"),
+        delta_t=t if "epoch" not in elements else t + epoch_offsets(elements["epoch"], jd)[:, np.newaxis],
+        j2=j2
+    )
+
+    H = calculate_siderial_time(initial_date=jd, t=t)  # Звездное время один раз для всего временного ряда
+    H = H - node_shift  # Смещение узла (J2) сдвигает только долготу
+    # Переход ECI → ECEF → долгота/широта одним проходом, без поворота координат (см. transforms)
+    if geodetic:
+        longitudes, latitudes, _ = geodetic_coordinates(x, y, z, H)
+        return longitudes, latitudes
+    return spherical_coordinates(x, y, z, H)
+
+def ecef_positions(
+    elements: dict,  # Орбитальные элементы (как возвращает satellite_slots; "epoch" - необязательно)
+    jd: float,  # Начальная дата (юлианская дата)
+    time_steps,  # Моменты времени от начальной даты (в секундах)
+    j2: bool = False  # True - вековые возмущения J2
+):
+    """Координаты спутников в земной системе ECEF (в км).
+
+    В отличие от propagate_elements формы не переставляются: элементы и time_steps должны быть
+    совместимы по форме (например, (n_sats, 1) и (n_steps,) для сетки или одинаковой длины для пар
+    спутник-момент).
+    """
+    t = np.asarray(time_steps, dtype=float)
+    column = lambda key: np.asarray(elements[key], dtype=float)
+    delta_t = t if "epoch" not in elements else t + epoch_offsets(elements["epoch"], jd)
+    x, y, z, node_shift = _orbit_coordinates(
+        column("semi_major_axis"), column("eccentricity"), column("longitude_of_ascending_node"),
+        column("argument_pericenter"), column("inclination"), column("mean_anomaly"), delta_t, j2)
+    H = calculate_siderial_time(initial_date=jd, t=t) - node_shift
+    cos_H, sin_H = np.cos(H), np.sin(H)
+    return cos_H * x + sin_H * y, cos_H * y - sin_H * x, np.broadcast_to(z, np.broadcast(x, H).shape)
+
+def propagate_constellation(
+    satellites: List[SatelliteConfig],  # Конфигурации спутниковой системы (все плоскости и слоты)
+    date: Time,  # Начальная дата (объект Time из Astropy или юлианская дата)
+    time_steps: np.ndarray,  # Моменты времени от начальной даты (в секундах)
+    j2: bool = False  # True - вековые возмущения J2
+):
+    """Вычисляет долготы и широты всех спутников системы, массивы формы (n_sats, n_steps) в градусах.
+
+    Слоты, отличающиеся только узлом и фазой, рассчитываются по одной опорной орбите (см. symmetry).
+    """
+    from symmetry import propagate_symmetric  # Модуль symmetry сам импортирует utilities
+    return propagate_symmetric(satellite_slots(satellites), julian_date(date), time_steps, j2=j2)
+
+def period_time_steps(T: float, dt: float = 0.01):
+    """Равномерная временная сетка от 0 до T (в секундах) с относительным шагом dt."""
+    return np.linspace(0, T, int(T / (dt * T)) + 1)
+
 def calculate_longitudes_latitudes(
     satellite: SatelliteConfig,  # Объект с параметрами спутника
     date: Time,  # Дата наблюдения (объект Time из Astropy)
     dt: float = 0.01  # Относительный шаг времени для дискретизации периода
 ):  
-    T = satellite.T  # Получаем период орбиты спутника из объекта satellite
-    time_steps = np.linspace(0, T, int(T / (dt * T)) + 1)  # Генерируем равномерно распределённые временные шаги от 0 до T
-    
-    all_longitudes = []  # Список для хранения долгот для всех вариантов орбитальных параметров
-    all_latitudes = []  # Список для хранения широт для всех вариантов орбитальных параметров
-    
-    # Перебираем все значения долготы восходящего узла из спутниковых параметров
-    for i in range(len(satellite.longitude_of_ascending_node)):
-        # Перебираем все значения аргумента перицентра из спутниковых параметров
-        for j in range(len(satellite.argument_pericenter)):
-            longitudes_n = []  # Список долгот для текущей комбинации орбитальных параметров
-            latitudes_n = []  # Список широт для текущей комбинации орбитальных параметров
-            # Проходим по каждому временно шагу
-            for time_step in time_steps:
-                H = calculate_siderial_time(initial_date=date.jd, t=time_step)  # Вычисляем звездное время для текущего временного шага
-
-                # Вычисляем координаты спутника в инерциальной системе координат по текущим орбитальным параметрам
-                initial_coordinate = calculate_coordinate(
-                    semi_major_axis=satellite.semi_major_axis,  # Полуось орбиты
-                    eccentricity=satellite.eccentricity,  # Эксцентриситет орбиты
-                    longitude_of_ascending_node=satellite.longitude_of_ascending_node[i],  # Текущая долгота восходящего узла
-                    argument_pericenter=satellite.argument_pericenter[j],  # Текущий аргумент перицентра
-                    inclination=satellite.inclination,  # Наклон орбиты
-                    mean_anomaly=satellite.mean_anomaly,  # Средняя аномалия
-                    delta_t=time_step  # Текущий временной шаг
-                )
-                
-                # Генерируем матрицу перехода на основе звездного времени
-                A = generate_transition_matrix(H=H)
-                # Преобразуем координаты в инерциальную систему координат с помощью матричного умножения
-                coordinate = A @ initial_coordinate
-
-                x, y, z = coordinate[0], coordinate[1], coordinate[2]  # Извлекаем компоненты координат
-                r = np.linalg.norm(coordinate)  # Вычисляем модуль вектора координат (расстояние от центра)
-                longitude = np.degrees(np.arctan2(y, x))  # Вычисляем долготу, переводя результат из радиан в градусы
-                latitude = np.degrees(np.arcsin(z / r))  # Вычисляем широту, переводя результат из радиан в градусы
-                
-                longitudes_n.append(longitude)  # Добавляем вычисленную долготу в список для данной комбинации параметров
-                latitudes_n.append(latitude)  # Добавляем вычисленную широту в список для данной комбинации параметров
-
-            all_longitudes.append(longitudes_n)  # Добавляем список долгот для текущей комбинации в общий список
-            all_latitudes.append(latitudes_n)  # Добавляем список широт для текущей комбинации в общий список
-        
-    return all_longitudes, all_latitudes  # Возвращаем два списка: все вычисленные долготы и широты
\ No newline at end of file
+    time_steps = period_time_steps(satellite.T, dt)  # Генерируем равномерно распределённые временные шаги от 0 до T
+
+    # Все комбинации (Ω, ω) и все временные шаги вычисляются одним вызовом
+    longitudes, latitudes = propagate_constellation([satellite], date, time_steps)
+
+    # Сохраняем прежний формат результата: по одному ряду на каждую комбинацию орбитальных параметров
+    return list(longitudes), list(latitudes)  # Возвращаем два списка: все вычисленные долготы и широты